@@ -0,0 +1,131 @@
+"""Compares building request URLs through the compiled plan against the mutate-and-construct path.
+
+``baseline`` is a copy of the implementation before the plans were added and ``plan`` is
+:meth:`Endpoint.build_url`.
+
+Run with ``python -m benchmarks.endpoints`` from the root of the repository.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+import logging
+import timeit
+from urllib.parse import quote_plus, urlencode
+
+from somerandomapi.internals.endpoints import CanvasFilter, Endpoint, Parameter, Premium
+
+_log: logging.Logger = logging.getLogger("somerandomapi.endpoints")
+
+CASES: dict[str, tuple[Endpoint, dict[str, object]]] = {
+    "filter": (CanvasFilter.BLUE, {"avatar": "https://cdn.discordapp.com/avatars/1/a.png"}),
+    "rankcard": (
+        Premium.RANK_CARD,
+        {
+            "template": 1,
+            "username": "soheab",
+            "avatar": "https://cdn.discordapp.com/avatars/1/a.png",
+            "level": 10,
+            "cxp": 100,
+            "nxp": 1000,
+            "ctext": "ffffff",
+            "cbar": "00ff00",
+        },
+    ),
+}
+
+
+def _baseline_set_param_values(self: Endpoint, **values: Any) -> Endpoint:
+    # the implementation of Endpoint._set_param_values before the URL plans, kept as is to compare against.
+    _log.debug("Setting parameter values for %r endpoint", self.path)
+    cls = self.__class__(self.path, returns_image=self.returns_image, **self.parameters)
+    params = cls.parameters.copy()
+
+    if not params:
+        _log.debug("No parameters found for %r endpoint", self.path)
+        return cls
+
+    for name, param in params.items():
+        if not param.required and name not in values:
+            _log.debug("Skipping optional parameter %r", name)
+            continue
+
+        if param.required:
+            if name not in values:
+                msg = f"Missing required parameter {name}"
+                raise TypeError(msg)
+            if not values[name]:
+                msg = f"Missing required value for parameter {name}"
+                raise TypeError(msg)
+
+        _log.debug("Setting value for %s parameter to %r", name, values[name])
+        param.value = values[name]
+
+    return cls
+
+
+def _baseline_get_constructed_url(self: Endpoint) -> str:
+    # the implementation of Endpoint.get_constructed_url before the URL plans.
+    if not self.parameters:
+        return self.path
+
+    url = self.path
+    body_params = sorted(
+        [
+            (name, param)
+            for name, param in self.parameters.items()
+            if param.value is not None and param.is_body_parameter
+        ],
+        key=lambda p: p[1].index if p[1].index is not None else float("inf"),
+    )
+    params = {name: param.value for name, param in self.parameters.items() if param.value is not None}
+    for name, param in body_params:
+        url += f"/{param.value}"
+        params.pop(name)
+
+    if params:
+        url += "?" + urlencode(params, quote_via=quote_plus)
+
+    return url
+
+
+def _private(endpoint: Endpoint) -> Endpoint:
+    # the baseline writes into the parameters of the endpoint, give it its own so the shared ones are left alone.
+    return Endpoint(
+        endpoint.path,
+        returns_image=endpoint.returns_image,
+        **{
+            name: Parameter(
+                required=param.required,
+                extra=param.extra,
+                is_body_parameter=param.is_body_parameter,
+                index=param.index,
+            )
+            for name, param in endpoint.parameters.items()
+        },
+    )
+
+
+def baseline_path(endpoint: Endpoint, values: dict[str, object]) -> str:
+    return _baseline_get_constructed_url(_baseline_set_param_values(endpoint, **values))
+
+
+def plan_path(endpoint: Endpoint, values: dict[str, object]) -> str:
+    return endpoint.build_url(values)
+
+
+def main() -> None:
+    number = 100_000
+    for name, (endpoint, values) in CASES.items():
+        private = _private(endpoint)
+        assert baseline_path(private, values) == plan_path(endpoint, values)
+        baseline = min(timeit.repeat(lambda: baseline_path(private, values), number=number, repeat=5))
+        plan = min(timeit.repeat(lambda: plan_path(endpoint, values), number=number, repeat=5))
+        print(
+            f"{name:<10} baseline: {baseline / number * 1e6:6.2f}us  "
+            f"plan: {plan / number * 1e6:6.2f}us  speedup: {baseline / plan:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Compares the parse time and peak memory of the JSON decoders on payloads shaped like the pokemon endpoints.
+
+Run with ``python -m benchmarks.json_decode`` from the root of the repository.
+orjson and msgspec are included when they are installed.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+import functools
+import importlib.util
+import json
+import timeit
+import tracemalloc
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from somerandomapi.types.pokemon import PokeDex, PokemonAbility, PokemonMove
+
+VERSIONS = [f"version-{i}" for i in range(40)]
+
+
+def pokedex() -> PokeDex:
+    return {
+        "name": "pikachu",
+        "id": "25",
+        "type": ["Electric"],
+        "species": ["Mouse", "Pokémon"],
+        "abilities": ["Static", "Lightning-rod"],
+        "height": "1′04″",
+        "weight": "13.2 lbs.",
+        "base_experience": "112",
+        "gender": ["male: 50%", "female: 50%"],
+        "egg_groups": ["Field", "Fairy"],
+        "stats": {
+            "hp": "35",
+            "attack": "55",
+            "defense": "40",
+            "sp_atk": "50",
+            "sp_def": "50",
+            "speed": "90",
+            "total": "320",
+        },
+        "family": {"evolutionStage": 2, "evolutionLine": ["Pichu", "Pikachu", "Raichu"]},
+        "sprites": {
+            "normal": "https://img.pokemondb.net/sprites/home/normal/pikachu.png",
+            "animated": "https://projectpokemon.org/images/normal-sprite/pikachu.gif",
+        },
+        "description": "When several of these Pokémon gather, their electricity can build and cause lightning storms. " * 4,
+        "generation": "1",
+    }
+
+
+def move() -> PokemonMove:
+    return {
+        "name": "thunderbolt",
+        "id": 85,
+        "effects": "Has a 10% chance to paralyze the target.",
+        "generation": 1,
+        "type": "electric",
+        "category": "special",
+        "contest": "cool",
+        "pp": 15,
+        "power": 90,
+        "accuracy": 100,
+        "pokemon": [f"pokemon-{i}" for i in range(600)],
+        "descriptions": [
+            {"version": version, "description": "A strong electric blast crashes down on the target."}
+            for version in VERSIONS
+        ],
+    }
+
+
+def ability() -> PokemonAbility:
+    return {
+        "name": "static",
+        "id": 9,
+        "effects": "Has a 30% chance of paralyzing attacking Pokémon on contact.",
+        "generation": 3,
+        "description": "The Pokémon is charged with static electricity.",
+        "pokemons": [{"pokemon": f"pokemon-{i}", "hidden": i % 3 == 0} for i in range(120)],
+        "descriptions": [{"version": version} for version in VERSIONS],
+    }
+
+
+def stdlib_text(body: bytes) -> Any:
+    # what json_or_text used to do: decode to a str, then parse that.
+    return json.loads(body.decode("utf-8"))
+
+
+def decoders() -> dict[str, Callable[[bytes], Any]]:
+    found: dict[str, Callable[[bytes], Any]] = {"json (text)": stdlib_text, "json (bytes)": json.loads}
+    if importlib.util.find_spec("orjson"):
+        import orjson  # noqa: PLC0415
+
+        found["orjson"] = orjson.loads
+    if importlib.util.find_spec("msgspec"):
+        import msgspec  # noqa: PLC0415
+
+        found["msgspec"] = msgspec.json.decode
+    return found
+
+
+def peak_memory(loads: Callable[[bytes], Any], body: bytes) -> int:
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        loads(body)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    number = 2_000
+    payloads = {"pokedex": pokedex(), "move": move(), "ability": ability()}
+    for name, payload in payloads.items():
+        body = json.dumps(payload).encode()
+        print(f"{name} ({len(body)} bytes)")
+        for decoder, loads in decoders().items():
+            assert loads(body) == payload
+            took = min(timeit.repeat(functools.partial(loads, body), number=number, repeat=5))
+            print(f"  {decoder:<13} {took / number * 1e6:8.2f}us  peak: {peak_memory(loads, body) / 1024:7.1f}KiB")
+
+
+if __name__ == "__main__":
+    main()
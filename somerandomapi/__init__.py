@@ -7,6 +7,18 @@ A maintained Python wrapper for the Somerandomapi API.
 from .clients import *
 from .enums import *
 from .errors import *
+from .internals.batch import *
+from .internals.cache import *
+from .internals.circuit import *
+from .internals.concurrency import *
+from .internals.hedging import *
+from .internals.hooks import *
+from .internals.metrics import *
+from .internals.pool import *
+from .internals.retry import *
+from .internals.scheduler import *
+from .internals.timeouts import *
+from .internals.tracing import *
 from .models import *
 
 __version__ = "0.2.0a"
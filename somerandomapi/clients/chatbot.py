@@ -13,6 +13,7 @@ from ..models.chatbot import ChatbotResult
 
 if TYPE_CHECKING:
     from ..clients.client import Client
+    from ..internals.pool import ConnectionPool
     from ..types.http import Chatbot as ChatbotPayload
 
 
@@ -101,6 +102,11 @@ class Chatbot:
     session: Optional[:class:`aiohttp.ClientSession`]
         The session to use. If this is not provided, a new session will be created.
         You are responsible for closing the session if you provide one.
+    pool: Optional[:class:`.ConnectionPool`]
+        The connection pool to take the session from, e.g. :attr:`.Client.pool` to share the connections of a client.
+        Ignored if a client or session is provided.
+
+        .. versionadded:: 0.2.0
     """
 
     _endpoint = Base.CHATBOT
@@ -120,18 +126,20 @@ class Chatbot:
         *,
         client: Client = _utils.NOVALUE,
         session: aiohttp.ClientSession = _utils.NOVALUE,
+        pool: ConnectionPool | None = None,
     ) -> None:
-        self._has_provided_client: bool = client is not None
-        self._has_provided_session: bool = session is not None
+        self._has_provided_client: bool = client is not _utils.NOVALUE and client is not None
+        self._has_provided_session: bool = session is not _utils.NOVALUE and session is not None
 
         self._message: str | None = message
 
-        self.__handle(client, session)
+        self.__handle(client, session, pool)
 
     def __handle(
         self,
         client: Client | None,
         session: aiohttp.ClientSession | None,
+        pool: ConnectionPool | None,
         /,
     ) -> None:
         attrs = [
@@ -144,7 +152,7 @@ class Chatbot:
             self.__http = client._http
             client._Client__chatbot = self  # pyright: ignore[reportAttributeAccessIssue]
         else:
-            self.__http = HTTPClient(None, session=session)
+            self.__http = HTTPClient(None, session=session, pool=pool)
         self.__request = partial(
             self.__http.request,
             self._endpoint,
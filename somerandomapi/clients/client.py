@@ -1,18 +1,28 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Literal, Self, overload
+from typing import TYPE_CHECKING, Any, Literal, Self, overload
 import logging
 
 import aiohttp
 
 from .. import utils as _utils
-from ..enums import WelcomeBackground, WelcomeTextColor, WelcomeType
+from ..enums import Priority, WelcomeBackground, WelcomeTextColor, WelcomeType
+from ..internals.batch import Call, StreamResult, gather_calls, stream_calls
+from ..internals.cache import DiskCache, ResponseCache
+from ..internals.circuit import CircuitBreaker
+from ..internals.concurrency import AdaptiveConcurrency
 from ..internals.endpoints import (
     Base as BaseEndpoint,
     CanvasMisc as CanvasMiscEndpoint,
     _Endpoint,
 )
+from ..internals.hedging import HedgePolicy
+from ..internals.hooks import RequestHook
 from ..internals.http import HTTPClient
+from ..internals.metrics import MetricsRegistry
+from ..internals.pool import ConnectionPool
+from ..internals.retry import RetryPolicy
+from ..internals.timeouts import AdaptiveTimeouts
 from ..models.encoding import EncodeResult
 from ..models.lyrics import Lyrics
 from ..models.rgb import RGB
@@ -21,6 +31,8 @@ from .abc import BaseClient
 from .chatbot import Chatbot
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Sequence
+
     from .animal import AnimalClient
     from .animu import AnimuClient
     from .canvas import CanvasClient
@@ -47,10 +59,115 @@ class Client(BaseClient):
             - If a session is provided, it will not be closed by the client. Otherwise, the client manages its own session.
             - This parameter can no longer be ``None``. Either pass a session or omit it entirely.
 
+        .. versionchanged:: 0.2.0
+            The headers of the session are no longer modified, the token is sent with each request instead.
+            This means that one session can be shared by clients with different tokens.
+
     token: str | None
         The token to use for endpoints that require it.
 
         .. versionadded:: 0.1.0
+    tokens: Optional[Sequence[:class:`str`]]
+        Several tokens to spread the requests over, to combine their rate limits. Each request uses the token
+        with the most quota left. Tokens that are rejected or run out of quota are left out until their quota
+        resets. Can't be combined with ``token``.
+
+        .. versionadded:: 0.2.0
+    keep_image_data: :class:`bool`
+        Whether to keep the body of image responses on the returned :class:`.Image`.
+        If ``True``, :meth:`.Image.read` and :meth:`.Image.file` reuse it instead of
+        requesting the image again. Defaults to ``True``.
+
+        .. versionadded:: 0.2.0
+    fetch_images: :class:`bool`
+        Whether to request the image endpoints (canvas, premium and :meth:`welcome_image`) right away.
+        If ``False``, the parameters are validated locally and an :class:`.Image` with the built URL
+        is returned without any network I/O. Use :meth:`.Image.validate` to check the URL later.
+        Defaults to ``True``.
+
+        Note that the URL of endpoints that require a token can't be used without the token,
+        for example by Discord in an embed.
+
+        .. versionadded:: 0.2.0
+    ratelimit: :class:`bool`
+        Whether to rate limit requests on the client side. If ``True``, requests that would go over
+        the rate limit of their endpoint group are queued until they can be made, instead of failing with
+        :class:`.RateLimited`. The limits adjust to the quota reported by the API. Defaults to ``False``.
+
+        .. versionadded:: 0.2.0
+    retry: Optional[:class:`.RetryPolicy`]
+        How to retry requests that failed with a rate limit, a server error or a lost connection.
+        Defaults to ``None``, which means that requests are not retried.
+
+        .. versionadded:: 0.2.0
+    coalesce: :class:`bool`
+        Whether identical requests that are made at the same time share a single request to the API.
+        Endpoints that return something random every time, such as animal images and facts,
+        are never shared. Defaults to ``True``.
+
+        .. versionadded:: 0.2.0
+    cache: Optional[Union[:class:`.ResponseCache`, :class:`.DiskCache`]]
+        The cache to keep the responses of endpoints that always return the same result for the same input in.
+        Defaults to ``None``, which means that nothing is cached. A :class:`.DiskCache` is closed
+        when the client is closed.
+
+        .. versionadded:: 0.2.0
+    json_loads: Optional[Callable[[:class:`bytes`], Any]]
+        The function to parse JSON responses with. It receives the raw body of the response.
+        Defaults to ``orjson.loads`` or ``msgspec.json.decode`` if either is installed and
+        :func:`json.loads` otherwise.
+
+        .. versionadded:: 0.2.0
+    hooks: Iterable[:class:`.RequestHook`]
+        The hooks to call around every request, in order. See also :meth:`add_hook`.
+
+        .. versionadded:: 0.2.0
+    metrics: Optional[:class:`.MetricsRegistry`]
+        The registry to record latency, status codes, errors and the state of the cache
+        and connection pool in. Defaults to ``None``, which means that nothing is recorded.
+
+        .. versionadded:: 0.2.0
+    slow_request_threshold: Optional[:class:`float`]
+        Log a warning with the :class:`.RequestTiming` of requests that took at least this many seconds.
+        Defaults to ``None``, which means that slow requests are not logged. See also :func:`.trace_requests`.
+
+        .. versionadded:: 0.2.0
+    max_concurrency: Optional[:class:`int`]
+        The maximum amount of requests that are made at once. Requests over it wait for a free slot,
+        which is given to the waiting request with the highest :class:`.Priority` first.
+        Defaults to ``None``, which means that only the rate limiter and the connection pool limit them.
+        See also :func:`.request_priority`.
+
+        .. versionadded:: 0.2.0
+    adaptive_timeouts: Optional[:class:`.AdaptiveTimeouts`]
+        How to set the timeout of each endpoint from the latency of its recent responses.
+        Defaults to ``None``, which means that the fixed timeout of each endpoint group is used, e.g. 5 seconds
+        for jokes, facts and animals and up to 60 seconds for premium renders, or the timeout of the session
+        if one is passed. Passing this overrides the timeout of a session that is passed.
+
+        .. versionadded:: 0.2.0
+    hedge: Optional[:class:`.HedgePolicy`]
+        When to make a second request for a request that is slower than usual and use whichever returns first.
+        Defaults to ``None``, which means that requests are not hedged.
+
+        .. versionadded:: 0.2.0
+    circuit_breaker: Optional[:class:`.CircuitBreaker`]
+        When to make the requests to an endpoint group fail right away because too many of them failed recently.
+        Defaults to ``None``, which means that requests are always made.
+
+        .. versionadded:: 0.2.0
+    pool: Optional[:class:`.ConnectionPool`]
+        The connection pool to make the requests over, with the limits, keepalive, DNS cache and SSL context of
+        its connector. It can be shared with other clients and :class:`.Chatbot` instances.
+        Defaults to ``None``, which means that the client gets a pool of its own with the default settings.
+        Can't be combined with ``session``.
+
+        .. versionadded:: 0.2.0
+    adaptive_concurrency: Optional[:class:`.AdaptiveConcurrency`]
+        How to find the amount of requests to each endpoint group that can be in flight at once, from their
+        latency, timeouts and rate limits. Defaults to ``None``, which means that only ``max_concurrency`` limits it.
+
+        .. versionadded:: 0.2.0
     """
 
     __slots__: tuple[str, ...] = (*(BaseClient.__slots__), "__chatbot")
@@ -60,8 +177,50 @@ class Client(BaseClient):
         token: str | None = None,
         *,
         session: aiohttp.ClientSession = _utils.NOVALUE,
+        tokens: Sequence[str] | None = None,
+        keep_image_data: bool = True,
+        fetch_images: bool = True,
+        ratelimit: bool = False,
+        retry: RetryPolicy | None = None,
+        coalesce: bool = True,
+        cache: ResponseCache | DiskCache | None = None,
+        json_loads: Callable[[bytes], Any] | None = None,
+        hooks: Iterable[RequestHook] = (),
+        metrics: MetricsRegistry | None = None,
+        slow_request_threshold: float | None = None,
+        max_concurrency: int | None = None,
+        adaptive_timeouts: AdaptiveTimeouts | None = None,
+        hedge: HedgePolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        pool: ConnectionPool | None = None,
+        adaptive_concurrency: AdaptiveConcurrency | None = None,
     ) -> None:
-        http = HTTPClient(token, session)
+        if token is not None and tokens is not None:
+            raise TypeError("Pass either 'token' or 'tokens', not both.")
+        if pool is not None and session is not _utils.NOVALUE:
+            raise TypeError("Pass either 'session' or 'pool', not both.")
+
+        http = HTTPClient(
+            token,
+            session,
+            keep_image_data=keep_image_data,
+            fetch_images=fetch_images,
+            ratelimit=ratelimit,
+            retry=retry,
+            coalesce=coalesce,
+            cache=cache,
+            json_loads=json_loads,
+            hooks=hooks,
+            metrics=metrics,
+            slow_request_threshold=slow_request_threshold,
+            max_concurrency=max_concurrency,
+            adaptive_timeouts=adaptive_timeouts,
+            hedge=hedge,
+            circuit_breaker=circuit_breaker,
+            tokens=tokens,
+            pool=pool,
+            adaptive_concurrency=adaptive_concurrency,
+        )
         super().__init__(http)
         self.__chatbot: Chatbot | None = None
 
@@ -71,6 +230,98 @@ class Client(BaseClient):
     async def __aexit__(self, *_: object) -> None:
         await self.close()
 
+    @property
+    def metrics(self) -> MetricsRegistry | None:
+        """Optional[:class:`.MetricsRegistry`]: The registry passed to the constructor, if any.
+
+        .. versionadded:: 0.2.0
+        """
+        return self._http._metrics
+
+    @property
+    def pool(self) -> ConnectionPool | None:
+        """Optional[:class:`.ConnectionPool`]: The connection pool that requests are made with,
+        either the one passed to the constructor or the one the client created.
+        ``None`` if a ``session`` was passed instead.
+
+        It can be passed to other clients, or to :class:`.Chatbot`, to share the connections of this client.
+
+        .. versionadded:: 0.2.0
+        """
+        return self._http._pool
+
+    def lane_stats(self) -> dict[str, dict[str, float]]:
+        """Returns the queue depth and wait times of each :class:`.Priority`.
+
+        .. versionadded:: 0.2.0
+
+        Returns
+        -------
+        Dict[:class:`str`, Dict[:class:`str`, :class:`float`]]
+            Maps the lowercase name of each priority to the amount of requests that are ``queued`` right now,
+            the amount of ``requests`` that were let through and their ``total_wait``, ``average_wait``
+            and ``max_wait`` in seconds.
+        """
+        return self._http._scheduler.stats()
+
+    def pool_stats(self) -> dict[str, float]:
+        """Returns the state of the connection pool.
+
+        .. versionadded:: 0.2.0
+
+        Returns
+        -------
+        Dict[:class:`str`, :class:`float`]
+            The amount of connections that are ``in_use`` and ``idle``, the requests that are waiting for one
+            (``waiters``) and the ``limit`` of the pool. For a pool that the client created, or a
+            :class:`.ConnectionPool` that was passed, also the amount of connections ``opened`` and the requests
+            that ``reused`` an idle connection since the pool was created, and the same six for each endpoint group
+            with connections of its own, prefixed by its lowercase name, e.g. ``premium_in_use``.
+        """
+        return self._http._pool_stats()
+
+    async def warmup(
+        self,
+        connections: int = 1,
+        *,
+        groups: Iterable[str] | None = None,
+        keep_warm: float | None = None,
+    ) -> int:
+        """Opens connections to the API before they are needed.
+
+        The first request after starting, or after a quiet period, otherwise has to wait for DNS, TCP
+        and TLS before it is sent. The connections are left idle in the pool for the following requests,
+        which shows in the ``reused`` count of :meth:`pool_stats`, or e.g. ``basecanvas_reused`` for the
+        endpoint groups with connections of their own.
+
+        .. versionadded:: 0.2.0
+
+        Parameters
+        ----------
+        connections: :class:`int`
+            The amount of connections to open, for the shared connections and for each group. Defaults to ``1``.
+        groups: Optional[Iterable[:class:`str`]]
+            The endpoint groups with connections of their own to warm up as well, the names of
+            :attr:`.ConnectionPool.limits`. Defaults to ``None``, which means all of them.
+            Pass an empty list to only warm up the shared connections.
+        keep_warm: Optional[:class:`float`]
+            Refresh the connections every this many seconds until the client is closed, so they are not closed
+            for being idle. This should be less than the ``keepalive_timeout`` of the :class:`.ConnectionPool`.
+            Defaults to ``None``, which means that they are only opened once.
+            Calling this again replaces the previous refresh.
+
+        Returns
+        -------
+        :class:`int`
+            The amount of connections that were opened or refreshed, of all groups combined.
+
+        Raises
+        ------
+        ValueError
+            ``connections`` is less than 1, ``keep_warm`` is not more than 0 or a group has no connections of its own.
+        """
+        return await self._http.warmup(connections, groups=groups, keep_warm=keep_warm)
+
     @property
     def animu(self) -> AnimuClient:
         """:class:`.AnimuClient`: The Animu endpoint."""
@@ -96,6 +347,125 @@ class Client(BaseClient):
         """:class:`.PremiumClient`: The Premium endpoint."""
         return self._http._premium
 
+    def add_hook(self, hook: RequestHook, /) -> None:
+        """Adds a hook that is called around every request, after the hooks that were already added.
+
+        .. versionadded:: 0.2.0
+
+        Parameters
+        ----------
+        hook: :class:`.RequestHook`
+            The hook to add.
+        """
+        self._http._hooks.append(hook)
+
+    def remove_hook(self, hook: RequestHook, /) -> None:
+        """Removes a hook that was added before.
+
+        .. versionadded:: 0.2.0
+
+        Parameters
+        ----------
+        hook: :class:`.RequestHook`
+            The hook to remove.
+
+        Raises
+        ------
+        ValueError
+            The hook was not added.
+        """
+        self._http._hooks.remove(hook)
+
+    async def batch(self, calls: Iterable[Call], /, *, concurrency: int = 5, priority: Priority | None = None) -> list[Any]:
+        """Makes many requests with at most ``concurrency`` of them at once.
+
+        A failed call doesn't fail the batch, its error is returned in its place instead.
+        The calls go through the rate limiter, cache and coalescing like any other request.
+
+        .. versionadded:: 0.2.0
+
+        Example
+        --------
+        .. code-block:: python
+
+            results = await client.batch(
+                [(client.canvas.filter, {"avatar_url": avatar, "filter": "blue"}) for avatar in avatars],
+                concurrency=4,
+            )
+            for avatar, result in zip(avatars, results):
+                if isinstance(result, Exception):
+                    print(f"{avatar} failed: {result}")
+
+        Parameters
+        ----------
+        calls: Iterable[Union[Callable[[], Awaitable], Tuple[Callable[..., Awaitable], Mapping[:class:`str`, Any]]]]
+            The calls to make. Either a function that takes no arguments or
+            a tuple of a function and the keyword arguments to call it with.
+        concurrency: :class:`int`
+            The maximum amount of calls that are made at once. Defaults to ``5``.
+        priority: Optional[:class:`.Priority`]
+            The priority of the requests. Defaults to ``None``, which means the priority
+            set by :func:`.request_priority` or :attr:`.Priority.NORMAL`.
+
+        Returns
+        -------
+        List[Union[Any, :class:`Exception`]]
+            The result or the error of each call, in the same order as ``calls``.
+
+        Raises
+        ------
+        ValueError
+            ``concurrency`` is less than 1.
+        """
+        return await gather_calls(calls, concurrency, priority)
+
+    def stream(
+        self,
+        calls: Iterable[Call] | AsyncIterable[Call],
+        /,
+        *,
+        max_in_flight: int = 5,
+        priority: Priority | None = None,
+    ) -> AsyncIterator[StreamResult]:
+        """Makes a request for every call in ``calls`` and yields the results as they complete.
+
+        Calls are taken from ``calls`` only when there is room for them, with at most ``max_in_flight``
+        requests at once, so memory use doesn't grow with the amount of calls. Results are yielded
+        in the order they complete, use :attr:`.StreamResult.index` to match them with the input.
+        A failed call doesn't stop the stream, its error is yielded in :attr:`.StreamResult.error` instead.
+
+        .. versionadded:: 0.2.0
+
+        Example
+        --------
+        .. code-block:: python
+
+            calls = ((client.premium.petpet, {"avatar": member.display_avatar.url}) for member in guild.members)
+            async for item in client.stream(calls, max_in_flight=4):
+                if item.error is None:
+                    await save(guild.members[item.index], item.result)
+
+        Parameters
+        ----------
+        calls: Union[Iterable, AsyncIterable]
+            The calls to make, in the same format as :meth:`batch`. This can be a (async) generator.
+        max_in_flight: :class:`int`
+            The maximum amount of calls that are made at once. Defaults to ``5``.
+        priority: Optional[:class:`.Priority`]
+            The priority of the requests, see :meth:`batch`.
+
+        Yields
+        -------
+        :class:`.StreamResult`
+            The index of the call in ``calls`` and its result or error.
+
+        Raises
+        ------
+        ValueError
+            ``max_in_flight`` is less than 1.
+        """
+        return stream_calls(calls, max_in_flight, priority)
+
     def chatbot(self, message: str | None = None) -> Chatbot:
         """Chatbot endpoint.
 
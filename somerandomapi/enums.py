@@ -10,8 +10,10 @@ __all__ = (
     "CanvasCrop",
     "CanvasFilter",
     "CanvasOverlay",
+    "CircuitState",
     "Fact",
     "Img",
+    "Priority",
     "ResultType",
     "TweetTheme",
     "WelcomeBackground",
@@ -184,3 +186,34 @@ class ResultType(BaseEnum):
 
     ENCODE = 0
     DECODE = 1
+
+
+class Priority(BaseEnum):
+    """Enum representing the priority of a request, see :func:`.request_priority`.
+
+    When requests have to wait for a rate limit token or a free slot, the ones
+    with a higher priority go first.
+
+    .. versionadded:: 0.2.0
+    """
+
+    INTERACTIVE = 0
+    """Requests someone is waiting for, e.g. the response to a Discord interaction."""
+    NORMAL = 1
+    """The default priority."""
+    BACKGROUND = 2
+    """Requests nobody is waiting for, e.g. warming a cache."""
+
+
+class CircuitState(BaseEnum):
+    """Enum representing the state of the circuit of an endpoint group, see :class:`.CircuitBreaker`.
+
+    .. versionadded:: 0.2.0
+    """
+
+    CLOSED = 0
+    """Requests are made as usual."""
+    HALF_OPEN = 1
+    """A few probe requests are let through to see if the endpoints recovered."""
+    OPEN = 2
+    """Requests fail right away with :exc:`.CircuitOpen`."""
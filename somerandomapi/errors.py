@@ -12,6 +12,8 @@ if TYPE_CHECKING:
 
 __all__ = (
     "BadRequest",
+    "CircuitOpen",
+    "DeadlineExceeded",
     "Forbidden",
     "HTTPException",
     "ImageError",
@@ -67,10 +69,13 @@ class NotFound(SomeRandomApiException):
 
 
 class InternalServerError(SomeRandomApiException):
-    """``Internal Server Error`` error."""
+    """``Internal Server Error`` error.
 
-    def __init__(self, enum, data: Any, /) -> None:
-        Exception.__init__(self, f"Internal Server Error while requesting {enum.base()}{enum.value.path}.")
+    .. versionchanged:: 0.2.0
+        This can be constructed now, it raised an :class:`AttributeError` before.
+    """
+
+    code = 500
 
 
 class Forbidden(SomeRandomApiException):
@@ -80,10 +85,22 @@ class Forbidden(SomeRandomApiException):
 
 
 class RateLimited(SomeRandomApiException):
-    """``Too Many Requests`` error."""
+    """``Too Many Requests`` error.
+
+    Attributes
+    ----------
+    retry_after: Optional[:class:`float`]
+        The amount of seconds to wait before trying again, if the API said so.
+
+        .. versionadded:: 0.2.0
+    """
 
     code = 429
 
+    def __init__(self, endpoint: Endpoint, data: Any, /, *, retry_after: float | None = None) -> None:
+        self.retry_after: float | None = retry_after
+        super().__init__(endpoint, data)
+
 
 class HTTPException(SomeRandomApiException):
     """Exception raised when an HTTP request fails."""
@@ -127,6 +144,57 @@ class ImageError(SomeRandomApiException):
         Exception.__init__(self, f"Could not get image from {url} (code: {status})")
 
 
+class DeadlineExceeded(SomeRandomApiException):
+    """Exception raised when a request was dropped before it was made because its deadline passed,
+    or would pass before a response can be expected. See :func:`.request_deadline`.
+
+    .. versionadded:: 0.2.0
+
+    Attributes
+    ----------
+    remaining: :class:`float`
+        The amount of seconds that were left until the deadline, ``0`` or less if it passed.
+    expected: Optional[:class:`float`]
+        The 95th percentile latency of the endpoint in seconds if the request was rejected
+        because of it, ``None`` if the deadline passed.
+    """
+
+    def __init__(self, endpoint: Endpoint, /, *, remaining: float, expected: float | None = None) -> None:
+        self.endpoint: Endpoint = endpoint
+        self.data: Any = None
+        self.remaining: float = remaining
+        self.expected: float | None = expected
+        if expected is None:
+            message = "the deadline passed before the request could be made"
+        else:
+            message = f"{remaining:.3f} seconds left, but responses usually take up to {expected:.3f} seconds"
+        Exception.__init__(self, f"While requesting /{endpoint.path}: {message}")
+
+
+class CircuitOpen(SomeRandomApiException):
+    """Exception raised when a request was not made because the circuit of its endpoint group is open,
+    after too many of its requests failed recently. See :class:`.CircuitBreaker`.
+
+    .. versionadded:: 0.2.0
+
+    Attributes
+    ----------
+    group: :class:`str`
+        The name of the endpoint group, e.g. ``BaseCanvas``.
+    retry_after: :class:`float`
+        The amount of seconds until probe requests are let through again.
+    """
+
+    def __init__(self, endpoint: Endpoint, group: str, /, *, retry_after: float) -> None:
+        self.endpoint: Endpoint = endpoint
+        self.data: Any = None
+        self.group: str = group
+        self.retry_after: float = retry_after
+        Exception.__init__(
+            self, f"While requesting /{endpoint.path}: the circuit of {group} is open, retry in {retry_after:.1f} seconds"
+        )
+
+
 class TypingError(TypeError):
     """Exception raised when a typing error occurs.
 
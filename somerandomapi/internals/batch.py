@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeAlias
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+from contextlib import nullcontext
+import logging
+
+from .scheduler import request_priority
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator, Iterable
+
+    from ..enums import Priority
+
+
+__all__ = ("StreamResult",)
+
+_log: logging.Logger = logging.getLogger("somerandomapi.batch")
+
+# a function that takes no arguments or a (function, keyword arguments) pair, e.g. (client.premium.petpet, {"avatar": url})
+Call: TypeAlias = Callable[[], Awaitable[Any]] | tuple[Callable[..., Awaitable[Any]], Mapping[str, Any]]
+
+
+class StreamResult(NamedTuple):
+    """A result yielded by :meth:`Client.stream`.
+
+    .. versionadded:: 0.2.0
+
+    Attributes
+    ----------
+    index: :class:`int`
+        The position of the call in the input.
+    result: Any
+        What the call returned, ``None`` if it failed.
+    error: Optional[:class:`Exception`]
+        The error the call failed with, ``None`` if it succeeded.
+    """
+
+    index: int
+    result: Any
+    error: Exception | None
+
+
+def _invoke(call: Call) -> Awaitable[Any]:
+    if isinstance(call, tuple):
+        func, kwargs = call
+        return func(**kwargs)
+
+    return call()
+
+
+def _priority(priority: Priority | None) -> Any:
+    return request_priority(priority) if priority is not None else nullcontext()
+
+
+async def gather_calls(calls: Iterable[Call], concurrency: int, priority: Priority | None = None) -> list[Any]:
+    """Runs the calls with at most ``concurrency`` at once and returns their results or errors in input order."""
+    if concurrency < 1:
+        raise ValueError("concurrency must be 1 or more.")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(call: Call) -> Any:
+        async with semaphore:
+            try:
+                with _priority(priority):
+                    return await _invoke(call)
+            except Exception as exc:  # noqa: BLE001
+                _log.debug("Batch call failed with: %r", exc)
+                return exc
+
+    # gather cancels the remaining calls if the batch itself is cancelled
+    return await asyncio.gather(*(run(call) for call in calls))
+
+
+def stream_calls(
+    calls: Iterable[Call] | AsyncIterable[Call], max_in_flight: int, priority: Priority | None = None
+) -> AsyncIterator[StreamResult]:
+    """Pulls calls from ``calls`` as they are needed, keeps at most ``max_in_flight`` running
+    and yields their results as they complete.
+    """
+    # validated here and not in the generator, so it is raised right away instead of on the first iteration.
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be 1 or more.")
+
+    return _stream_calls(calls, max_in_flight, priority)
+
+
+async def _stream_calls(
+    calls: Iterable[Call] | AsyncIterable[Call], max_in_flight: int, priority: Priority | None
+) -> AsyncIterator[StreamResult]:
+    async def run(index: int, call: Call) -> StreamResult:
+        try:
+            with _priority(priority):
+                return StreamResult(index, await _invoke(call), None)
+        except Exception as exc:  # noqa: BLE001
+            _log.debug("Streamed call %s failed with: %r", index, exc)
+            return StreamResult(index, None, exc)
+
+    if hasattr(calls, "__aiter__"):
+        async_iterator = aiter(calls)  # pyright: ignore[reportArgumentType]
+        sync_iterator = None
+    else:
+        async_iterator = None
+        sync_iterator = iter(calls)  # pyright: ignore[reportArgumentType]
+
+    pending: set[asyncio.Task[StreamResult]] = set()
+    index = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    call = await anext(async_iterator) if async_iterator else next(sync_iterator)  # pyright: ignore[reportArgumentType]
+                except (StopAsyncIteration, StopIteration):
+                    exhausted = True
+                    break
+
+                pending.add(asyncio.ensure_future(run(index, call)))
+                index += 1
+
+            if not pending:
+                return
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        # the consumer stopped early or was cancelled, don't leave requests running.
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,429 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NamedTuple
+from collections import OrderedDict
+from contextlib import contextmanager
+import json
+import logging
+import os
+import pathlib
+import sqlite3
+import time
+import zlib
+
+from .. import utils as _utils
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from .endpoints import Endpoint
+
+
+__all__ = (
+    "DiskCache",
+    "ResponseCache",
+)
+
+_log: logging.Logger = logging.getLogger("somerandomapi.cache")
+
+# how long to wait for another process to finish writing to a DiskCache. The cache is used from within the
+# event loop, a lookup that has to wait longer is treated as a miss and a write is skipped instead.
+_BUSY_TIMEOUT: float = 0.005
+# how long calls that are made once or on purpose, such as opening the file or warming it, wait instead.
+_SETUP_TIMEOUT: float = 5.0
+
+
+class _Entry(NamedTuple):
+    # the JSON body of the response, decoded on every hit so callers can't change what is cached.
+    body: bytes
+    expires_at: float
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _hit_stats(hits: int, misses: int) -> dict[str, float]:
+    lookups = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": hits / lookups if lookups else 0.0}
+
+
+def _ttl_for(endpoint: Endpoint, default_ttl: float) -> float | None:
+    if endpoint.randomized or endpoint.returns_image:
+        return None
+
+    return endpoint.cache_ttl or default_ttl
+
+
+class ResponseCache:
+    """An in-memory LRU cache for the responses of endpoints that always return the same result for the same input.
+
+    Only JSON endpoints that aren't random are cached, e.g. the pokemon endpoints, lyrics,
+    hex / rgb conversions and base64 / binary encoding. How long a response is kept
+    is defined per endpoint, ``default_ttl`` is used for endpoints that don't define it.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ----------
+    max_bytes: :class:`int`
+        The maximum size of all cached responses combined, in bytes. The least recently
+        used responses are evicted when a new response doesn't fit. Defaults to 8 MiB.
+    default_ttl: :class:`float`
+        The amount of seconds to keep responses of endpoints that don't define their own. Defaults to ``300``.
+    disk: Optional[:class:`DiskCache`]
+        A disk cache to fall back to when a response isn't cached in memory.
+        Responses are written to both, so they survive restarts.
+
+    Attributes
+    ----------
+    hits: :class:`int`
+        The amount of lookups that were answered from the cache.
+    misses: :class:`int`
+        The amount of lookups that weren't in the cache or had expired.
+    evictions: :class:`int`
+        The amount of responses that were evicted to stay within ``max_bytes``.
+    """
+
+    __slots__ = ("_entries", "_size", "default_ttl", "disk", "evictions", "hits", "max_bytes", "misses")
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = 8 * 1024 * 1024,
+        default_ttl: float = 300.0,
+        disk: DiskCache | None = None,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be more than 0.")
+        if default_ttl <= 0:
+            raise ValueError("default_ttl must be more than 0.")
+
+        self.max_bytes: int = max_bytes
+        self.default_ttl: float = default_ttl
+        self.disk: DiskCache | None = disk
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._size: int = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} entries={len(self._entries)} size={self._size} max_bytes={self.max_bytes} "
+            f"hits={self.hits} misses={self.misses} evictions={self.evictions}>"
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """:class:`int`: The size of all cached responses combined, in bytes."""
+        return self._size
+
+    def ttl_for(self, endpoint: Endpoint, /) -> float | None:
+        """Returns the amount of seconds to cache the responses of ``endpoint`` for, or ``None`` if they aren't cached."""
+        return _ttl_for(endpoint, self.default_ttl)
+
+    def get(self, key: str, /) -> Any:
+        """Returns the cached response for ``key`` or :data:`~somerandomapi.utils.NOVALUE` if there is none.
+
+        Every call returns a new object, changing it doesn't change the cached response.
+        """
+        body = self._get_body(key)
+        return body if body is _utils.NOVALUE else json.loads(body)
+
+    def set(self, key: str, value: Any, /, ttl: float) -> None:
+        """Caches ``value`` for ``key`` for ``ttl`` seconds."""
+        self._set_body(key, _dumps(value), ttl)
+
+    def _get_body(self, key: str) -> bytes:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return self._get_from_disk(key)
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.body
+
+    def _set_body(self, key: str, body: bytes, ttl: float) -> None:
+        # the raw body of a response, which is what is kept and measured.
+        if self.disk is not None:
+            self.disk._set_body(key, body, ttl)
+
+        self._set(key, body, ttl)
+
+    def _get_from_disk(self, key: str) -> bytes:
+        if self.disk is None:
+            return _utils.NOVALUE
+
+        found = self.disk._get_body_with_ttl(key)
+        if found is None:
+            return _utils.NOVALUE
+
+        body, ttl = found
+        self._set(key, body, ttl)
+        return body
+
+    def _set(self, key: str, body: bytes, ttl: float) -> None:
+        size = len(body)
+        if size > self.max_bytes:
+            _log.debug("Not caching %s, %s bytes is more than max_bytes.", key, size)
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        while self._size + size > self.max_bytes:
+            evicted, entry = self._entries.popitem(last=False)
+            self._size -= len(entry.body)
+            self.evictions += 1
+            _log.debug("Evicted %s from the cache.", evicted)
+
+        self._entries[key] = _Entry(body, time.monotonic() + ttl)
+        self._size += size
+
+    def clear(self) -> None:
+        """Removes all cached responses. The counters are kept."""
+        self._entries.clear()
+        self._size = 0
+
+    def _stats(self) -> dict[str, float]:
+        return {
+            **_hit_stats(self.hits, self.misses),
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size_bytes": self._size,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._size -= len(entry.body)
+
+
+class DiskCache:
+    """A response cache stored in a single SQLite file, so cached responses survive restarts.
+
+    The same endpoints as :class:`ResponseCache` are cached. Responses are stored as
+    compressed JSON and expire after the amount of seconds defined per endpoint.
+    The file is opened in WAL mode, so several processes can read it while one writes. A lookup or write that
+    would have to wait for another process is skipped, instead of blocking the event loop. Opening the file,
+    :meth:`warm`, :meth:`export_manifest` and :meth:`clear` wait for it instead.
+
+    It can be passed to :class:`Client` on its own or as the ``disk`` of a :class:`ResponseCache`
+    to keep recently used responses in memory as well.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ----------
+    path: Union[:class:`str`, :class:`os.PathLike`]
+        The path to the SQLite file. It is created if it doesn't exist.
+    default_ttl: :class:`float`
+        The amount of seconds to keep responses of endpoints that don't define their own. Defaults to ``300``.
+    manifest: Optional[Union[:class:`str`, :class:`os.PathLike`]]
+        A manifest created with :meth:`export_manifest` to :meth:`warm` the cache from right away.
+
+    Attributes
+    ----------
+    hits: :class:`int`
+        The amount of lookups that were answered from the cache.
+    misses: :class:`int`
+        The amount of lookups that weren't in the cache or had expired.
+    """
+
+    __slots__ = ("_sqlite", "default_ttl", "hits", "misses", "path")
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        default_ttl: float = 300.0,
+        manifest: str | os.PathLike[str] | None = None,
+    ) -> None:
+        if default_ttl <= 0:
+            raise ValueError("default_ttl must be more than 0.")
+
+        self.path: str = os.fspath(path)
+        self.default_ttl: float = default_ttl
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._sqlite: sqlite3.Connection | None = None
+        self._connect()
+        if manifest is not None:
+            self.warm(manifest)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} path={self.path!r} hits={self.hits} misses={self.misses}>"
+
+    def __len__(self) -> int:
+        with self._patient() as connection:
+            (count,) = connection.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return count
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        # opened again when used after close(), e.g. by a client that is used again after being closed.
+        return self._sqlite if self._sqlite is not None else self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        # autocommit, every statement is its own short transaction so other processes are never blocked for long.
+        connection = sqlite3.connect(self.path, timeout=_SETUP_TIMEOUT, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        connection.execute(f"PRAGMA busy_timeout = {int(_BUSY_TIMEOUT * 1000)}")
+        self._sqlite = connection
+        self.purge()
+        return connection
+
+    @contextmanager
+    def _patient(self) -> Iterator[sqlite3.Connection]:
+        # for calls that are made on purpose, which wait for other processes like the setup does.
+        connection = self._connection
+        connection.execute(f"PRAGMA busy_timeout = {int(_SETUP_TIMEOUT * 1000)}")
+        try:
+            yield connection
+        finally:
+            connection.execute(f"PRAGMA busy_timeout = {int(_BUSY_TIMEOUT * 1000)}")
+
+    def ttl_for(self, endpoint: Endpoint, /) -> float | None:
+        """Returns the amount of seconds to cache the responses of ``endpoint`` for, or ``None`` if they aren't cached."""
+        return _ttl_for(endpoint, self.default_ttl)
+
+    def get(self, key: str, /) -> Any:
+        """Returns the cached response for ``key`` or :data:`~somerandomapi.utils.NOVALUE` if there is none."""
+        found = self._get_body_with_ttl(key)
+        return _utils.NOVALUE if found is None else json.loads(found[0])
+
+    def _get_body(self, key: str) -> bytes:
+        found = self._get_body_with_ttl(key)
+        return _utils.NOVALUE if found is None else found[0]
+
+    def _get_body_with_ttl(self, key: str) -> tuple[bytes, float] | None:
+        now = time.time()
+        try:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+        except sqlite3.OperationalError as exc:
+            _log.debug("Treating the lookup of %s as a miss, %s is busy: %s", key, self.path, exc)
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return zlib.decompress(row[0]), row[1] - now
+
+    def set(self, key: str, value: Any, /, ttl: float) -> None:
+        """Caches ``value`` for ``key`` for ``ttl`` seconds."""
+        self._set_body(key, _dumps(value), ttl)
+
+    def _set_body(self, key: str, body: bytes, ttl: float) -> None:
+        try:
+            self._set_many(((key, zlib.compress(body), time.time() + ttl),))
+        except sqlite3.OperationalError as exc:
+            _log.debug("Not caching %s, %s is busy: %s", key, self.path, exc)
+
+    def _set_many(self, rows: Iterable[tuple[str, bytes, float]]) -> None:
+        # an entry that expires later than the one being written is kept, e.g. when warming.
+        self._connection.executemany(
+            "INSERT INTO responses (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+            "WHERE excluded.expires_at > responses.expires_at",
+            rows,
+        )
+
+    def purge(self) -> int:
+        """Removes all expired responses.
+
+        Nothing is removed if another process is writing to the file, they are removed the next time.
+
+        Returns
+        -------
+        :class:`int`
+            The amount of responses that were removed.
+        """
+        try:
+            cursor = self._connection.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        except sqlite3.OperationalError as exc:
+            _log.debug("Not purging %s, it's busy: %s", self.path, exc)
+            return 0
+
+        if cursor.rowcount:
+            _log.debug("Purged %s expired responses from %s", cursor.rowcount, self.path)
+        return cursor.rowcount
+
+    def export_manifest(self, path: str | os.PathLike[str], /) -> int:
+        """Writes all responses that haven't expired to a manifest file, for :meth:`warm` to load.
+
+        Returns
+        -------
+        :class:`int`
+            The amount of responses that were written.
+        """
+        with self._patient() as connection:
+            rows = connection.execute(
+                "SELECT key, value, expires_at FROM responses WHERE expires_at > ?", (time.time(),)
+            ).fetchall()
+        entries = [
+            {"key": key, "value": json.loads(zlib.decompress(value)), "expires_at": expires_at}
+            for key, value, expires_at in rows
+        ]
+        pathlib.Path(path).write_bytes(_dumps(entries))
+
+        return len(entries)
+
+    def warm(self, path: str | os.PathLike[str], /) -> int:
+        """Loads the responses of a manifest created with :meth:`export_manifest` that haven't expired yet.
+
+        Returns
+        -------
+        :class:`int`
+            The amount of responses that were loaded.
+        """
+        entries = json.loads(pathlib.Path(path).read_bytes())
+
+        now = time.time()
+        rows = [
+            (entry["key"], zlib.compress(_dumps(entry["value"])), entry["expires_at"])
+            for entry in entries
+            if entry["expires_at"] > now
+        ]
+        with self._patient():
+            self._set_many(rows)
+        _log.debug("Warmed %s with %s responses from %s", self.path, len(rows), os.fspath(path))
+        return len(rows)
+
+    def clear(self) -> None:
+        """Removes all cached responses. The counters are kept."""
+        with self._patient() as connection:
+            connection.execute("DELETE FROM responses")
+
+    def _stats(self) -> dict[str, float]:
+        return _hit_stats(self.hits, self.misses)
+
+    def close(self) -> None:
+        """Closes the SQLite file.
+
+        This is done automatically when the :class:`Client` it was passed to is closed.
+        The file is opened again when the cache is used after this.
+        """
+        if self._sqlite is not None:
+            self._sqlite.close()
+            self._sqlite = None
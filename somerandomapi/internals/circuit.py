@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import logging
+import time
+
+import aiohttp
+
+from ..enums import CircuitState
+from ..errors import CircuitOpen, SomeRandomApiException
+
+if TYPE_CHECKING:
+    from .endpoints import BaseEndpoint, Endpoint
+
+
+__all__ = ("CircuitBreaker",)
+
+_log: logging.Logger = logging.getLogger("somerandomapi.circuit")
+
+
+def _is_failure(error: BaseException) -> bool:
+    # only errors that say something about the health of the API, not about the request itself.
+    if isinstance(error, SomeRandomApiException):
+        # the API sometimes answers a server error with a JSON error, which raises BadRequest.
+        code = getattr(error, "code", 0)
+        return isinstance(code, int) and code >= 500
+    return isinstance(error, (aiohttp.ClientConnectionError, TimeoutError))
+
+
+class _Circuit:
+    """The state of the circuit of a single endpoint group.
+
+    Outcomes are counted in one slot per second, like the retry budget.
+    """
+
+    __slots__ = (
+        "_breaker",
+        "_epochs",
+        "_failures",
+        "_opened_at",
+        "_probes",
+        "_requests",
+        "_successes",
+        "name",
+        "opened",
+        "state",
+    )
+
+    def __init__(self, breaker: CircuitBreaker, name: str) -> None:
+        self._breaker: CircuitBreaker = breaker
+        self.name: str = name
+        self.state: CircuitState = CircuitState.CLOSED
+        self.opened: int = 0
+
+        window = breaker.window
+        self._epochs: list[int] = [0] * window
+        self._requests: list[int] = [0] * window
+        self._failures: list[int] = [0] * window
+        self._opened_at: float = 0.0
+        # probe requests in flight and probes that succeeded while half-open
+        self._probes: int = 0
+        self._successes: int = 0
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} name={self.name!r} state={self.state.name}>"
+
+    def _slot(self, now: float) -> int:
+        epoch = int(now)
+        slot = epoch % self._breaker.window
+        if self._epochs[slot] != epoch:
+            self._epochs[slot] = epoch
+            self._requests[slot] = 0
+            self._failures[slot] = 0
+        return slot
+
+    def _sum(self, counts: list[int], now: float) -> int:
+        oldest = int(now) - self._breaker.window
+        return sum(count for epoch, count in zip(self._epochs, counts, strict=True) if epoch > oldest)
+
+    def _open(self, now: float) -> None:
+        _log.warning("Opening the circuit of %s for %.1f seconds", self.name, self._breaker.open_for)
+        self.state = CircuitState.OPEN
+        self.opened += 1
+        self._opened_at = now
+        # _probes is left alone, probes still in flight take themselves off when they finish.
+        self._successes = 0
+
+    def allow(self, endpoint: Endpoint) -> bool:
+        """Raises :exc:`CircuitOpen` if the request may not be made, returns whether it is a probe."""
+        now = time.monotonic()
+        if self.state is CircuitState.OPEN:
+            retry_after = self._opened_at + self._breaker.open_for - now
+            if retry_after > 0:
+                raise CircuitOpen(endpoint, self.name, retry_after=retry_after)
+
+            _log.info("Letting probe requests through to %s", self.name)
+            self.state = CircuitState.HALF_OPEN
+
+        if self.state is CircuitState.HALF_OPEN:
+            if self._probes + self._successes >= self._breaker.probes:
+                raise CircuitOpen(endpoint, self.name, retry_after=0.0)
+
+            self._probes += 1
+            return True
+
+        return False
+
+    def record(self, *, failed: bool, probe: bool) -> None:
+        now = time.monotonic()
+        if probe:
+            self._probes -= 1
+            if self.state is not CircuitState.HALF_OPEN:
+                return
+
+            if failed:
+                self._open(now)
+                return
+
+            self._successes += 1
+            if self._successes >= self._breaker.probes:
+                _log.info("Closing the circuit of %s", self.name)
+                self.state = CircuitState.CLOSED
+                # start counting from scratch, the failures that opened it are in the past.
+                self._epochs = [0] * self._breaker.window
+            return
+
+        if self.state is not CircuitState.CLOSED:
+            # a request that was made before the circuit opened.
+            return
+
+        slot = self._slot(now)
+        self._requests[slot] += 1
+        if not failed:
+            return
+
+        self._failures[slot] += 1
+        requests = self._sum(self._requests, now)
+        if requests >= self._breaker.min_requests and self._sum(self._failures, now) / requests >= self._breaker.ratio:
+            self._open(now)
+
+    def cancel_probe(self) -> None:
+        # the probe was cancelled before it had a result, let another request probe instead.
+        self._probes -= 1
+
+
+class CircuitBreaker:
+    """Makes requests to an endpoint group fail right away while too many of its recent requests failed.
+
+    Each endpoint group, such as the canvas or premium endpoints, has its own circuit. It opens when at least
+    ``ratio`` of the requests in the last ``window`` seconds failed with a server error, a connection error or a
+    timeout, or were slower than ``slow_threshold``. While open, requests raise :exc:`.CircuitOpen` without waiting
+    for anything. After ``open_for`` seconds, ``probes`` requests are let through. The circuit closes if they
+    all succeed and opens again if any of them fails.
+
+    State changes are logged, passed to :meth:`.RequestHook.on_circuit_change` and exposed in the
+    :class:`.MetricsRegistry`.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ----------
+    ratio: :class:`float`
+        The ratio of failed requests that opens the circuit, between 0 and 1. Defaults to ``0.5``.
+    min_requests: :class:`int`
+        The minimum amount of requests in the window before the circuit can open. Defaults to ``10``.
+    window: :class:`int`
+        The amount of seconds that requests are counted for. Defaults to ``30``.
+    open_for: :class:`float`
+        The amount of seconds the circuit stays open before probe requests are let through. Defaults to ``30``.
+    probes: :class:`int`
+        The amount of probe requests that have to succeed to close the circuit. Defaults to ``1``.
+    slow_threshold: Optional[:class:`float`]
+        Requests that took at least this many seconds count as failed.
+        Defaults to ``None``, which means that only errors count.
+    """
+
+    __slots__ = ("_circuits", "min_requests", "open_for", "probes", "ratio", "slow_threshold", "window")
+
+    def __init__(
+        self,
+        *,
+        ratio: float = 0.5,
+        min_requests: int = 10,
+        window: int = 30,
+        open_for: float = 30.0,
+        probes: int = 1,
+        slow_threshold: float | None = None,
+    ) -> None:
+        if not 0 < ratio <= 1:
+            raise ValueError("ratio must be more than 0 and not more than 1.")
+        if min_requests < 1:
+            raise ValueError("min_requests must be 1 or more.")
+        if window < 1:
+            raise ValueError("window must be 1 or more.")
+        if probes < 1:
+            raise ValueError("probes must be 1 or more.")
+
+        self.ratio: float = ratio
+        self.min_requests: int = min_requests
+        self.window: int = window
+        self.open_for: float = open_for
+        self.probes: int = probes
+        self.slow_threshold: float | None = slow_threshold
+        self._circuits: dict[type[BaseEndpoint], _Circuit] = {}
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} ratio={self.ratio} window={self.window} open_for={self.open_for}>"
+
+    def states(self) -> dict[str, CircuitState]:
+        """Returns the state of the circuit of each endpoint group that was requested.
+
+        Returns
+        -------
+        Dict[:class:`str`, :class:`.CircuitState`]
+            Maps the name of the endpoint group, e.g. ``BaseCanvas``, to the state of its circuit.
+        """
+        return {circuit.name: circuit.state for circuit in self._circuits.values()}
+
+    def _get(self, endpoint: Endpoint) -> _Circuit | None:
+        group = endpoint.group
+        if group is None:
+            return None
+
+        try:
+            return self._circuits[group]
+        except KeyError:
+            circuit = self._circuits[group] = _Circuit(self, group.__name__)
+            return circuit
+
+    def _is_failure(self, error: BaseException | None, elapsed: float) -> bool:
+        if error is not None:
+            return _is_failure(error)
+        return self.slow_threshold is not None and elapsed >= self.slow_threshold
+
+    def _stats(self) -> dict[str, dict[str, float]]:
+        return {
+            circuit.name.lower(): {"state": circuit.state.value, "opened": circuit.opened}
+            for circuit in self._circuits.values()
+        }
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import logging
+import time
+
+from ..enums import Priority
+from ..errors import RateLimited
+from .scheduler import PrioritySemaphore
+
+if TYPE_CHECKING:
+    from .endpoints import BaseEndpoint, Endpoint
+    from .latency import LatencyTracker
+
+
+__all__ = ("AdaptiveConcurrency",)
+
+_log: logging.Logger = logging.getLogger("somerandomapi.concurrency")
+
+# how much of the smoothed latency ratio is made up by the latest response.
+_SMOOTHING: float = 0.2
+
+
+class _Limit:
+    """The in flight limit of a single endpoint group."""
+
+    __slots__ = ("_concurrency", "_last_decrease", "_ratio", "_semaphore", "decreased", "in_flight", "limit", "name")
+
+    def __init__(self, concurrency: AdaptiveConcurrency, name: str) -> None:
+        self._concurrency: AdaptiveConcurrency = concurrency
+        self.name: str = name
+        self.limit: float = float(concurrency.initial)
+        self.in_flight: int = 0
+        self.decreased: int = 0
+        self._semaphore: PrioritySemaphore = PrioritySemaphore(concurrency.initial)
+        self._last_decrease: float = 0.0
+        # the latency of recent responses relative to the usual latency of their endpoint, smoothed.
+        self._ratio: float = 1.0
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} name={self.name!r} limit={int(self.limit)} in_flight={self.in_flight}>"
+
+    async def acquire(self, priority: Priority = Priority.NORMAL) -> None:
+        await self._semaphore.acquire(priority.value)
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def _set(self, limit: float) -> None:
+        concurrency = self._concurrency
+        limit = min(max(limit, concurrency.minimum), concurrency.maximum)
+        delta = int(limit) - int(self.limit)
+        self.limit = limit
+        if delta:
+            # slots taken away are given back by requests in flight before new requests get them.
+            self._semaphore._resize(delta)
+
+    def record(self, started: float, error: BaseException | None, ratio: float | None) -> None:
+        concurrency = self._concurrency
+        if ratio is not None:
+            self._ratio += (ratio - self._ratio) * _SMOOTHING
+
+        if isinstance(error, (RateLimited, TimeoutError)):
+            self._decrease(started, type(error).__name__)
+        elif self._ratio > concurrency.latency_tolerance:
+            self._decrease(started, f"latency is {self._ratio:.1f} times the usual")
+        elif error is None and self.in_flight * 2 >= self.limit:
+            # only grow while the limit is being used, or it grows without ever being tested.
+            # adds ``increase`` per ``limit`` responses, about once per round trip.
+            self._set(self.limit + concurrency.increase / self.limit)
+
+    def _decrease(self, started: float, reason: str) -> None:
+        if started < self._last_decrease:
+            # sent before the last decrease, which was already for the same congestion.
+            return
+
+        self._last_decrease = time.perf_counter()
+        self.decreased += 1
+        old = int(self.limit)
+        self._set(self.limit * self._concurrency.backoff)
+        _log.debug("Lowering the concurrency limit of %s from %s to %s, %s", self.name, old, int(self.limit), reason)
+
+
+class AdaptiveConcurrency:
+    """Finds the amount of requests to each endpoint group that can be in flight at once.
+
+    Each endpoint group, such as the canvas or premium endpoints, has its own limit that starts at ``initial``.
+    It grows by ``increase`` for every round of responses that came back in time while the limit was used, and is
+    multiplied by ``backoff`` when a request is rate limited, times out or the latency of the group rises to more than
+    ``latency_tolerance`` times the usual latency of its endpoints. This settles at about the most requests the API
+    can handle at once, without setting ``max_concurrency`` by hand. Requests over the limit wait for a free slot,
+    which is given by :class:`.Priority` first.
+
+    The limits are exposed in the :class:`.MetricsRegistry`.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ----------
+    initial: :class:`int`
+        The limit that each group starts at. Defaults to ``10``.
+    minimum: :class:`int`
+        The lowest the limit can go. Defaults to ``1``.
+    maximum: :class:`int`
+        The highest the limit can go. Defaults to ``100``.
+    increase: :class:`float`
+        How much the limit grows per round of responses. Defaults to ``1``.
+    backoff: :class:`float`
+        What the limit is multiplied by when it's lowered, between 0 and 1. Defaults to ``0.5``.
+    latency_tolerance: :class:`float`
+        How many times the usual latency the recent latency of a group may be before its limit is lowered.
+        Defaults to ``2``.
+    """
+
+    __slots__ = ("_limits", "backoff", "increase", "initial", "latency_tolerance", "maximum", "minimum")
+
+    def __init__(
+        self,
+        *,
+        initial: int = 10,
+        minimum: int = 1,
+        maximum: int = 100,
+        increase: float = 1.0,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+    ) -> None:
+        if minimum < 1:
+            raise ValueError("minimum must be 1 or more.")
+        if not minimum <= initial <= maximum:
+            raise ValueError("initial must be between minimum and maximum.")
+        if increase <= 0:
+            raise ValueError("increase must be more than 0.")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1.")
+        if latency_tolerance <= 1:
+            raise ValueError("latency_tolerance must be more than 1.")
+
+        self.initial: int = initial
+        self.minimum: int = minimum
+        self.maximum: int = maximum
+        self.increase: float = increase
+        self.backoff: float = backoff
+        self.latency_tolerance: float = latency_tolerance
+        self._limits: dict[type[BaseEndpoint], _Limit] = {}
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} initial={self.initial} minimum={self.minimum} maximum={self.maximum}>"
+
+    def limits(self) -> dict[str, int]:
+        """Returns the current limit of each endpoint group that was requested.
+
+        Returns
+        -------
+        Dict[:class:`str`, :class:`int`]
+            Maps the name of the endpoint group, e.g. ``BaseCanvas``, to the amount of requests that may be in flight.
+        """
+        return {limit.name: int(limit.limit) for limit in self._limits.values()}
+
+    def _get(self, endpoint: Endpoint) -> _Limit | None:
+        group = endpoint.group
+        if group is None:
+            return None
+
+        try:
+            return self._limits[group]
+        except KeyError:
+            limit = self._limits[group] = _Limit(self, group.__name__)
+            return limit
+
+    def _record(self, endpoint: Endpoint, started: float, error: BaseException | None, latency: LatencyTracker) -> None:
+        limit = self._get(endpoint)
+        if limit is None:
+            return
+
+        usual = latency.percentile(endpoint, 0.5)
+        ratio = None
+        if usual and error is None:
+            ratio = (time.perf_counter() - started) / usual
+        limit.record(started, error, ratio)
+
+    def _stats(self) -> dict[str, dict[str, float]]:
+        return {
+            limit.name.lower(): {"limit": int(limit.limit), "in_flight": limit.in_flight, "decreased": limit.decreased}
+            for limit in self._limits.values()
+        }
@@ -1,84 +1,139 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Self
-from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, NamedTuple
+from collections.abc import Callable, Mapping
 import logging
-from urllib.parse import quote_plus, urlencode
+from urllib.parse import quote_plus
+
+import aiohttp
 
 from .. import enums
 
-if TYPE_CHECKING:
-    from .http import HTTPClient
+_log: logging.Logger = logging.getLogger("somerandomapi.endpoints")
 
+# cache lifetimes, conversions never change and lookups (pokemon, lyrics) rarely do.
+_CONVERSION_TTL: float = 7 * 24 * 60 * 60
+_LOOKUP_TTL: float = 24 * 60 * 60
 
-_log: logging.Logger = logging.getLogger("somerandomapi.endpoints")
+# timeouts, JSON endpoints answer in well under a second and renders of GIFs can take several seconds.
+_FAST_TIMEOUT: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=5, sock_connect=3)
+_DEFAULT_TIMEOUT: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=15, sock_connect=5)
+_RENDER_TIMEOUT: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=30, sock_connect=5)
+_PREMIUM_TIMEOUT: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=60, sock_connect=5)
+
+
+class _URLPlan(NamedTuple):
+    """Immutable, precompiled description of how to build the URL of an endpoint."""
+
+    path: str
+    # names of the required parameters
+    required: tuple[str, ...]
+    # names of the parameters that are part of the path, in order
+    body: tuple[str, ...]
+    # (name, "name=") pairs of the parameters that go into the query string, in order
+    query: tuple[tuple[str, str], ...]
 
 
 class Endpoint:
     __slots__: tuple[str, ...] = (
+        "_plan",
+        "cache_ttl",
+        "connections",
+        "group",
         "parameters",
         "path",
+        "randomized",
+        "returns_image",
+        "timeout",
     )
 
     def __init__(
         self,
         path: str,
+        *,
+        returns_image: bool | None = None,
+        randomized: bool | None = None,
+        cache_ttl: float | None = None,
+        timeout: aiohttp.ClientTimeout | None = None,
+        connections: str | None = None,
         **parameters: Parameter,
     ) -> None:
         self.path: str = path
         self.parameters: dict[str, Parameter] = parameters.copy()
+        # None means "inherit from the BaseEndpoint subclass this endpoint is defined on"
+        self.returns_image: bool | None = returns_image
+        self.randomized: bool | None = randomized
+        self.cache_ttl: float | None = cache_ttl
+        self.timeout: aiohttp.ClientTimeout | None = timeout
+        # the name of the connections of the pool to use (see ConnectionPool.limits), None for those of the group.
+        self.connections: str | None = connections
+        self._plan: _URLPlan | None = None
+        # the BaseEndpoint subclass this endpoint is defined on, filled in by it.
+        self.group: type[BaseEndpoint] | None = None
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} path={self.path!r} parameters={len(self.parameters)}>"
 
-    def _set_param_values(self, client: HTTPClient, **values: Any) -> Self:
-        _log.debug("Setting parameter values for %r endpoint", self.path)
-        # new class to avoid mutating the original
-        cls = self.__class__(self.path, **self.parameters)
-        params = cls.parameters.copy()
-
-        if not params:
-            _log.debug("No parameters found for %r endpoint", self.path)
-            return cls
-
-        for name, param in params.items():
-            if not param.required and name not in values:
-                _log.debug("Skipping optional parameter %r", name)
-                continue
-
-            if param.required:
-                if name not in values:
-                    msg = f"Missing required parameter {name}"
-                    raise TypeError(msg)
-                if not values[name]:
-                    msg = f"Missing required value for parameter {name}"
-                    raise TypeError(msg)
-
-            _log.debug("Setting value for %s parameter to %r", name, values[name])
-            param.value = values[name]
-
-        return cls
-
-    def get_constructed_url(self) -> str:
-        if not self.parameters:
-            return self.path
-
-        url = self.path
-        body_params = sorted(
-            [
-                (name, param)
-                for name, param in self.parameters.items()
-                if param.value is not None and param.is_body_parameter
-            ],
+    def _compile(self) -> _URLPlan:
+        body = sorted(
+            ((name, param) for name, param in self.parameters.items() if param.is_body_parameter),
             key=lambda p: p[1].index if p[1].index is not None else float("inf"),
         )
-        params = {name: param.value for name, param in self.parameters.items() if param.value is not None}
-        for name, param in body_params:
-            url += f"/{param.value}"
-            params.pop(name)
-
-        if params:
-            url += "?" + urlencode(params, quote_via=quote_plus)
+        self._plan = plan = _URLPlan(
+            path=self.path,
+            required=tuple(name for name, param in self.parameters.items() if param.required),
+            body=tuple(name for name, _ in body),
+            query=tuple(
+                (name, f"{quote_plus(name)}=") for name, param in self.parameters.items() if not param.is_body_parameter
+            ),
+        )
+        return plan
+
+    def build_url(self, values: Mapping[str, Any], /) -> str:
+        """Builds the URL (without the base) of this endpoint with the given parameter values.
+
+        This does not touch the parameters of this endpoint, which makes it safe to use on the
+        shared endpoints concurrently.
+
+        Parameters
+        ----------
+        values: Mapping[:class:`str`, Any]
+            The values of the parameters. Unknown names and ``None`` values are ignored.
+
+        Raises
+        ------
+        TypeError
+            A required parameter is missing or has no value.
+
+        Returns
+        -------
+        :class:`str`
+            The built URL.
+        """
+        plan = self._plan or self._compile()
+
+        for name in plan.required:
+            if not values.get(name):
+                msg = (
+                    f"Missing required value for parameter {name}"
+                    if name in values
+                    else f"Missing required parameter {name}"
+                )
+                raise TypeError(msg)
+
+        url = plan.path
+        for name in plan.body:
+            value = values.get(name)
+            if value is not None:
+                url += f"/{value}"
+
+        query = [
+            prefix + quote_plus(value if isinstance(value, (str, bytes)) else str(value))
+            for name, prefix in plan.query
+            if (value := values.get(name)) is not None
+        ]
+        if query:
+            url += "?" + "&".join(query)
 
         return url
 
@@ -100,14 +155,43 @@ class BaseEndpointMeta(type):
 
 class BaseEndpoint(metaclass=BaseEndpointMeta):
     path: str = "/"
+    # whether the endpoints of this class respond with an image that is fully determined by the URL.
+    returns_image: bool = False
+    # whether the endpoints of this class respond with something different every time for the same URL.
+    randomized: bool = False
+    # how many seconds responses of the endpoints of this class may be cached for, None for the default of the cache.
+    cache_ttl: float | None = None
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} path={self.path}>"
 
     @classmethod
     def ratelimit(cls) -> tuple[int, int]:
+        """Returns the client side rate limit of the endpoints of this class.
+
+        Subclasses that don't implement this share the rate limit of the parent class that does.
+
+        Returns
+        -------
+        Tuple[:class:`int`, :class:`int`]
+            The amount of requests allowed per amount of seconds.
+        """
         raise NotImplementedError("Subclasses must implement the 'ratelimit' method.")
 
+    @classmethod
+    def timeout(cls) -> aiohttp.ClientTimeout:
+        """Returns the timeout of requests to the endpoints of this class.
+
+        Subclasses that don't implement this use the timeout of the parent class that does.
+        Endpoints can override it with their ``timeout`` keyword argument.
+
+        Returns
+        -------
+        :class:`aiohttp.ClientTimeout`
+            The timeout to pass to the request.
+        """
+        return _DEFAULT_TIMEOUT
+
     @classmethod
     def from_enum(cls, enum: enums.BaseEnum) -> Endpoint:
         if not isinstance(enum, enums.BaseEnum):
@@ -125,6 +209,16 @@ class BaseEndpoint(metaclass=BaseEndpointMeta):
     def _handle_endpoint(cls, endpoint: Endpoint) -> None:
         if not endpoint.path.startswith(cls.path):
             endpoint.path = f"{cls.path}{endpoint.path}"
+            endpoint._plan = None
+        if endpoint.returns_image is None:
+            endpoint.returns_image = cls.returns_image
+        if endpoint.randomized is None:
+            endpoint.randomized = cls.randomized
+        if endpoint.cache_ttl is None:
+            endpoint.cache_ttl = cls.cache_ttl
+        if endpoint.timeout is None:
+            endpoint.timeout = cls.timeout()
+        endpoint.group = cls
         for name, param in endpoint.parameters.items():
             param._name = name
 
@@ -181,27 +275,46 @@ class Base(BaseEndpoint):
         @classmethod
         def from_enum(cls, enum: None) -> None: ...
 
+    @classmethod
+    def ratelimit(cls) -> tuple[int, int]:
+        return (60, 60)
+
+    @classmethod
+    def timeout(cls) -> aiohttp.ClientTimeout:
+        return _FAST_TIMEOUT
+
     BASE64 = Endpoint(
         "base64",
+        cache_ttl=_CONVERSION_TTL,
         encode=Parameter(extra="Text to encode into base64", required=False),
         decode=Parameter(extra="Decode base64 into text", required=False),
     )
     BINARY = Endpoint(
         "binary",
+        cache_ttl=_CONVERSION_TTL,
         encode=Parameter(extra="Text to encode into binary", required=False),
         decode=Parameter(extra="Decode binary into text", required=False),
     )
     BOTTOKEN = Endpoint(
         "bottoken",
+        randomized=True,
     )
     CHATBOT = Endpoint(
         "chatbot",
+        randomized=True,
+        timeout=_DEFAULT_TIMEOUT,
         message=Parameter(extra="Message that will be sent to the chatbot"),
     )
-    JOKE = Endpoint("joke")
-    LYRICS = Endpoint("lyrics", title=Parameter(extra="Title of song to search"))
+    JOKE = Endpoint("joke", randomized=True)
+    LYRICS = Endpoint(
+        "lyrics", cache_ttl=_LOOKUP_TTL, timeout=_DEFAULT_TIMEOUT, title=Parameter(extra="Title of song to search")
+    )
     WELCOME = Endpoint(
         "welcome/img",
+        returns_image=True,
+        # a render like the canvas endpoints, it shouldn't hold the connections of the fast endpoints.
+        timeout=_RENDER_TIMEOUT,
+        connections="BaseCanvas",
         template=Parameter(index=0, extra="1 to 7", is_body_parameter=True),
         background=Parameter(index=1, is_body_parameter=True),
         type=Parameter(),
@@ -217,11 +330,20 @@ class Base(BaseEndpoint):
 
 class Animu(BaseEndpoint):
     path: str = "animu/"
+    randomized: bool = True
     if TYPE_CHECKING:
 
         @classmethod
         def from_enum(cls, enum: enums.Animu) -> Endpoint: ...
 
+    @classmethod
+    def ratelimit(cls) -> tuple[int, int]:
+        return (60, 60)
+
+    @classmethod
+    def timeout(cls) -> aiohttp.ClientTimeout:
+        return _FAST_TIMEOUT
+
     NOM = Endpoint("nom")
     POKE = Endpoint("poke")
     CRY = Endpoint("cry")
@@ -233,11 +355,20 @@ class Animu(BaseEndpoint):
 
 class Animal(BaseEndpoint):
     path: str = "animal/"
+    randomized: bool = True
     if TYPE_CHECKING:
 
         @classmethod
         def from_enum(cls, enum: enums.Animal) -> Endpoint: ...
 
+    @classmethod
+    def ratelimit(cls) -> tuple[int, int]:
+        return (60, 60)
+
+    @classmethod
+    def timeout(cls) -> aiohttp.ClientTimeout:
+        return _FAST_TIMEOUT
+
     FOX = Endpoint("fox")
     CAT = Endpoint("cat")
     BIRD = Endpoint("bird")
@@ -254,11 +385,20 @@ class Animal(BaseEndpoint):
 
 class Facts(BaseEndpoint):
     path: str = "facts/"
+    randomized: bool = True
     if TYPE_CHECKING:
 
         @classmethod
         def from_enum(cls, enum: enums.Fact) -> Endpoint: ...
 
+    @classmethod
+    def ratelimit(cls) -> tuple[int, int]:
+        return (60, 60)
+
+    @classmethod
+    def timeout(cls) -> aiohttp.ClientTimeout:
+        return _FAST_TIMEOUT
+
     CAT = Endpoint("cat")
     FOX = Endpoint("fox")
     PANDA = Endpoint("panda")
@@ -274,11 +414,20 @@ class Facts(BaseEndpoint):
 
 class Img(BaseEndpoint):
     path: str = "img/"
+    randomized: bool = True
     if TYPE_CHECKING:
 
         @classmethod
         def from_enum(cls, enum: enums.Img) -> Endpoint: ...
 
+    @classmethod
+    def ratelimit(cls) -> tuple[int, int]:
+        return (60, 60)
+
+    @classmethod
+    def timeout(cls) -> aiohttp.ClientTimeout:
+        return _FAST_TIMEOUT
+
     FOX = Endpoint("fox")
     CAT = Endpoint("cat")
     PANDA = Endpoint("panda")
@@ -294,14 +443,28 @@ class Img(BaseEndpoint):
 
 class BaseCanvas(BaseEndpoint):
     path: str = "canvas/"
+    returns_image: bool = True
     if TYPE_CHECKING:
 
         @classmethod
         def from_enum(cls, enum: None) -> None: ...
 
+    @classmethod
+    def ratelimit(cls) -> tuple[int, int]:
+        return (30, 60)
+
+    @classmethod
+    def timeout(cls) -> aiohttp.ClientTimeout:
+        return _RENDER_TIMEOUT
+
     COLORVIEWER = Endpoint("colorviewer", hex=Parameter(extra="hex color code without the # ie. white is ffffff"))
-    HEX = Endpoint("hex", rgb=Parameter(extra="separated by commas"))
-    RGB = Endpoint("rgb", hex=Parameter(extra="hex color code without the # ie. white is ffffff"))
+    HEX = Endpoint("hex", returns_image=False, cache_ttl=_CONVERSION_TTL, rgb=Parameter(extra="separated by commas"))
+    RGB = Endpoint(
+        "rgb",
+        returns_image=False,
+        cache_ttl=_CONVERSION_TTL,
+        hex=Parameter(extra="hex color code without the # ie. white is ffffff"),
+    )
 
 
 class CanvasFilter(BaseCanvas):
@@ -416,11 +579,20 @@ class CanvasOverlay(BaseCanvas):
 
 class Pokemon(BaseEndpoint):
     path: str = "pokemon/"
+    cache_ttl: float | None = _LOOKUP_TTL
     if TYPE_CHECKING:
 
         @classmethod
         def from_enum(cls, enum: None) -> None: ...
 
+    @classmethod
+    def ratelimit(cls) -> tuple[int, int]:
+        return (60, 60)
+
+    @classmethod
+    def timeout(cls) -> aiohttp.ClientTimeout:
+        return _FAST_TIMEOUT
+
     ABILITIES = Endpoint("abilities", ability=Parameter(extra="Ability name or id of a pokemon ability"))
     ITEMS = Endpoint("items", item=Parameter(extra="Item name or id of a pokemon item"))
     MOVES = Endpoint("moves", move=Parameter(extra="Pokemon move name or id of a pokemon move"))
@@ -429,11 +601,20 @@ class Pokemon(BaseEndpoint):
 
 class Premium(BaseEndpoint):
     path: str = "premium/"
+    returns_image: bool = True
     if TYPE_CHECKING:
 
         @classmethod
         def from_enum(cls, enum: None) -> None: ...
 
+    @classmethod
+    def ratelimit(cls) -> tuple[int, int]:
+        return (30, 60)
+
+    @classmethod
+    def timeout(cls) -> aiohttp.ClientTimeout:
+        return _PREMIUM_TIMEOUT
+
     AMONGUS = Endpoint(
         "amongus",
         avatar=Parameter(extra="use png or jpg"),
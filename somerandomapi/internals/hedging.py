@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .endpoints import Premium
+from .retry import _RetryBudget
+
+if TYPE_CHECKING:
+    from .endpoints import Endpoint
+    from .latency import LatencyTracker
+
+
+__all__ = ("HedgePolicy",)
+
+
+class HedgePolicy:
+    """Describes when a second, identical request is made for a request that is slower than usual.
+
+    If a request hasn't returned after the ``percentile`` latency of its endpoint, the same request is made again
+    and whichever returns first is used, the other is cancelled. This cuts the tail latency caused by the
+    occasional slow response at the cost of some extra requests, which go through the rate limiter like any other.
+
+    Hedges are limited by a budget to ``budget`` times the requests made in the last 10 seconds,
+    a request that is retried counts once.
+    Requests to an endpoint are only hedged once enough of its responses were received to know its latency.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ----------
+    percentile: :class:`float`
+        The latency percentile after which a request is hedged, between 0 and 1. Defaults to ``0.9``.
+    budget: :class:`float`
+        The ratio of extra traffic that hedges may add, e.g. ``0.05`` for 5%. Defaults to ``0.05``.
+    premium: :class:`bool`
+        Whether to hedge requests to the premium endpoints, which have a low rate limit. Defaults to ``False``.
+    """
+
+    __slots__ = ("_budget", "hedged", "percentile", "premium", "won")
+
+    def __init__(self, *, percentile: float = 0.9, budget: float = 0.05, premium: bool = False) -> None:
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1.")
+        if budget < 0:
+            raise ValueError("budget must be 0 or more.")
+
+        self.percentile: float = percentile
+        self.premium: bool = premium
+        # min_per_second is kept low, hedges only make sense when there is traffic to base the latency on.
+        self._budget: _RetryBudget = _RetryBudget(budget, min_per_second=0.1)
+        self.hedged: int = 0
+        self.won: int = 0
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} percentile={self.percentile} premium={self.premium} hedged={self.hedged}>"
+
+    def applies_to(self, endpoint: Endpoint, /) -> bool:
+        """Whether requests to ``endpoint`` may be hedged."""
+        if endpoint.group is not None and issubclass(endpoint.group, Premium):
+            return self.premium
+        return True
+
+    def _record_request(self, endpoint: Endpoint) -> None:
+        # once per request, not per attempt, or retries would pay for the hedges of slow endpoints.
+        if self.applies_to(endpoint):
+            self._budget.deposit()
+
+    def _delay_for(self, endpoint: Endpoint, latency: LatencyTracker) -> float | None:
+        # seconds to wait before hedging, None to not hedge at all.
+        if not self.applies_to(endpoint):
+            return None
+
+        return latency.percentile(endpoint, self.percentile)
+
+    def _stats(self) -> dict[str, float]:
+        return {"hedged": self.hedged, "won": self.won}
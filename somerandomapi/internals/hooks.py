@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..enums import CircuitState
+    from .endpoints import Endpoint
+
+
+__all__ = ("RequestHook",)
+
+
+class RequestHook:
+    """Base class for hooks that are called around every request the client makes to the API.
+
+    Subclass this and override the methods you need, the default implementations do nothing.
+    Hooks are called in the order they were added and are called for every attempt of a request,
+    including retries. Requests answered from a cache or coalesced with another request don't call them.
+
+    Exceptions raised by a hook are not caught and propagate to the caller of the request.
+
+    .. versionadded:: 0.2.0
+
+    Example
+    --------
+    .. code-block:: python
+
+        class LatencyLogger(somerandomapi.RequestHook):
+            async def after_response(self, endpoint, status, elapsed, size):
+                print(f"{endpoint.path} {status} took {elapsed * 1000:.1f}ms for {size} bytes")
+
+
+        client = somerandomapi.Client(hooks=[LatencyLogger()])
+    """
+
+    __slots__ = ()
+
+    async def before_request(self, endpoint: Endpoint, url: str, /) -> Any:
+        """Called before a request is made.
+
+        If this returns anything other than ``None``, no request is made and
+        the returned value is used as the response, the remaining hooks aren't called.
+
+        Parameters
+        ----------
+        endpoint: Endpoint
+            The endpoint that is requested. ``endpoint.path`` is the path of it.
+        url: :class:`str`
+            The full URL that is requested.
+        """
+        return None
+
+    async def after_response(self, endpoint: Endpoint, status: int, elapsed: float, size: int, /) -> None:
+        """Called after a response was received, before it is turned into a result or an error.
+
+        Parameters
+        ----------
+        endpoint: Endpoint
+            The endpoint that was requested.
+        status: :class:`int`
+            The status code of the response.
+        elapsed: :class:`float`
+            The amount of seconds it took to receive the response, including the body if it was read.
+        size: :class:`int`
+            The size of the body in bytes, ``0`` if unknown.
+        """
+
+    async def on_error(self, endpoint: Endpoint, error: Exception, /) -> None:
+        """Called when a request failed, before the error is retried or raised.
+
+        Parameters
+        ----------
+        endpoint: Endpoint
+            The endpoint that was requested.
+        error: :class:`Exception`
+            The error the request failed with, e.g. a :class:`.HTTPException` or a connection error.
+        """
+
+    async def on_circuit_change(self, group: str, old: CircuitState, new: CircuitState, /) -> None:
+        """Called when the circuit of an endpoint group changes state, see :class:`.CircuitBreaker`.
+
+        Parameters
+        ----------
+        group: :class:`str`
+            The name of the endpoint group, e.g. ``BaseCanvas``.
+        old: :class:`.CircuitState`
+            The previous state of the circuit.
+        new: :class:`.CircuitState`
+            The new state of the circuit.
+        """
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any, ClassVar, Literal, TypeVar, overload
-from collections.abc import Coroutine
+import asyncio
+from collections.abc import Callable, Coroutine, Iterable, Sequence
+import contextvars
+import importlib
+import importlib.util
 import json
 import logging
+import time
 
 import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
 
 from .. import utils as _utils
 from ..clients.animal import AnimalClient
@@ -13,9 +19,31 @@ from ..clients.animu import AnimuClient
 from ..clients.canvas import CanvasClient
 from ..clients.pokemon import PokemonClient
 from ..clients.premium import PremiumClient
+from ..enums import CircuitState, Priority
 from ..errors import *
 from ..models.image import Image
-from .endpoints import Endpoint, _Endpoint
+from .cache import DiskCache, ResponseCache
+from .circuit import CircuitBreaker
+from .concurrency import AdaptiveConcurrency
+from .endpoints import BaseEndpoint, Endpoint, _Endpoint
+from .hedging import HedgePolicy
+from .hooks import RequestHook
+from .keys import KeyPool
+from .latency import LatencyTracker
+from .metrics import MetricsRegistry, _flatten
+from .pool import ConnectionPool, _connector_stats
+from .ratelimit import RateLimiter, parse_reset_after
+from .retry import RetryPolicy
+from .scheduler import (
+    Scheduler,
+    _current_deadline,
+    _current_priority,
+    _remaining,
+    request_deadline,
+    request_priority,
+)
+from .timeouts import AdaptiveTimeouts
+from .tracing import _create_trace_config, _finish_timing, _start_timing
 
 if TYPE_CHECKING:
     from ..clients.chatbot import Chatbot
@@ -28,6 +56,7 @@ if TYPE_CHECKING:
         img as imgtypes,
         pokemon as pokemontypes,
     )
+    from .circuit import _Circuit
 
     T = TypeVar("T")
     Response = Coroutine[Any, Any, T]
@@ -38,12 +67,66 @@ __all__ = ()
 _log: logging.Logger = logging.getLogger("somerandomapi.http")
 
 
-async def json_or_text(response: aiohttp.ClientResponse) -> dict[str, Any] | str:
-    text = await response.text(encoding="utf-8")
-    if response.content_type == "application/json":
-        return json.loads(text)
+def _find_json_loads() -> Callable[[bytes], Any]:
+    # the fastest decoder that is installed, all of them parse bytes directly.
+    for package, module_name, name in (("orjson", "orjson", "loads"), ("msgspec", "msgspec.json", "decode")):
+        if importlib.util.find_spec(package) is None:
+            continue
 
-    return text
+        _log.debug("Parsing JSON with %s.%s", module_name, name)
+        return getattr(importlib.import_module(module_name), name)
+
+    return json.loads
+
+
+_json_loads: Callable[[bytes], Any] = _find_json_loads()
+
+
+def _json_or_text(content_type: str, body: bytes, loads: Callable[[bytes], Any] = _json_loads) -> dict[str, Any] | str:
+    # parse the bytes as is, instead of decoding them to a str first.
+    if content_type == "application/json":
+        return loads(body)
+
+    return body.decode("utf-8")
+
+
+async def json_or_text(
+    response: aiohttp.ClientResponse, loads: Callable[[bytes], Any] = _json_loads
+) -> dict[str, Any] | str:
+    return _json_or_text(response.content_type, await response.read(), loads)
+
+
+class _SharedRequest:
+    """A request that identical requests made while it is in flight wait on, see HTTPClient._coalesce."""
+
+    __slots__ = ("_context", "deadlines", "task")
+
+    def __init__(self, context: contextvars.Context, task: asyncio.Task[Any]) -> None:
+        self._context: contextvars.Context = context
+        self.task: asyncio.Task[Any] = task
+        # the deadline of each caller waiting on the request, None for no deadline.
+        self.deadlines: list[float | None] = []
+
+    def join(self, deadline: float | None) -> None:
+        self.deadlines.append(deadline)
+        self._update()
+
+    def leave(self, deadline: float | None) -> bool:
+        # returns whether nobody is waiting on the request anymore.
+        self.deadlines.remove(deadline)
+        if not self.deadlines:
+            return True
+
+        self._update()
+        return False
+
+    def _update(self) -> None:
+        # the request is made under the latest deadline of the callers waiting on it, it is dropped
+        # while queued only once nobody can use it anymore. Safe between the steps of the task.
+        deadlines = [deadline for deadline in self.deadlines if deadline is not None]
+        latest = max(deadlines) if len(deadlines) == len(self.deadlines) else None
+        if not self.task.done():
+            self._context.run(_current_deadline.set, latest)
 
 
 AllAnimuEndpoint = Literal[
@@ -203,17 +286,98 @@ class HTTPClient:
     __slots__ = (
         "__chatbot",
         "__user_provided_session",
+        "_adaptive_concurrency",
+        "_adaptive_timeouts",
         "_animal",
         "_animu",
+        "_anonymous_headers",
+        "_cache",
         "_canvas",
+        "_circuit_breaker",
+        "_fetch_images",
+        "_headers",
+        "_hedge_policy",
+        "_hooks",
+        "_in_flight",
+        "_json_loads",
+        "_keep_image_data",
+        "_keep_warm_task",
+        "_keys",
+        "_latency",
+        "_metrics",
         "_pokemon",
+        "_pool",
         "_premium",
+        "_ratelimiter",
+        "_retry_policy",
+        "_scheduler",
         "_session",
+        "_slow_request_threshold",
         "_token",
     )
 
-    def __init__(self, token: str | None, session: aiohttp.ClientSession | None) -> None:
+    def __init__(
+        self,
+        token: str | None,
+        session: aiohttp.ClientSession | None,
+        *,
+        keep_image_data: bool = True,
+        fetch_images: bool = True,
+        ratelimit: bool = False,
+        retry: RetryPolicy | None = None,
+        coalesce: bool = True,
+        cache: ResponseCache | DiskCache | None = None,
+        json_loads: Callable[[bytes], Any] | None = None,
+        hooks: Iterable[RequestHook] = (),
+        metrics: MetricsRegistry | None = None,
+        slow_request_threshold: float | None = None,
+        max_concurrency: int | None = None,
+        adaptive_timeouts: AdaptiveTimeouts | None = None,
+        hedge: HedgePolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        tokens: Sequence[str] | None = None,
+        pool: ConnectionPool | None = None,
+        adaptive_concurrency: AdaptiveConcurrency | None = None,
+    ) -> None:
         self._token: str | None = token
+        # the headers of every request, built once per token. They are sent per request instead of
+        # being written to the session, so a session can be shared by clients with different tokens.
+        self._headers: CIMultiDictProxy[str] = self._build_headers(token)
+        # for downloads from other hosts, which must not get the token.
+        self._anonymous_headers: CIMultiDictProxy[str] = self._build_headers(None) if token else self._headers
+        self._keys: KeyPool | None = KeyPool(tokens, self._build_headers) if tokens else None
+        self._keep_image_data: bool = keep_image_data
+        self._fetch_images: bool = fetch_images
+        self._ratelimiter: RateLimiter | None = RateLimiter(len(tokens) if tokens else 1) if ratelimit else None
+        self._retry_policy: RetryPolicy | None = retry
+        # (full url, priority) -> the task of the request that is currently being made to it
+        self._in_flight: dict[tuple[str, Priority], _SharedRequest] | None = {} if coalesce else None
+        self._cache: ResponseCache | DiskCache | None = cache
+        self._json_loads: Callable[[bytes], Any] = json_loads or _json_loads
+        self._hooks: list[RequestHook] = list(hooks)
+        self._metrics: MetricsRegistry | None = metrics
+        self._slow_request_threshold: float | None = slow_request_threshold
+        self._latency: LatencyTracker = LatencyTracker()
+        self._adaptive_concurrency: AdaptiveConcurrency | None = adaptive_concurrency
+        self._scheduler: Scheduler = Scheduler(max_concurrency, self._latency, adaptive_concurrency)
+        self._adaptive_timeouts: AdaptiveTimeouts | None = adaptive_timeouts
+        self._hedge_policy: HedgePolicy | None = hedge
+        self._circuit_breaker: CircuitBreaker | None = circuit_breaker
+        if metrics is not None:
+            if cache is not None:
+                metrics._add_collector("cache", cache._stats, counters=("hits", "misses", "evictions"))
+            metrics._add_collector("pool", self._pool_group_stats, label="group", counters=("opened", "reused"))
+            metrics._add_collector(
+                "lanes", self._scheduler.stats, label="lane", counters=("requests", "dropped", "total_wait")
+            )
+            if hedge is not None:
+                metrics._add_collector("hedging", hedge._stats, counters=("hedged", "won"))
+            if circuit_breaker is not None:
+                metrics._add_collector("circuit", circuit_breaker._stats, label="group", counters=("opened",))
+            if self._keys is not None:
+                metrics._add_collector("keys", self._keys._stats, label="key", counters=("requests",))
+            if adaptive_concurrency is not None:
+                metrics._add_collector("concurrency", adaptive_concurrency._stats, label="group", counters=("decreased",))
 
         self._animal: AnimalClient = AnimalClient(self)
         self._animu: AnimuClient = AnimuClient(self)
@@ -234,19 +398,52 @@ class HTTPClient:
 
         self.__user_provided_session: bool = session is not _utils.NOVALUE and session is not None
         self._session: aiohttp.ClientSession | None = session
+        self._keep_warm_task: asyncio.Task[None] | None = None
+        # the pool that the session is taken from, unless the user provided one.
+        self._pool: ConnectionPool | None = None if self.__user_provided_session else pool or ConnectionPool()
+
+    def _pool_stats(self) -> dict[str, float]:
+        return _flatten(self._pool_group_stats())
+
+    def _pool_group_stats(self) -> dict[str, dict[str, float]]:
+        # per group with connections of its own, "" for the shared connections.
+        if not self._session or self._session.closed or self._session.connector is None:
+            return {}
+
+        stats = {"": _connector_stats(self._session.connector)}
+        if self._pool is not None:
+            for name, values in self._pool._stats().items():
+                stats.setdefault(name, {}).update(values)
+        return stats
+
+    def _build_headers(self, token: str | None, /) -> CIMultiDictProxy[str]:
+        # aiohttp uses a multidict as is, a plain dict would be converted on every request.
+        headers: CIMultiDict[str] = CIMultiDict({"User-Agent": self.USER_AGENT})
+        if token:
+            headers["Authorization"] = str(token)
+        return CIMultiDictProxy(headers)
 
     async def initiate_session(self) -> aiohttp.ClientSession:
         if not self._session or self._session.closed:
             if self.__user_provided_session:
                 _log.debug("Session is closed, but user provided it.")
-            _log.debug("Creating a new session.")
-            self._session = aiohttp.ClientSession()
+            if self._pool is not None:
+                self._session = self._pool._acquire(self)
+            else:
+                _log.debug("Creating a new session.")
+                self._session = aiohttp.ClientSession(trace_configs=[_create_trace_config()])
 
-        self._session.headers["User-Agent"] = self.USER_AGENT
-        if self._token:
-            self._session.headers["Authorization"] = str(self._token)
         return self._session
 
+    async def _session_for(self, group: type[BaseEndpoint] | str | None, /) -> aiohttp.ClientSession:
+        session = await self.initiate_session()
+        if self._pool is None or session is not self._pool._session:
+            # a session that was passed is used for every request.
+            return session
+
+        # slow endpoint groups and image downloads have connections of their own.
+        return self._pool._session_for(group)
+
     # BASE
     @overload
     async def request(
@@ -531,7 +728,24 @@ class HTTPClient:
     @overload
     async def request(self, _endpoint: _Endpoint, /, **parameters: Any) -> Any: ...
 
-    async def request(self, _endpoint: _Endpoint | Endpoint, /, *, pre_url: str | None = None, **parameters: Any) -> Any:
+    async def request(
+        self,
+        _endpoint: _Endpoint | Endpoint,
+        /,
+        *,
+        pre_url: str | None = None,
+        priority: Priority | None = None,
+        deadline: float | None = None,
+        **parameters: Any,
+    ) -> Any:
+        # deadline is the amount of seconds the request has to be made in, see request_deadline().
+        if priority is not None:
+            with request_priority(priority):
+                return await self.request(_endpoint, pre_url=pre_url, deadline=deadline, **parameters)
+        if deadline is not None:
+            with request_deadline(deadline):
+                return await self.request(_endpoint, pre_url=pre_url, **parameters)
+
         endpoint: Endpoint = _endpoint.value if not isinstance(_endpoint, Endpoint) else _endpoint  # type: ignore[reportAssignmentType]
         _log.debug(
             "Request called with endpoint: %s, pre_url: %s and parameters: %s",
@@ -540,78 +754,443 @@ class HTTPClient:
             parameters,
         )
         if not pre_url:
-            if endpoint.parameters:
-                if not parameters:
-                    msg = f"Endpoint {endpoint.path} requires parameters."
-                    raise ValueError(msg)
-
-                endpoint._set_param_values(self, **parameters)
+            if endpoint.parameters and not parameters:
+                msg = f"Endpoint {endpoint.path} requires parameters."
+                raise ValueError(msg)
 
-            url = endpoint.get_constructed_url()
-            full_url = f"{self.BASE_URL}/{url}"
+            full_url = f"{self.BASE_URL}/{endpoint.build_url(parameters)}"
         else:
             full_url = pre_url
 
-        _log.debug("Requesting %s with parameters: %s", full_url, parameters)
+        if not self._fetch_images and endpoint.returns_image:
+            # the image is fully determined by the URL, no need to ask the API to render it now.
+            _log.debug("Not fetching image endpoint %s, returning %s", endpoint.path, full_url)
+            return Image.construct(full_url, self)
 
-        session: aiohttp.ClientSession = await self.initiate_session()
-
-        async with session.get(full_url) as response:
-            if not response.content_type.startswith("image/"):
-                data = await json_or_text(response)
-            else:
-                data = response
-
-            if isinstance(data, dict) and data.get("error"):
-                # sometimes the api returns a 200 with an error
-                _log.debug("Request failed with error: %s and data: %s", data["error"], data)
-                # we should show the correct status code
-                data["code"] = response.status
-                raise BadRequest(endpoint, data)
-
-            if response.status == 200:
-                if response.content_type.startswith("image/"):
-                    return Image.construct(full_url, self)
-
-                return data
-
-            if response.status == 400:
-                _log.debug("Request failed with status code 400: %s", data)
-                raise BadRequest(endpoint, data)
-            elif response.status == 403:  # noqa: RET506
-                _log.debug("Request failed with status code 403: %s", data)
-                raise Forbidden(endpoint, data)
-            elif response.status == 404:
-                _log.debug("Request failed with status code 404: %s", data)
-                raise NotFound(endpoint, data)
-            elif response.status == 429:
-                _log.debug("Request failed with status code 429: %s", data)
-                raise RateLimited(endpoint, data)
-            elif response.status == 500:
-                _log.debug("Request failed with status code 500: %s", data)
-                raise InternalServerError(endpoint, data)
-            else:
-                _log.debug("Request failed with status code %s: %s", response.status, data)
-                raise HTTPException(endpoint, response, data)
-
-    async def _get_image_url(self, url: str, /) -> bytes:
-        await self.initiate_session()
-        if not self._session:
-            raise RuntimeError("Session is not initialized. This should never happen.")
+        if self._cache is not None and self._cache.ttl_for(endpoint) is not None:
+            cached = self._cache._get_body(full_url)
+            if cached is not _utils.NOVALUE:
+                _log.debug("Returning the cached response of %s", full_url)
+                # decoded again on every hit, so changing the result doesn't change the cached response.
+                return _json_or_text("application/json", cached, self._json_loads)
 
+        _log.debug("Requesting %s with parameters: %s", full_url, parameters)
+        if self._in_flight is not None and not endpoint.randomized:
+            return await self._coalesce(endpoint, full_url)
+
+        return await self._send(endpoint, full_url)
+
+    async def _coalesce(self, endpoint: Endpoint, full_url: str, /) -> Any:
+        # identical requests made while one is in flight share its result instead of making their own.
+        in_flight = self._in_flight
+        assert in_flight is not None
+
+        remaining = _remaining()
+        if remaining is not None:
+            # the shared request doesn't know about this deadline, reject what can't make it here instead.
+            self._scheduler._admit(endpoint, remaining)
+
+        # only requests of the same priority are shared, so nobody waits at the priority of someone else.
+        key = (full_url, _current_priority.get())
+        shared = in_flight.get(key)
+        if shared is None:
+            context = contextvars.copy_context()
+            task = asyncio.get_running_loop().create_task(self._send(endpoint, full_url), context=context)
+            shared = in_flight[key] = _SharedRequest(context, task)
+
+            def _done(finished: asyncio.Task[Any]) -> None:
+                if (current := in_flight.get(key)) is not None and current.task is finished:
+                    del in_flight[key]
+                # mark the exception as retrieved, all callers might have been cancelled.
+                if not finished.cancelled():
+                    finished.exception()
+
+            task.add_done_callback(_done)
+        else:
+            _log.debug("Joining the in-flight request to %s", full_url)
+
+        deadline = _current_deadline.get()
+        shared.join(deadline)
+        try:
+            # a caller that is cancelled should not cancel the request for everyone else waiting on it.
+            if remaining is None:
+                return await asyncio.shield(shared.task)
+
+            timeout = asyncio.timeout(remaining)
+            try:
+                async with timeout:
+                    return await asyncio.shield(shared.task)
+            except TimeoutError:
+                if not timeout.expired():
+                    # the request itself timed out.
+                    raise
+
+                _log.debug("Stopped waiting for the request to %s, its deadline passed", full_url)
+                raise DeadlineExceeded(endpoint, remaining=_remaining() or 0.0) from None
+        finally:
+            if shared.leave(deadline):
+                # nobody is left to use the result, a request that is still queued is dropped.
+                if in_flight.get(key) is shared:
+                    del in_flight[key]
+                shared.task.cancel()
+
+    async def _send(self, endpoint: Endpoint, full_url: str, /) -> Any:
+        if self._hedge_policy is not None:
+            self._hedge_policy._record_request(endpoint)
+
+        if self._retry_policy is None:
+            return await self._attempt(endpoint, full_url)
+        return await self._request_with_retries(endpoint, full_url, self._retry_policy)
+
+    async def _request_with_retries(self, endpoint: Endpoint, full_url: str, policy: RetryPolicy, /) -> Any:
+        policy._record_request()
+        attempt = 0
+        delay: float | None = None
+        while True:
+            try:
+                return await self._attempt(endpoint, full_url)
+            except (SomeRandomApiException, aiohttp.ClientConnectionError) as exc:
+                delay = policy._next_delay(exc, attempt, delay)
+                if delay is None:
+                    raise
+
+                remaining = _remaining()
+                if remaining is not None and delay >= remaining:
+                    _log.debug("Not retrying %s, the deadline passes in %.2f seconds", endpoint.path, remaining)
+                    raise
+
+                attempt += 1
+                _log.debug("Retrying %s in %.2f seconds (attempt %s) after: %r", endpoint.path, delay, attempt, exc)
+
+            await asyncio.sleep(delay)
+
+    async def _attempt(self, endpoint: Endpoint, full_url: str, /) -> Any:
+        policy = self._hedge_policy
+        delay = policy._delay_for(endpoint, self._latency) if policy is not None else None
+        if delay is None:
+            return await self._request(endpoint, full_url)
+
+        assert policy is not None
+        first = asyncio.ensure_future(self._request(endpoint, full_url))
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not policy._budget.withdraw():
+                return await first
+
+            _log.debug("Hedging the request to %s after %.3f seconds", full_url, delay)
+            policy.hedged += 1
+            hedge = asyncio.ensure_future(self._request(endpoint, full_url))
+            tasks.add(hedge)
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        if task is hedge:
+                            policy.won += 1
+                        return task.result()
+
+            # both failed, raise the error of the original request unless it was cancelled.
+            return (hedge if first.cancelled() else first).result()
+        finally:
+            # the slower request is no longer needed, or the caller was cancelled.
+            for task in tasks:
+                task.cancel()
+
+    async def _request(self, endpoint: Endpoint, full_url: str, /) -> Any:
+        if self._hooks:
+            for hook in self._hooks:
+                result = await hook.before_request(endpoint, full_url)
+                if result is not None:
+                    return result
+
+        circuit = self._circuit_breaker._get(endpoint) if self._circuit_breaker is not None else None
+        try:
+            if circuit is not None:
+                return await self._guarded_request(circuit, endpoint, full_url)
+
+            await self._scheduler.acquire(endpoint, self._ratelimiter)
+            try:
+                return await self._limited_request(endpoint, full_url)
+            finally:
+                self._scheduler.release(endpoint)
+        except Exception as exc:
+            if self._metrics is not None:
+                self._metrics._record_error(endpoint, exc)
+            for hook in self._hooks:
+                await hook.on_error(endpoint, exc)
+            raise
+
+    async def _guarded_request(self, circuit: _Circuit, endpoint: Endpoint, full_url: str, /) -> Any:
+        # _request through the circuit breaker, which is checked before waiting in the scheduler to fail fast.
+        breaker = self._circuit_breaker
+        assert breaker is not None
+
+        state = circuit.state
+        try:
+            probe = circuit.allow(endpoint)
+        finally:
+            await self._circuit_changed(circuit, state)
+
+        try:
+            await self._scheduler.acquire(endpoint, self._ratelimiter)
+        except BaseException:
+            if probe:
+                circuit.cancel_probe()
+            raise
+
+        try:
+            state = circuit.state
+            start = time.perf_counter()
+            try:
+                result = await self._limited_request(endpoint, full_url)
+            except Exception as exc:
+                circuit.record(failed=breaker._is_failure(exc, 0.0), probe=probe)
+                await self._circuit_changed(circuit, state)
+                raise
+            except BaseException:
+                if probe:
+                    circuit.cancel_probe()
+                raise
+
+            circuit.record(failed=breaker._is_failure(None, time.perf_counter() - start), probe=probe)
+            await self._circuit_changed(circuit, state)
+            return result
+        finally:
+            self._scheduler.release(endpoint)
+
+    async def _limited_request(self, endpoint: Endpoint, full_url: str, /) -> Any:
+        # _make_request, with its outcome adjusting the adaptive concurrency limit of the endpoint group.
+        concurrency = self._adaptive_concurrency
+        if concurrency is None:
+            return await self._make_request(endpoint, full_url)
+
+        start = time.perf_counter()
+        try:
+            result = await self._make_request(endpoint, full_url)
+        except Exception as exc:
+            concurrency._record(endpoint, start, exc, self._latency)
+            raise
+
+        concurrency._record(endpoint, start, None, self._latency)
+        return result
+
+    async def _circuit_changed(self, circuit: _Circuit, old: CircuitState, /) -> None:
+        if circuit.state is old:
+            return
+
+        for hook in self._hooks:
+            await hook.on_circuit_change(circuit.name, old, circuit.state)
+
+    def _timeout_for(self, endpoint: Endpoint, /) -> aiohttp.ClientTimeout | None:
+        if self._adaptive_timeouts is not None:
+            return self._adaptive_timeouts._timeout_for(endpoint, self._latency)
+        if self.__user_provided_session:
+            # the timeout of a session that was passed is kept, unless adaptive timeouts were asked for.
+            return None
+        return endpoint.timeout
+
+    async def _make_request(self, endpoint: Endpoint, full_url: str, /) -> Any:
+        session: aiohttp.ClientSession = await self._session_for(endpoint.connections or endpoint.group)
+
+        timing = _start_timing(full_url, endpoint.path, self._slow_request_threshold)
+        start = time.perf_counter()
+        kwargs: dict[str, Any] = {"trace_request_ctx": timing}
+        if (timeout := self._timeout_for(endpoint)) is not None:
+            kwargs["timeout"] = timeout
+        key = self._keys.acquire() if self._keys is not None else None
+        kwargs["headers"] = key.headers if key is not None else self._headers
+
+        try:
+            async with session.get(full_url, **kwargs) as response:
+                if timing is not None:
+                    timing._headers_received = time.perf_counter()
+
+                if key is not None and self._keys is not None:
+                    # the quota is per key, the buckets of the rate limiter are scaled to all keys instead.
+                    self._keys.update(key, response.status, response.headers)
+                elif self._ratelimiter:
+                    self._ratelimiter.update(endpoint, response.headers)
+
+                is_image = response.content_type.startswith("image/")
+                body: bytes | None = None
+                if not is_image or (response.status == 200 and self._keep_image_data):
+                    body = await response.read()
+
+                if timing is not None:
+                    _finish_timing(timing, response.status, self._slow_request_threshold)
+
+                elapsed = time.perf_counter() - start
+                self._latency.record(endpoint, elapsed)
+                if self._metrics is not None or self._hooks:
+                    size = len(body) if body is not None else response.content_length or 0
+                    if self._metrics is not None:
+                        self._metrics._record_response(endpoint, response.status, elapsed, size)
+                    for hook in self._hooks:
+                        await hook.after_response(endpoint, response.status, elapsed, size)
+
+                if not is_image:
+                    assert body is not None
+                    data = _json_or_text(response.content_type, body, self._json_loads)
+                else:
+                    data = response
+
+                if isinstance(data, dict) and data.get("error"):
+                    # sometimes the api returns a 200 with an error
+                    _log.debug("Request failed with error: %s and data: %s", data["error"], data)
+                    # we should show the correct status code
+                    data["code"] = response.status
+                    raise BadRequest(endpoint, data)
+
+                if response.status == 200:
+                    if is_image:
+                        # the API renders the image for this request already, keep the body
+                        # so Image.read() doesn't have to make it render the same image again.
+                        return Image.construct(full_url, self, data=body)
+
+                    if (
+                        self._cache is not None
+                        and response.content_type == "application/json"
+                        and (ttl := self._cache.ttl_for(endpoint)) is not None
+                    ):
+                        assert body is not None
+                        self._cache._set_body(full_url, body, ttl)
+
+                    return data
+
+                if response.status == 400:
+                    _log.debug("Request failed with status code 400: %s", data)
+                    raise BadRequest(endpoint, data)
+                elif response.status == 403:  # noqa: RET506
+                    _log.debug("Request failed with status code 403: %s", data)
+                    raise Forbidden(endpoint, data)
+                elif response.status == 404:
+                    _log.debug("Request failed with status code 404: %s", data)
+                    raise NotFound(endpoint, data)
+                elif response.status == 429:
+                    _log.debug("Request failed with status code 429: %s", data)
+                    retry_after = parse_reset_after(response.headers.get("Retry-After"))
+                    if self._ratelimiter and retry_after and key is None:
+                        self._ratelimiter.block(endpoint, retry_after)
+                    raise RateLimited(endpoint, data, retry_after=retry_after)
+                elif response.status == 500:
+                    _log.debug("Request failed with status code 500: %s", data)
+                    raise InternalServerError(endpoint, data)
+                else:
+                    _log.debug("Request failed with status code %s: %s", response.status, data)
+                    raise HTTPException(endpoint, response, data)
+        except TimeoutError:
+            # counted, so adaptive timeouts grow when an endpoint gets slower instead of timing out every request.
+            self._latency.record(endpoint, time.perf_counter() - start)
+            raise
+        finally:
+            if timing is not None and timing._end is None:
+                # no response was read, e.g. the request timed out or the connection failed.
+                _finish_timing(timing, None, self._slow_request_threshold)
+            if key is not None and self._keys is not None:
+                self._keys.release(key)
+
+    async def _get_image_url(self, url: str, /, *, validate: bool = False) -> bytes:
+        session = await self._session_for("images")
         _log.debug("Requesting bytes from %s", url)
-        async with self._session.get(url) as response:
-            if response.status == 200:
-                return await response.read()
-
-            raise ImageError(url, response.status)
+        # only send the token to the API itself.
+        to_api = url.startswith(self.BASE_URL)
+        key = self._keys.acquire() if self._keys is not None and to_api else None
+        try:
+            if key is not None:
+                headers = key.headers
+            elif to_api:
+                headers = self._headers
+            else:
+                headers = self._anonymous_headers
+            async with session.get(url, headers=headers) as response:
+                # the API sometimes responds with a 200 and a JSON error instead of an image
+                if response.status == 200 and (not validate or response.content_type.startswith("image/")):
+                    return await response.read()
+
+                raise ImageError(url, response.status)
+        finally:
+            if key is not None and self._keys is not None:
+                self._keys.release(key)
+
+    async def warmup(
+        self,
+        connections: int = 1,
+        *,
+        groups: Iterable[str] | None = None,
+        keep_warm: float | None = None,
+    ) -> int:
+        if connections < 1:
+            raise ValueError("connections must be 1 or more.")
+        if keep_warm is not None and keep_warm <= 0:
+            raise ValueError("keep_warm must be more than 0.")
+
+        if groups is None:
+            groups = self._pool.limits if self._pool is not None else ()
+        elif self._pool is not None and (unknown := set(groups) - self._pool.limits.keys()):
+            msg = f"Groups without connections of their own: {', '.join(sorted(unknown))}."
+            raise ValueError(msg)
+        names = tuple(groups)
+
+        warmed = await self._warmup(connections, names)
+        if self._keep_warm_task is not None:
+            self._keep_warm_task.cancel()
+            self._keep_warm_task = None
+
+        if keep_warm is not None:
+            self._keep_warm_task = asyncio.create_task(self._keep_warm(connections, names, keep_warm))
+
+        return warmed
+
+    async def _warmup(self, connections: int, groups: tuple[str, ...]) -> int:
+        sessions = [await self.initiate_session()]
+        for group in groups:
+            # without a pool every group uses the same session, which is only warmed once.
+            session = await self._session_for(group)
+            if session not in sessions:
+                sessions.append(session)
+
+        async def connect(session: aiohttp.ClientSession) -> bool:
+            # any response will do, it's the connection that is kept.
+            try:
+                async with session.head(self.BASE_URL, headers=self._headers, allow_redirects=False) as response:
+                    await response.read()
+            except (aiohttp.ClientError, TimeoutError) as error:
+                _log.warning("Failed to warm up a connection: %r", error)
+                return False
+            return True
+
+        # made at once so that each request opens, or refreshes, a connection of its own.
+        results = await asyncio.gather(*(connect(session) for session in sessions for _ in range(connections)))
+        warmed = sum(results)
+        _log.debug("Warmed up %s of %s connections.", warmed, len(results))
+        return warmed
+
+    async def _keep_warm(self, connections: int, groups: tuple[str, ...], interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self._warmup(connections, groups)
 
     async def close(self) -> None:
         _log.debug("Closing the session and chatbot.")
-        if not self.__user_provided_session and self._session and not self._session.closed:
-            await self._session.close()
-            self._session = None
-            _log.debug("Session closed.")
+        if self._keep_warm_task is not None:
+            self._keep_warm_task.cancel()
+            self._keep_warm_task = None
+
+        if self._pool is not None:
+            session, self._session = self._session, None
+            if session and session is not self._pool._session and not session.closed:
+                await session.close()
+                _log.debug("Session closed.")
+
+            # the session of the pool is only closed if no other client is using it.
+            await self._pool._release(self)
+            _log.debug("Released the connection pool.")
+
+        disk = self._cache.disk if isinstance(self._cache, ResponseCache) else self._cache
+        if disk is not None:
+            disk.close()
+            _log.debug("Disk cache closed.")
 
         if self.__chatbot:
             await self.__chatbot.close()
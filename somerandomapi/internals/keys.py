@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import logging
+import time
+
+from .ratelimit import _header, _parse_float, parse_reset_after
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping, Sequence
+
+
+__all__ = ()
+
+_log: logging.Logger = logging.getLogger("somerandomapi.keys")
+
+# how long a key is left out of the rotation after a 403, or a 429 without a reset.
+_FORBIDDEN_COOLDOWN: float = 300.0
+_RATELIMITED_COOLDOWN: float = 60.0
+
+
+class _Key:
+    __slots__ = ("disabled_until", "headers", "in_flight", "index", "remaining", "requests", "reset_at", "token")
+
+    def __init__(self, index: int, token: str, headers: Mapping[str, str]) -> None:
+        self.index: int = index
+        self.token: str = token
+        # the headers of the requests made with this key, built once.
+        self.headers: Mapping[str, str] = headers
+        # the quota reported by the API, None if unknown
+        self.remaining: float | None = None
+        self.reset_at: float = 0.0
+        self.disabled_until: float = 0.0
+        self.in_flight: int = 0
+        self.requests: int = 0
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} index={self.index} remaining={self.remaining} in_flight={self.in_flight}>"
+
+    def available(self, now: float) -> bool:
+        return self.disabled_until <= now
+
+    def score(self, now: float) -> float:
+        if self.remaining is not None and self.reset_at and now >= self.reset_at:
+            # the window of the API has been reset
+            self.remaining = None
+
+        remaining = float("inf") if self.remaining is None else self.remaining
+        return remaining - self.in_flight
+
+
+class KeyPool:
+    """Spreads requests over several tokens by their remaining quota.
+
+    Each key keeps the quota reported in the response headers of its own requests.
+    Keys that are rejected or run out of quota are left out until their quota resets.
+    """
+
+    __slots__ = ("_keys",)
+
+    def __init__(self, tokens: Sequence[str], build_headers: Callable[[str], Mapping[str, str]]) -> None:
+        if not tokens:
+            raise ValueError("tokens must not be empty.")
+
+        self._keys: list[_Key] = [_Key(index, str(token), build_headers(str(token))) for index, token in enumerate(tokens)]
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} keys={len(self._keys)}>"
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def acquire(self) -> _Key:
+        """Picks the key with the most quota left and marks a request as in flight on it.
+
+        :meth:`release` must be called once the request is done.
+        """
+        now = time.monotonic()
+        available = [key for key in self._keys if key.available(now)]
+        if available:
+            # most quota left first, then the least used so keys with an unknown quota take turns.
+            key = max(available, key=lambda key: (key.score(now), -key.requests))
+        else:
+            key = min(self._keys, key=lambda key: key.disabled_until)
+            _log.debug("All keys are out of rotation, using key %s which returns first", key.index)
+
+        key.in_flight += 1
+        key.requests += 1
+        return key
+
+    def release(self, key: _Key, /) -> None:
+        key.in_flight -= 1
+
+    def update(self, key: _Key, status: int, headers: Mapping[str, str], /) -> None:
+        """Updates the quota of the key from the response to a request made with it."""
+        now = time.monotonic()
+        reset_after = parse_reset_after(_header(headers, "Reset"))
+        remaining = _parse_float(_header(headers, "Remaining"))
+        if remaining is not None:
+            key.remaining = remaining
+            key.reset_at = now + reset_after if reset_after else 0.0
+
+        if status == 403:
+            self._disable(key, _FORBIDDEN_COOLDOWN, "it was rejected")
+        elif status == 429:
+            retry_after = parse_reset_after(headers.get("Retry-After")) or reset_after
+            self._disable(key, retry_after or _RATELIMITED_COOLDOWN, "it is rate limited")
+        elif remaining is not None and remaining < 1:
+            self._disable(key, reset_after or _RATELIMITED_COOLDOWN, "it ran out of quota")
+
+    def _disable(self, key: _Key, seconds: float, reason: str) -> None:
+        _log.warning("Leaving key %s out of the rotation for %.1f seconds, %s.", key.index, seconds, reason)
+        key.disabled_until = time.monotonic() + seconds
+
+    def _stats(self) -> dict[str, dict[str, float]]:
+        now = time.monotonic()
+        stats: dict[str, dict[str, float]] = {}
+        for key in self._keys:
+            values = stats[f"key{key.index}"] = {
+                "available": int(key.available(now)),
+                "in_flight": key.in_flight,
+                "requests": key.requests,
+            }
+            if key.remaining is not None:
+                values["remaining"] = key.remaining
+        return stats
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from collections import deque
+
+if TYPE_CHECKING:
+    from .endpoints import Endpoint
+
+
+__all__ = ()
+
+
+class LatencyTracker:
+    """Keeps the latency of the last ``window`` responses of each endpoint to estimate its percentiles.
+
+    Unlike the histogram of :class:`.MetricsRegistry` this always runs and only looks at recent responses,
+    so the estimates follow the API when it gets slower or faster.
+    """
+
+    __slots__ = ("_samples", "min_samples", "window")
+
+    def __init__(self, *, window: int = 100, min_samples: int = 10) -> None:
+        self.window: int = window
+        self.min_samples: int = min_samples
+        self._samples: dict[str, deque[float]] = {}
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} endpoints={len(self._samples)} window={self.window}>"
+
+    def record(self, endpoint: Endpoint, elapsed: float) -> None:
+        try:
+            samples = self._samples[endpoint.path]
+        except KeyError:
+            samples = self._samples[endpoint.path] = deque(maxlen=self.window)
+
+        samples.append(elapsed)
+
+    def percentile(self, endpoint: Endpoint, percentile: float) -> float | None:
+        """Returns the latency ``percentile`` (0 to 1) of the endpoint was below in seconds,
+        ``None`` if there are not enough samples to tell.
+        """
+        samples = self._samples.get(endpoint.path)
+        if not samples or len(samples) < self.min_samples:
+            return None
+
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(percentile * len(ordered)))]
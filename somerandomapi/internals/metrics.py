@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+from bisect import bisect_left
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Iterator, Sequence
+
+    from .endpoints import Endpoint
+
+
+__all__ = ("MetricsRegistry",)
+
+# upper bounds in seconds, the API renders images in a few hundred milliseconds up to seconds.
+DEFAULT_BUCKETS: tuple[float, ...] = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# values that are exported to Prometheus under another name, to include their unit.
+_EXPORTED_NAMES: dict[str, str] = {"total_wait": "wait_seconds"}
+
+
+def _flatten(labelled: dict[str, dict[str, float]]) -> dict[str, float]:
+    # the values per label value as one dictionary, prefixed by the label value, e.g. "premium_opened".
+    return {
+        f"{label}_{name}" if label else name: value for label, values in labelled.items() for name, value in values.items()
+    }
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Histogram:
+    __slots__ = ("bounds", "count", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds: tuple[float, ...] = bounds
+        # one count per bound plus one for everything above the last bound
+        self.counts: list[int] = [0] * (len(bounds) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        total = 0
+        result: list[tuple[float, int]] = []
+        for bound, count in zip((*self.bounds, float("inf")), self.counts, strict=True):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class _EndpointMetrics:
+    __slots__ = ("bytes_received", "errors", "latency", "statuses")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.latency: _Histogram = _Histogram(bounds)
+        self.statuses: dict[int, int] = {}
+        self.errors: dict[str, int] = {}
+        self.bytes_received: int = 0
+
+
+class MetricsRegistry:
+    """Collects metrics about the requests a :class:`Client` makes.
+
+    Per endpoint path it keeps a latency histogram, the amount of responses per status code,
+    the amount of errors per exception class and the amount of bytes received.
+    The state of the response cache and the connection pool is read when the metrics are.
+
+    Recording only updates plain counters, so it is cheap enough to keep enabled in production.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ----------
+    buckets: Sequence[:class:`float`]
+        The upper bounds of the latency histogram buckets, in seconds.
+        Defaults to 25ms up to 10 seconds.
+    """
+
+    __slots__ = ("_buckets", "_collectors", "_endpoints")
+
+    def __init__(self, *, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        if not buckets:
+            raise ValueError("buckets must not be empty.")
+
+        self._buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self._endpoints: dict[str, _EndpointMetrics] = {}
+        # name -> function returning the values that are read when the metrics are, the name of the label
+        # its values are per, if any, and the names of the values that only ever go up.
+        self._collectors: dict[str, tuple[Callable[[], dict[str, Any]], str | None, Collection[str]]] = {}
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} endpoints={len(self._endpoints)}>"
+
+    def _get(self, endpoint: Endpoint) -> _EndpointMetrics:
+        try:
+            return self._endpoints[endpoint.path]
+        except KeyError:
+            metrics = self._endpoints[endpoint.path] = _EndpointMetrics(self._buckets)
+            return metrics
+
+    def _record_response(self, endpoint: Endpoint, status: int, elapsed: float, size: int) -> None:
+        metrics = self._get(endpoint)
+        metrics.latency.observe(elapsed)
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+        metrics.bytes_received += size
+
+    def _record_error(self, endpoint: Endpoint, error: BaseException) -> None:
+        metrics = self._get(endpoint)
+        name = error.__class__.__name__
+        metrics.errors[name] = metrics.errors.get(name, 0) + 1
+
+    def _add_collector(
+        self,
+        name: str,
+        collector: Callable[[], dict[str, Any]],
+        /,
+        *,
+        label: str | None = None,
+        counters: Collection[str] = (),
+    ) -> None:
+        # with a label, the collector returns its values per label value, e.g. per lane.
+        # Values under the label value "" are exported without the label.
+        self._collectors[name] = (collector, label, counters)
+
+    def _read(self) -> Iterator[tuple[str, str | None, Collection[str], dict[str, dict[str, float]]]]:
+        for name, (collector, label, counters) in self._collectors.items():
+            values = collector()
+            if values:
+                yield name, label, counters, values if label is not None else {"": values}
+
+    def _collect(self) -> dict[str, dict[str, float]]:
+        return {name: _flatten(labelled) for name, _, _, labelled in self._read()}
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the metrics as a dictionary.
+
+        Returns
+        -------
+        Dict[:class:`str`, Any]
+            ``endpoints`` maps each endpoint path to its ``latency`` histogram (with cumulative ``buckets``,
+            ``sum`` and ``count``), ``statuses``, ``errors`` and ``bytes_received``.
+            ``cache`` and ``pool`` hold the state of the response cache and the connection pool, if any.
+        """
+        endpoints: dict[str, Any] = {}
+        for path, metrics in self._endpoints.items():
+            endpoints[path] = {
+                "latency": {
+                    "buckets": dict(metrics.latency.cumulative()),
+                    "sum": metrics.latency.sum,
+                    "count": metrics.latency.count,
+                },
+                "statuses": metrics.statuses.copy(),
+                "errors": metrics.errors.copy(),
+                "bytes_received": metrics.bytes_received,
+            }
+
+        return {"endpoints": endpoints, **self._collect()}
+
+    def to_prometheus(self, *, prefix: str = "somerandomapi") -> str:
+        """Renders the metrics in the Prometheus text exposition format.
+
+        Totals that only go up, such as cache hits or opened connections, are counters with a ``_total``
+        suffix. The current state, such as the amount of idle connections, is a gauge. Values that are kept per
+        priority lane, endpoint group or key have a ``lane``, ``group`` or ``key`` label, e.g.
+        ``somerandomapi_pool_idle{group="premium"}``. The shared connections of the pool have no ``group`` label.
+
+        Parameters
+        ----------
+        prefix: :class:`str`
+            The prefix of the metric names. Defaults to ``somerandomapi``.
+
+        Returns
+        -------
+        :class:`str`
+            The metrics, ready to be served on a ``/metrics`` endpoint.
+        """
+        lines: list[str] = []
+
+        def header(name: str, kind: str, description: str) -> str:
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            return f"{prefix}_{name}"
+
+        endpoints = sorted(self._endpoints.items())
+
+        name = header("request_duration_seconds", "histogram", "Time until the response of a request was received.")
+        for path, metrics in endpoints:
+            label = f'endpoint="{_escape(path)}"'
+            lines.extend(
+                f'{name}_bucket{{{label},le="{_format_value(bound)}"}} {count}'
+                for bound, count in metrics.latency.cumulative()
+            )
+            lines.extend(
+                (
+                    f"{name}_sum{{{label}}} {_format_value(metrics.latency.sum)}",
+                    f"{name}_count{{{label}}} {metrics.latency.count}",
+                )
+            )
+
+        name = header("responses_total", "counter", "Responses received per status code.")
+        for path, metrics in endpoints:
+            for status, count in sorted(metrics.statuses.items()):
+                lines.append(f'{name}{{endpoint="{_escape(path)}",status="{status}"}} {count}')
+
+        name = header("errors_total", "counter", "Failed requests per exception class.")
+        for path, metrics in endpoints:
+            for error, count in sorted(metrics.errors.items()):
+                lines.append(f'{name}{{endpoint="{_escape(path)}",error="{_escape(error)}"}} {count}')
+
+        name = header("received_bytes_total", "counter", "Bytes received in response bodies.")
+        for path, metrics in endpoints:
+            lines.append(f'{name}{{endpoint="{_escape(path)}"}} {metrics.bytes_received}')
+
+        # each value is one metric with a sample per label value, e.g. somerandomapi_lanes_queued{lane="normal"}.
+        families: dict[str, tuple[str, str, list[tuple[str, float]]]] = {}
+        for group, label, counters, labelled in self._read():
+            per = f", per {label}" if label is not None else ""
+            for label_value, values in labelled.items():
+                labels = f'{{{label}="{_escape(label_value)}"}}' if label is not None and label_value else ""
+                for key, value in values.items():
+                    if key in counters:
+                        exported = _EXPORTED_NAMES.get(key, key)
+                        family = f"{group}_{exported}_total"
+                        description = f"The total {exported.replace('_', ' ')} of the {group}{per}."
+                        kind = "counter"
+                    else:
+                        family = f"{group}_{key}"
+                        description = f"The current {key.replace('_', ' ')} of the {group}{per}."
+                        kind = "gauge"
+                    families.setdefault(family, (kind, description, []))[2].append((labels, value))
+
+        for family, (kind, description, samples) in families.items():
+            name = header(family, kind, description)
+            lines.extend(f"{name}{labels} {_format_value(value)}" for labels, value in samples)
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+import logging
+
+import aiohttp
+
+from .tracing import _create_trace_config
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from ssl import SSLContext
+    from types import SimpleNamespace
+
+    from aiohttp.abc import AbstractResolver
+
+    from .endpoints import BaseEndpoint
+
+
+__all__ = ("ConnectionPool",)
+
+_log: logging.Logger = logging.getLogger("somerandomapi.pool")
+
+# the endpoint groups that have connections of their own by default, so slow renders can't take every
+# connection from the fast JSON endpoints. "images" is for downloading the images of the models.
+_DEFAULT_LIMITS: dict[str, int] = {"BaseCanvas": 20, "Premium": 10, "images": 20}
+
+
+def _connector_stats(connector: aiohttp.BaseConnector) -> dict[str, float]:
+    # aiohttp has no public API for these, they are read defensively.
+    idle = getattr(connector, "_conns", {})
+    waiters = getattr(connector, "_waiters", {})
+    return {
+        "in_use": len(getattr(connector, "_acquired", ())),
+        "idle": sum(len(connections) for connections in idle.values()),
+        "waiters": sum(len(futures) for futures in waiters.values()),
+        "limit": connector.limit,
+    }
+
+
+class ConnectionPool:
+    """The connections that requests are made over and the settings of the connector that opens them.
+
+    A pool can be passed to several :class:`.Client` and :class:`.Chatbot` instances to have them share
+    their connections instead of each opening their own. The session is created when the first request
+    is made and closed once every client that used it is closed, it is created again when needed.
+
+    Slow endpoints get connections of their own, so a burst of canvas or premium renders can't hold every
+    connection while requests to fast endpoints, such as facts and jokes, wait behind them. By default these are
+    the canvas endpoints (``BaseCanvas``), which the welcome images also use, the premium endpoints (``Premium``)
+    and the downloads of images (``images``), every other endpoint uses the connections limited by ``limit``.
+
+    See :meth:`.Client.warmup` to open connections before the first request.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ----------
+    limit: :class:`int`
+        The maximum amount of connections that are open at once for the endpoints without connections of their own,
+        ``0`` for no limit. Defaults to ``100``.
+    limits: Optional[Mapping[:class:`str`, :class:`int`]]
+        The endpoint groups to give connections of their own, mapped to their maximum amount of connections.
+        These are added to, or replace, the defaults of ``{"BaseCanvas": 20, "Premium": 10, "images": 20}``.
+        The names are those of :meth:`.CircuitBreaker.states`, a group also covers the groups that are part of it,
+        e.g. ``BaseCanvas`` covers ``CanvasFilter``.
+    limit_per_host: :class:`int`
+        The maximum amount of connections to a single host per group, ``0`` for no limit. Defaults to ``0``.
+    keepalive_timeout: :class:`float`
+        The amount of seconds an idle connection is kept open to be reused. Defaults to ``15``.
+    ttl_dns_cache: Optional[:class:`int`]
+        The amount of seconds a DNS lookup is cached for, ``None`` to cache it forever. Defaults to ``300``,
+        the API is served from a single host.
+    resolver: Optional[:class:`aiohttp.abc.AbstractResolver`]
+        The resolver to look up hosts with, e.g. :class:`aiohttp.AsyncResolver`, which requires ``aiodns``.
+        Defaults to ``None``, which means that the default resolver of aiohttp is used.
+    ssl_context: Optional[:class:`ssl.SSLContext`]
+        The SSL context to verify and encrypt every connection with.
+        Defaults to ``None``, which means that the default context of aiohttp is used.
+    """
+
+    __slots__ = (
+        "_opened",
+        "_reused",
+        "_session",
+        "_sessions",
+        "_users",
+        "keepalive_timeout",
+        "limit",
+        "limit_per_host",
+        "limits",
+        "resolver",
+        "ssl_context",
+        "ttl_dns_cache",
+    )
+
+    def __init__(
+        self,
+        *,
+        limit: int = 100,
+        limits: Mapping[str, int] | None = None,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        ttl_dns_cache: int | None = 300,
+        resolver: AbstractResolver | None = None,
+        ssl_context: SSLContext | None = None,
+    ) -> None:
+        limits = {**_DEFAULT_LIMITS, **(limits or {})}
+        if limit < 0 or any(value < 0 for value in limits.values()):
+            raise ValueError("limit and limits must be 0 or more.")
+        if limit_per_host < 0:
+            raise ValueError("limit_per_host must be 0 or more.")
+        if keepalive_timeout < 0:
+            raise ValueError("keepalive_timeout must be 0 or more.")
+        if ttl_dns_cache is not None and ttl_dns_cache < 0:
+            raise ValueError("ttl_dns_cache must be 0 or more.")
+
+        self.limit: int = limit
+        self.limits: dict[str, int] = limits
+        self.limit_per_host: int = limit_per_host
+        self.keepalive_timeout: float = keepalive_timeout
+        self.ttl_dns_cache: int | None = ttl_dns_cache
+        self.resolver: AbstractResolver | None = resolver
+        self.ssl_context: SSLContext | None = ssl_context
+        self._session: aiohttp.ClientSession | None = None
+        # the sessions of the groups with connections of their own, by name.
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        # the clients that are using the session, it's closed when the last one is closed.
+        self._users: set[object] = set()
+        # connections that were opened and requests that reused an idle connection, to tell if warming up works.
+        # by the name of the group, "" for the shared connections.
+        self._opened: dict[str, int] = {}
+        self._reused: dict[str, int] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} limit={self.limit} limit_per_host={self.limit_per_host} "
+            f"keepalive_timeout={self.keepalive_timeout} users={len(self._users)}>"
+        )
+
+    @property
+    def closed(self) -> bool:
+        """:class:`bool`: Whether the pool has no open session."""
+        return self._session is None or self._session.closed
+
+    def _create_session(self, limit: int, name: str = "") -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            resolver=self.resolver,
+            ssl=self.ssl_context if self.ssl_context is not None else True,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            trace_configs=[_create_trace_config(), self._create_trace_config(name)],
+        )
+
+    def _create_trace_config(self, name: str) -> aiohttp.TraceConfig:
+        def count(counts: dict[str, int]) -> Any:
+            # aiohttp awaits trace callbacks, they have to be coroutine functions.
+            async def callback(_: aiohttp.ClientSession, __: SimpleNamespace, ___: object) -> None:  # noqa: RUF029
+                counts[name] = counts.get(name, 0) + 1
+
+            return callback
+
+        config = aiohttp.TraceConfig()
+        config.on_connection_create_end.append(count(self._opened))
+        config.on_connection_reuseconn.append(count(self._reused))
+        return config
+
+    def _acquire(self, user: object, /) -> aiohttp.ClientSession:
+        self._users.add(user)
+        return self._default_session()
+
+    def _default_session(self) -> aiohttp.ClientSession:
+        # must be called from within the event loop, the connector binds to it.
+        if self._session is None or self._session.closed:
+            _log.debug("Creating a new session for %r.", self)
+            self._session = self._create_session(self.limit)
+        return self._session
+
+    def _group_name(self, group: type[BaseEndpoint] | str | None) -> str | None:
+        # the name of the connections that the group uses, None for the shared ones.
+        if isinstance(group, str):
+            return group if group in self.limits else None
+        if group is None:
+            return None
+        return next((klass.__name__ for klass in group.__mro__ if klass.__name__ in self.limits), None)
+
+    def _session_for(self, group: type[BaseEndpoint] | str | None, /) -> aiohttp.ClientSession:
+        # the session to make requests to the endpoints of the group with, after _acquire.
+        name = self._group_name(group)
+        if name is None:
+            return self._default_session()
+
+        session = self._sessions.get(name)
+        if session is None or session.closed:
+            _log.debug("Creating a new session for the %s connections of %r.", name, self)
+            session = self._sessions[name] = self._create_session(self.limits[name], name)
+        return session
+
+    def _stats(self) -> dict[str, dict[str, float]]:
+        # per group, "" for the shared connections.
+        stats: dict[str, dict[str, float]] = {"": {"opened": self._opened.get("", 0), "reused": self._reused.get("", 0)}}
+        for name, session in self._sessions.items():
+            if not session.closed and session.connector is not None:
+                stats[name.lower()] = {
+                    **_connector_stats(session.connector),
+                    "opened": self._opened.get(name, 0),
+                    "reused": self._reused.get(name, 0),
+                }
+        return stats
+
+    async def _release(self, user: object, /) -> None:
+        self._users.discard(user)
+        if not self._users:
+            await self.close()
+
+    async def close(self) -> None:
+        """Closes the sessions and every connection in the pool.
+
+        This is done automatically when the last client using the pool is closed.
+        """
+        sessions = [self._session, *self._sessions.values()]
+        self._session = None
+        self._sessions.clear()
+        for session in sessions:
+            if session is not None and not session.closed:
+                await session.close()
+
+        _log.debug("Sessions of %r closed.", self)
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import asyncio
+import logging
+import time
+
+from ..enums import Priority
+from .scheduler import PrioritySemaphore
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .endpoints import BaseEndpoint, Endpoint
+
+
+__all__ = ()
+
+_log: logging.Logger = logging.getLogger("somerandomapi.ratelimit")
+
+
+def _parse_float(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _header(headers: Mapping[str, str], name: str) -> str | None:
+    # both the legacy X-RateLimit-* and the standardised RateLimit-* headers are sent by some servers
+    return headers.get(f"X-RateLimit-{name}") or headers.get(f"RateLimit-{name}")
+
+
+def parse_reset_after(value: str | None, now: float | None = None) -> float | None:
+    """Parses a reset / Retry-After header into the amount of seconds to wait.
+
+    Both delta seconds and unix timestamps are accepted.
+    """
+    reset = _parse_float(value)
+    if reset is None:
+        return None
+
+    # anything this big is a unix timestamp, not an amount of seconds
+    if reset > 1_000_000_000:
+        reset -= now if now is not None else time.time()
+
+    return max(reset, 0.0)
+
+
+class TokenBucket:
+    """A token bucket that queues callers until a token is available.
+
+    Waiters are served by :class:`.Priority` and in FIFO order within a priority.
+    """
+
+    __slots__ = (
+        "_blocked_until",
+        "_lock",
+        "_tokens",
+        "_updated",
+        "capacity",
+        "per",
+    )
+
+    def __init__(self, rate: int, per: float) -> None:
+        self.capacity: float = float(rate)
+        self.per: float = float(per)
+
+        self._tokens: float = self.capacity
+        self._updated: float = time.monotonic()
+        self._blocked_until: float = 0.0
+        self._lock: PrioritySemaphore = PrioritySemaphore(1)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} capacity={self.capacity} per={self.per} tokens={self.tokens:.2f}>"
+
+    @property
+    def tokens(self) -> float:
+        self._refill(time.monotonic())
+        return self._tokens
+
+    def _refill(self, now: float) -> None:
+        if self._blocked_until:
+            if now < self._blocked_until:
+                return
+
+            # the window of the API has been reset
+            self._blocked_until = 0.0
+            self._tokens = self.capacity
+            self._updated = now
+            return
+
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * (self.capacity / self.per))
+            self._updated = now
+
+    def _delay(self, now: float) -> float:
+        self._refill(now)
+        if self._blocked_until:
+            return self._blocked_until - now
+
+        if self._tokens >= 1:
+            return 0.0
+
+        return (1 - self._tokens) * (self.per / self.capacity)
+
+    async def acquire(self, priority: Priority = Priority.NORMAL) -> float:
+        """Waits for a token and takes it.
+
+        Parameters
+        ----------
+        priority: :class:`.Priority`
+            The priority of the caller, waiters with a higher priority get the next token first.
+
+        Returns
+        -------
+        :class:`float`
+            The amount of seconds that were spent waiting.
+        """
+        start = time.monotonic()
+        # fast path, nobody is waiting and there is a token
+        if not self._lock.locked() and not self._delay(start):
+            self._tokens -= 1
+            return 0.0
+
+        await self._lock.acquire(priority.value)
+        try:
+            # the delay is known upfront, there is nothing to wait on but time
+            while delay := self._delay(time.monotonic()):  # noqa: ASYNC110
+                await asyncio.sleep(delay)
+
+            self._tokens -= 1
+        finally:
+            self._lock.release()
+
+        return time.monotonic() - start
+
+    def update(self, limit: float | None, remaining: float | None, reset_after: float | None) -> None:
+        """Adjusts the bucket to the quota reported by the API."""
+        now = time.monotonic()
+        self._refill(now)
+        if limit and limit != self.capacity:
+            _log.debug("Adjusting bucket capacity from %s to %s", self.capacity, limit)
+            self.capacity = float(limit)
+
+        if remaining is not None:
+            self._tokens = min(self._tokens, remaining)
+            if remaining < 1 and reset_after:
+                self.block(reset_after)
+
+    def block(self, seconds: float) -> None:
+        """Hands out no tokens for the next ``seconds`` seconds, after which the bucket is full again."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+
+class RateLimiter:
+    """Client side rate limiter with a :class:`TokenBucket` per endpoint group.
+
+    The limits come from :meth:`BaseEndpoint.ratelimit` and are adjusted to
+    the quota reported in the response headers. ``scale`` multiplies the limits,
+    for requests that are spread over that many tokens.
+    """
+
+    __slots__ = ("_buckets", "scale")
+
+    def __init__(self, scale: int = 1) -> None:
+        self.scale: int = scale
+        self._buckets: dict[type[BaseEndpoint], TokenBucket | None] = {}
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} buckets={len(self._buckets)}>"
+
+    def get_bucket(self, endpoint: Endpoint) -> TokenBucket | None:
+        group = endpoint.group
+        if group is None:
+            return None
+
+        if group in self._buckets:
+            return self._buckets[group]
+
+        # subclasses without their own ratelimit() share the bucket of the class that defines it
+        owner = next((klass for klass in group.__mro__ if "ratelimit" in vars(klass)), group)
+        if owner in self._buckets:
+            bucket = self._buckets[owner]
+        else:
+            try:
+                rate, per = owner.ratelimit()
+                bucket = TokenBucket(rate * self.scale, per)
+            except NotImplementedError:
+                bucket = None
+            self._buckets[owner] = bucket
+
+        self._buckets[group] = bucket
+        return bucket
+
+    async def acquire(self, endpoint: Endpoint, priority: Priority = Priority.NORMAL) -> float:
+        bucket = self.get_bucket(endpoint)
+        if bucket is None:
+            return 0.0
+
+        waited = await bucket.acquire(priority)
+        if waited:
+            _log.debug("Waited %.3f seconds for a token for %s", waited, endpoint.path)
+        return waited
+
+    def update(self, endpoint: Endpoint, headers: Mapping[str, str]) -> None:
+        bucket = self.get_bucket(endpoint)
+        if bucket is None:
+            return
+
+        limit = _parse_float(_header(headers, "Limit"))
+        remaining = _parse_float(_header(headers, "Remaining"))
+        if limit is None and remaining is None:
+            return
+
+        bucket.update(limit, remaining, parse_reset_after(_header(headers, "Reset")))
+
+    def block(self, endpoint: Endpoint, seconds: float) -> None:
+        bucket = self.get_bucket(endpoint)
+        if bucket is not None:
+            bucket.block(seconds)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import logging
+import random
+import time
+
+import aiohttp
+
+from ..errors import HTTPException, InternalServerError, RateLimited
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+
+__all__ = ("RetryPolicy",)
+
+_log: logging.Logger = logging.getLogger("somerandomapi.retry")
+
+
+class _RetryBudget:
+    """Limits retries to a ratio of the requests made in the last ``ttl`` seconds.
+
+    Counts are kept in one slot per second, so recording is O(1) and allocation free.
+    """
+
+    __slots__ = ("_epochs", "_requests", "_retries", "min_per_second", "ratio", "ttl")
+
+    def __init__(self, ratio: float, min_per_second: float, ttl: int = 10) -> None:
+        self.ratio: float = ratio
+        self.min_per_second: float = min_per_second
+        self.ttl: int = ttl
+
+        self._epochs: list[int] = [0] * ttl
+        self._requests: list[int] = [0] * ttl
+        self._retries: list[int] = [0] * ttl
+
+    def _slot(self, now: float) -> int:
+        epoch = int(now)
+        slot = epoch % self.ttl
+        if self._epochs[slot] != epoch:
+            self._epochs[slot] = epoch
+            self._requests[slot] = 0
+            self._retries[slot] = 0
+        return slot
+
+    def _sum(self, counts: list[int], now: float) -> int:
+        oldest = int(now) - self.ttl
+        return sum(count for epoch, count in zip(self._epochs, counts, strict=True) if epoch > oldest)
+
+    def deposit(self) -> None:
+        self._requests[self._slot(time.monotonic())] += 1
+
+    def withdraw(self) -> bool:
+        now = time.monotonic()
+        allowed = self.min_per_second * self.ttl + self.ratio * self._sum(self._requests, now)
+        if self._sum(self._retries, now) >= allowed:
+            return False
+
+        self._retries[self._slot(now)] += 1
+        return True
+
+
+class RetryPolicy:
+    """Describes how and when failed requests are retried.
+
+    Only requests that may succeed when made again are retried: ``429 Too Many Requests``,
+    ``5xx`` errors and lost or reset connections. The delay between attempts uses decorrelated jitter,
+    or the ``Retry-After`` of a :class:`.RateLimited` error if that is longer.
+
+    Retries are limited by a budget to ``budget`` times the requests made in the last 10 seconds,
+    so they can't pile up on an API that is already struggling.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ----------
+    max_retries: :class:`int`
+        The maximum amount of retries per request. Defaults to ``3``.
+    base_delay: :class:`float`
+        The minimum delay in seconds between attempts. Defaults to ``0.5``.
+    max_delay: :class:`float`
+        The maximum delay in seconds between attempts. A request is not retried if the
+        API asks to wait longer than this. Defaults to ``30``.
+    budget: :class:`float`
+        The ratio of extra traffic that retries may add, e.g. ``0.1`` for 10%. Defaults to ``0.1``.
+    min_retries_per_second: :class:`float`
+        The amount of retries per second that are always allowed, even when only a few requests are made.
+        Defaults to ``1``.
+    statuses: Collection[:class:`int`]
+        The status codes to retry. Defaults to ``429``, ``500``, ``502``, ``503`` and ``504``.
+    """
+
+    __slots__ = ("_budget", "base_delay", "max_delay", "max_retries", "statuses")
+
+    def __init__(
+        self,
+        *,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        budget: float = 0.1,
+        min_retries_per_second: float = 1.0,
+        statuses: Collection[int] = (429, 500, 502, 503, 504),
+    ) -> None:
+        if max_retries < 0:
+            raise ValueError("max_retries must be 0 or more.")
+        if not 0 < base_delay <= max_delay:
+            raise ValueError("base_delay must be more than 0 and not more than max_delay.")
+        if budget < 0:
+            raise ValueError("budget must be 0 or more.")
+
+        self.max_retries: int = max_retries
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.statuses: frozenset[int] = frozenset(statuses)
+        self._budget: _RetryBudget = _RetryBudget(budget, min_retries_per_second)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} max_retries={self.max_retries} base_delay={self.base_delay} "
+            f"max_delay={self.max_delay}>"
+        )
+
+    def is_retryable(self, error: BaseException, /) -> bool:
+        """Whether a request that failed with ``error`` may succeed when made again."""
+        if isinstance(error, RateLimited):
+            return 429 in self.statuses
+        if isinstance(error, InternalServerError):
+            return 500 in self.statuses
+        if isinstance(error, HTTPException):
+            return error.code in self.statuses
+
+        return isinstance(error, aiohttp.ClientConnectionError)
+
+    def _record_request(self) -> None:
+        self._budget.deposit()
+
+    def _next_delay(self, error: BaseException, attempt: int, previous: float | None) -> float | None:
+        # returns the delay before the next attempt or None to give up.
+        if attempt >= self.max_retries or not self.is_retryable(error):
+            return None
+
+        # decorrelated jitter: https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+        delay = min(self.max_delay, random.uniform(self.base_delay, (previous or self.base_delay) * 3))  # noqa: S311
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            if retry_after > self.max_delay:
+                _log.debug("Not retrying, asked to wait %.2f seconds which is more than max_delay.", retry_after)
+                return None
+            delay = max(delay, retry_after)
+
+        if not self._budget.withdraw():
+            _log.debug("Not retrying, the retry budget is exhausted.")
+            return None
+
+        return delay
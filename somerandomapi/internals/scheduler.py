@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+import heapq
+import itertools
+import logging
+import time
+
+from ..enums import Priority
+from ..errors import DeadlineExceeded
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .concurrency import AdaptiveConcurrency
+    from .endpoints import Endpoint
+    from .latency import LatencyTracker
+    from .ratelimit import RateLimiter
+
+
+__all__ = (
+    "request_deadline",
+    "request_priority",
+)
+
+_log: logging.Logger = logging.getLogger("somerandomapi.scheduler")
+
+_current_priority: ContextVar[Priority] = ContextVar("somerandomapi_priority", default=Priority.NORMAL)
+# the time.monotonic() by which requests made in the current context have to be made, see request_deadline().
+_current_deadline: ContextVar[float | None] = ContextVar("somerandomapi_deadline", default=None)
+
+# the latency percentile a request is expected to finish within, when deciding whether it can make its deadline.
+_ADMISSION_PERCENTILE: float = 0.95
+
+
+@contextmanager
+def request_priority(priority: Priority, /) -> Iterator[None]:
+    """Sets the priority of every request that is made inside the ``with`` block.
+
+    This includes requests made by tasks that were created inside the block.
+
+    .. versionadded:: 0.2.0
+
+    Example
+    --------
+    .. code-block:: python
+
+        with somerandomapi.request_priority(somerandomapi.Priority.INTERACTIVE):
+            card = await client.premium.rank_card(...)
+
+    Parameters
+    ----------
+    priority: :class:`.Priority`
+        The priority of the requests.
+    """
+    if not isinstance(priority, Priority):
+        msg = f"Expected 'priority' to be a Priority, got {type(priority).__name__!r} instead."
+        raise TypeError(msg)
+
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+@contextmanager
+def request_deadline(timeout: float, /) -> Iterator[None]:
+    """Gives every request that is made inside the ``with`` block ``timeout`` seconds from now to be made.
+
+    Requests that are still waiting for a rate limit token or a free slot when the deadline passes
+    are dropped before they are made. Requests are also rejected right away if the 95th percentile latency
+    of their endpoint is more than the time that is left. Both raise :class:`.DeadlineExceeded`.
+    Requests that were already sent are not cancelled, unless identical requests share them (see ``coalesce``
+    of :class:`.Client`) and every caller sharing them stopped waiting.
+
+    This includes requests made by tasks that were created inside the block.
+    If blocks are nested, the earliest deadline is used.
+
+    .. versionadded:: 0.2.0
+
+    Example
+    --------
+    .. code-block:: python
+
+        # interaction tokens are valid for 3 seconds
+        with somerandomapi.request_deadline(2.5):
+            try:
+                card = await client.premium.rank_card(...)
+            except somerandomapi.DeadlineExceeded:
+                await interaction.response.defer()
+
+    Parameters
+    ----------
+    timeout: :class:`float`
+        The amount of seconds requests have to be made in.
+    """
+    deadline = time.monotonic() + timeout
+    current = _current_deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+
+    token = _current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+def _remaining() -> float | None:
+    deadline = _current_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class PrioritySemaphore:
+    """A semaphore that wakes waiters with the lowest priority value first and in FIFO order within a priority."""
+
+    __slots__ = ("_counter", "_value", "_waiters")
+
+    def __init__(self, value: int) -> None:
+        self._value: int = value
+        self._counter: Iterator[int] = itertools.count()
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} value={self._value} waiters={len(self._waiters)}>"
+
+    def locked(self) -> bool:
+        return self._value <= 0 or bool(self._waiters)
+
+    async def acquire(self, priority: int = Priority.NORMAL.value) -> None:
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # woken up right as we were cancelled, pass it on to the next waiter.
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self._value += 1
+        self._wake()
+
+    def _resize(self, delta: int) -> None:
+        # taking away more than is free leaves the value negative until enough holders release.
+        self._value += delta
+        self._wake()
+
+    def _wake(self) -> None:
+        # cancelled waiters are left in the heap and skipped here.
+        while self._value > 0 and self._waiters:
+            *_, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self._value -= 1
+                future.set_result(None)
+
+
+class _Lane:
+    __slots__ = ("dropped", "max_wait", "queued", "requests", "total_wait")
+
+    def __init__(self) -> None:
+        self.queued: int = 0
+        self.requests: int = 0
+        self.dropped: int = 0
+        self.total_wait: float = 0.0
+        self.max_wait: float = 0.0
+
+
+class Scheduler:
+    """Decides which waiting request goes next, by :class:`.Priority`.
+
+    Requests wait for one of ``max_concurrency`` slots, if set, then for a slot of the adaptive limit of their
+    endpoint group, if set, and then for a rate limit token. All are handed out by priority.
+    Requests with a deadline that they can't make are dropped.
+    """
+
+    __slots__ = ("_concurrency", "_lanes", "_latency", "_slots")
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        latency: LatencyTracker | None = None,
+        concurrency: AdaptiveConcurrency | None = None,
+    ) -> None:
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be 1 or more.")
+
+        self._latency: LatencyTracker | None = latency
+        self._concurrency: AdaptiveConcurrency | None = concurrency
+        self._slots: PrioritySemaphore | None = PrioritySemaphore(max_concurrency) if max_concurrency else None
+        self._lanes: dict[Priority, _Lane] = {priority: _Lane() for priority in Priority}
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} slots={self._slots!r}>"
+
+    async def acquire(self, endpoint: Endpoint, ratelimiter: RateLimiter | None) -> float:
+        """Waits until the request may be made and returns how long that took.
+
+        :meth:`release` must be called once the request is done.
+
+        Raises
+        ------
+        DeadlineExceeded
+            The request can't be made before the deadline of the current context.
+        """
+        priority = _current_priority.get()
+        lane = self._lanes[priority]
+        remaining = _remaining()
+        if remaining is not None:
+            try:
+                self._admit(endpoint, remaining)
+            except DeadlineExceeded:
+                lane.dropped += 1
+                raise
+
+        lane.queued += 1
+        start = time.perf_counter()
+        try:
+            if remaining is None:
+                await self._wait(endpoint, priority, ratelimiter)
+            else:
+                try:
+                    async with asyncio.timeout(remaining):
+                        await self._wait(endpoint, priority, ratelimiter)
+                except TimeoutError:
+                    lane.dropped += 1
+                    _log.debug("Dropping %s request to %s, its deadline passed", priority.name, endpoint.path)
+                    raise DeadlineExceeded(endpoint, remaining=_remaining() or 0.0) from None
+        finally:
+            lane.queued -= 1
+
+        if remaining is not None:
+            # waiting took some of the time, make sure there is still enough left for the request itself.
+            try:
+                self._admit(endpoint, _remaining() or 0.0)
+            except DeadlineExceeded:
+                self.release(endpoint)
+                lane.dropped += 1
+                raise
+
+        waited = time.perf_counter() - start
+        lane.requests += 1
+        lane.total_wait += waited
+        lane.max_wait = max(lane.max_wait, waited)
+        if waited > 1:
+            _log.debug("%s request to %s waited %.2f seconds", priority.name, endpoint.path, waited)
+        return waited
+
+    def _admit(self, endpoint: Endpoint, remaining: float) -> None:
+        if remaining <= 0:
+            raise DeadlineExceeded(endpoint, remaining=remaining)
+
+        expected = self._latency.percentile(endpoint, _ADMISSION_PERCENTILE) if self._latency else None
+        if expected is not None and expected > remaining:
+            _log.debug("Rejecting request to %s, %.3f seconds left and p95 is %.3f", endpoint.path, remaining, expected)
+            raise DeadlineExceeded(endpoint, remaining=remaining, expected=expected)
+
+    async def _wait(self, endpoint: Endpoint, priority: Priority, ratelimiter: RateLimiter | None) -> None:
+        if self._slots is not None:
+            await self._slots.acquire(priority.value)
+        limit = self._concurrency._get(endpoint) if self._concurrency is not None else None
+        if limit is not None:
+            try:
+                await limit.acquire(priority)
+            except BaseException:
+                self.release()
+                raise
+        if ratelimiter is not None:
+            try:
+                await ratelimiter.acquire(endpoint, priority)
+            except BaseException:
+                self.release(endpoint)
+                raise
+
+    def release(self, endpoint: Endpoint | None = None, /) -> None:
+        # the endpoint is required to release the slot of its adaptive limit.
+        if self._slots is not None:
+            self._slots.release()
+        if endpoint is not None and self._concurrency is not None and (limit := self._concurrency._get(endpoint)):
+            limit.release()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        return {
+            priority.name.lower(): {
+                "queued": lane.queued,
+                "requests": lane.requests,
+                "dropped": lane.dropped,
+                "total_wait": lane.total_wait,
+                "average_wait": lane.total_wait / lane.requests if lane.requests else 0.0,
+                "max_wait": lane.max_wait,
+            }
+            for priority, lane in self._lanes.items()
+        }
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from .endpoints import Endpoint
+    from .latency import LatencyTracker
+
+
+__all__ = ("AdaptiveTimeouts",)
+
+
+class AdaptiveTimeouts:
+    """Sets the timeout of each endpoint from the latency of its recent responses.
+
+    The total timeout becomes a latency percentile times ``multiplier``, so a request on a stuck
+    connection is given up on long before the fixed timeout of the endpoint group, while slow but healthy
+    endpoints, such as GIF renders, still get the time they usually need. The timeout is never more than the
+    fixed timeout of the group, nor less than ``minimum``. Until enough responses were received,
+    the fixed timeout is used.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ----------
+    percentile: :class:`float`
+        The latency percentile to base the timeout on, between 0 and 1. Defaults to ``0.99``.
+    multiplier: :class:`float`
+        What to multiply the percentile by. Defaults to ``3``.
+    minimum: :class:`float`
+        The minimum timeout in seconds. Defaults to ``1``.
+    """
+
+    __slots__ = ("minimum", "multiplier", "percentile")
+
+    def __init__(self, *, percentile: float = 0.99, multiplier: float = 3.0, minimum: float = 1.0) -> None:
+        if not 0 < percentile <= 1:
+            raise ValueError("percentile must be more than 0 and not more than 1.")
+        if multiplier < 1:
+            raise ValueError("multiplier must be 1 or more.")
+        if minimum <= 0:
+            raise ValueError("minimum must be more than 0.")
+
+        self.percentile: float = percentile
+        self.multiplier: float = multiplier
+        self.minimum: float = minimum
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} percentile={self.percentile} multiplier={self.multiplier} minimum={self.minimum}>"
+        )
+
+    def _timeout_for(self, endpoint: Endpoint, latency: LatencyTracker) -> aiohttp.ClientTimeout | None:
+        fixed = endpoint.timeout
+        observed = latency.percentile(endpoint, self.percentile)
+        if fixed is None or observed is None:
+            return fixed
+
+        total = max(self.minimum, observed * self.multiplier)
+        if fixed.total is not None:
+            total = min(total, fixed.total)
+
+        return aiohttp.ClientTimeout(
+            total=total,
+            connect=fixed.connect,
+            sock_read=fixed.sock_read,
+            sock_connect=fixed.sock_connect,
+            ceil_threshold=fixed.ceil_threshold,
+        )
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import time
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from types import SimpleNamespace
+
+
+__all__ = (
+    "RequestTiming",
+    "trace_requests",
+)
+
+_log: logging.Logger = logging.getLogger("somerandomapi.tracing")
+
+# the list that the timings of requests made in the current context are appended to, see trace_requests().
+_collected: ContextVar[list[RequestTiming] | None] = ContextVar("somerandomapi_collected_timings", default=None)
+
+
+def _between(start: float | None, end: float | None) -> float | None:
+    if start is None or end is None:
+        return None
+    return end - start
+
+
+class RequestTiming:
+    """How long the phases of a single request to the API took, in seconds.
+
+    A phase is ``None`` if it didn't happen, e.g. ``dns`` and ``connect`` when an idle connection
+    was reused. The connection phases are only known for the session the client creates itself.
+    For a session passed to :class:`Client`, ``ttfb`` includes the time it took to connect.
+
+    .. versionadded:: 0.2.0
+
+    Attributes
+    ----------
+    url: :class:`str`
+        The URL that was requested.
+    path: :class:`str`
+        The path of the endpoint that was requested.
+    status: Optional[:class:`int`]
+        The status code of the response, ``None`` if no response was received.
+    """
+
+    __slots__ = (
+        "_connect_end",
+        "_connect_start",
+        "_dns_end",
+        "_dns_start",
+        "_end",
+        "_headers_received",
+        "_headers_sent",
+        "_queued_end",
+        "_queued_start",
+        "_start",
+        "path",
+        "status",
+        "url",
+    )
+
+    def __init__(self, url: str, path: str) -> None:
+        self.url: str = url
+        self.path: str = path
+        self.status: int | None = None
+
+        self._start: float = time.perf_counter()
+        self._queued_start: float | None = None
+        self._queued_end: float | None = None
+        self._dns_start: float | None = None
+        self._dns_end: float | None = None
+        self._connect_start: float | None = None
+        self._connect_end: float | None = None
+        self._headers_sent: float | None = None
+        self._headers_received: float | None = None
+        self._end: float | None = None
+
+    def __repr__(self) -> str:
+        phases = " ".join(
+            f"{name}={value * 1000:.1f}ms"
+            for name in ("pool_wait", "dns", "connect", "ttfb", "download", "total")
+            if (value := getattr(self, name)) is not None
+        )
+        return f"<{self.__class__.__name__} path={self.path!r} status={self.status} {phases}>"
+
+    @property
+    def pool_wait(self) -> float | None:
+        """Optional[:class:`float`]: How long the request waited for a free connection in the pool."""
+        return _between(self._queued_start, self._queued_end)
+
+    @property
+    def dns(self) -> float | None:
+        """Optional[:class:`float`]: How long it took to resolve the host."""
+        return _between(self._dns_start, self._dns_end)
+
+    @property
+    def connect(self) -> float | None:
+        """Optional[:class:`float`]: How long it took to open the TCP connection and do the TLS handshake."""
+        took = _between(self._connect_start, self._connect_end)
+        if took is None:
+            return None
+        return took - (self.dns or 0.0)
+
+    @property
+    def ttfb(self) -> float | None:
+        """Optional[:class:`float`]: The time to first byte, from sending the request until the response headers
+        were received. This is mostly the time the API takes to render the response.
+        """
+        return _between(self._headers_sent or self._start, self._headers_received)
+
+    @property
+    def download(self) -> float | None:
+        """Optional[:class:`float`]: How long it took to receive the body after the headers."""
+        return _between(self._headers_received, self._end)
+
+    @property
+    def total(self) -> float | None:
+        """Optional[:class:`float`]: How long the whole request took."""
+        return _between(self._start, self._end)
+
+    def _finish(self, status: int | None) -> None:
+        self.status = status
+        self._end = time.perf_counter()
+
+
+@contextmanager
+def trace_requests() -> Iterator[list[RequestTiming]]:
+    """Collects the :class:`RequestTiming` of every request that is made inside the ``with`` block.
+
+    This includes requests made by tasks that were created inside the block.
+
+    .. versionadded:: 0.2.0
+
+    Example
+    --------
+    .. code-block:: python
+
+        with somerandomapi.trace_requests() as timings:
+            card = await client.premium.rank_card(...)
+
+        print(timings[0].ttfb)
+
+    Yields
+    -------
+    List[:class:`RequestTiming`]
+        The list the timings are appended to as requests finish.
+    """
+    timings: list[RequestTiming] = []
+    token = _collected.set(timings)
+    try:
+        yield timings
+    finally:
+        _collected.reset(token)
+
+
+def _timing(ctx: SimpleNamespace) -> RequestTiming | None:
+    timing = ctx.trace_request_ctx
+    return timing if isinstance(timing, RequestTiming) else None
+
+
+def _mark(attribute: str) -> Any:
+    # aiohttp awaits trace callbacks, they have to be coroutine functions.
+    async def callback(_: aiohttp.ClientSession, ctx: SimpleNamespace, __: object) -> None:  # noqa: RUF029
+        if timing := _timing(ctx):
+            setattr(timing, attribute, time.perf_counter())
+
+    return callback
+
+
+def _create_trace_config() -> aiohttp.TraceConfig:
+    # fills in the timing passed as trace_request_ctx to session.get, requests without one are ignored.
+    config = aiohttp.TraceConfig()
+    config.on_connection_queued_start.append(_mark("_queued_start"))
+    config.on_connection_queued_end.append(_mark("_queued_end"))
+    config.on_dns_resolvehost_start.append(_mark("_dns_start"))
+    config.on_dns_resolvehost_end.append(_mark("_dns_end"))
+    config.on_connection_create_start.append(_mark("_connect_start"))
+    config.on_connection_create_end.append(_mark("_connect_end"))
+    config.on_request_headers_sent.append(_mark("_headers_sent"))
+    return config
+
+
+def _start_timing(url: str, path: str, slow_threshold: float | None) -> RequestTiming | None:
+    # only time requests if anyone is going to look at it
+    if slow_threshold is None and _collected.get() is None:
+        return None
+    return RequestTiming(url, path)
+
+
+def _finish_timing(timing: RequestTiming, status: int | None, slow_threshold: float | None) -> None:
+    timing._finish(status)
+    if (collected := _collected.get()) is not None:
+        collected.append(timing)
+
+    total = timing.total
+    if slow_threshold is not None and total is not None and total >= slow_threshold:
+        _log.warning("Slow request to %s took %.3f seconds: %r", timing.url, total, timing)
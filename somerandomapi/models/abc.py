@@ -335,3 +335,4 @@ class BaseImageModel(BaseModel, Image):
         self._image = image  # pyright: ignore[reportAttributeAccessIssue]
         self._url = image._url
         self._http = image._http
+        self._data = getattr(image, "_data", None)
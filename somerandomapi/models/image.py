@@ -23,16 +23,18 @@ __all__ = ("Image",)
 class Image:
     """Represents a class for all image endpoints."""
 
-    __slots__ = ("_http", "_url")
+    __slots__ = ("_data", "_http", "_url")
 
     _url: str
     _http: HTTPClient
+    _data: bytes | None
 
     @classmethod
-    def construct(cls, url: str, http: HTTPClient) -> Image:
+    def construct(cls, url: str, http: HTTPClient, *, data: bytes | None = None) -> Image:
         self = cls.__new__(cls)
         self._url = url
         self._http = http
+        self._data = data
         return self
 
     def __str__(self) -> str:
@@ -55,6 +57,10 @@ class Image:
     async def read(self, bytesio: bool = True) -> bytes | io.BytesIO:  # noqa: FBT001, FBT002
         """Returns the image data.
 
+        .. versionchanged:: 0.2.0
+            The body of the original response is reused if it was kept,
+            no second request is made in that case.
+
         Parameters
         ----------
         bytesio: :class:`bool`
@@ -65,12 +71,39 @@ class Image:
         Union[:class:`bytes`, :class:`io.BytesIO`]
             The image data.
         """
-        data = await self._http._get_image_url(self.url)
+        data = getattr(self, "_data", None)
+        if data is None:
+            data = await self._http._get_image_url(self.url)
+
         if not bytesio:
             return data
 
         return io.BytesIO(data)
 
+    async def validate(self) -> Self:
+        """Makes sure the URL of this image resolves to an image.
+
+        This is mostly useful when the client was created with ``fetch_images=False``,
+        in which case the URL is built locally and the API is not contacted until now.
+        The image data is kept, :meth:`read` and :meth:`file` won't request it again.
+
+        .. versionadded:: 0.2.0
+
+        Raises
+        ------
+        :class:`.ImageError`
+            The URL did not resolve to an image.
+
+        Returns
+        -------
+        :class:`.Image`
+            The same image, for chaining.
+        """
+        if getattr(self, "_data", None) is None:
+            self._data = await self._http._get_image_url(self.url, validate=True)
+
+        return self
+
     async def file(self, cls: FileLike, filename: str = "image.png", **kwargs: Any) -> FileLike:
         """Converts the image to a file-like object.
 
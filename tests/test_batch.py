@@ -0,0 +1,134 @@
+import asyncio
+import functools
+
+import pytest
+
+from somerandomapi import Client
+from somerandomapi.errors import NotFound
+from somerandomapi.internals.endpoints import Pokemon
+from somerandomapi.internals.http import HTTPClient
+
+from test_http_client import FakeResponse, FakeSession
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_batch_keeps_order_and_errors() -> None:
+    async def echo(value, delay):
+        await asyncio.sleep(delay)
+        if value == "bad":
+            raise ValueError(value)
+        return value
+
+    async def main():
+        client = Client()
+        return await client.batch(
+            [(echo, {"value": "a", "delay": 0.02}), (echo, {"value": "bad", "delay": 0}), lambda: echo("c", 0)]
+        )
+
+    first, second, third = _run(main())
+    assert first == "a"
+    assert isinstance(second, ValueError)
+    assert third == "c"
+
+
+def test_batch_bounds_concurrency() -> None:
+    running = 0
+    peak = 0
+
+    async def work():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    _run(Client().batch([work for _ in range(10)], concurrency=3))
+    assert peak == 3
+
+    with pytest.raises(ValueError):
+        _run(Client().batch([work], concurrency=0))
+
+
+def test_batch_goes_through_http_client() -> None:
+    session = FakeSession([FakeResponse(payload={"name": "pikachu"}), FakeResponse(status=404, payload={"message": "x"})])
+    client = Client()
+    client._http = HTTPClient(token=None, session=session)
+    pokedex = functools.partial(client._http.request, Pokemon.POKEDEX)
+    calls = [(pokedex, {"pokemon": name}) for name in ("pikachu", "pikachu", "x")]
+    results = _run(client.batch(calls))
+    # the two identical requests were coalesced into one
+    assert results[:2] == [{"name": "pikachu"}] * 2
+    assert isinstance(results[2], NotFound)
+
+
+def test_stream_is_lazy_and_bounded() -> None:
+    pulled = 0
+    running = 0
+    peak = 0
+
+    async def work(value):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        # later inputs finish first
+        await asyncio.sleep(0.01 * (5 - value))
+        running -= 1
+        if value == 2:
+            raise ValueError(value)
+        return value * 10
+
+    def calls():
+        nonlocal pulled
+        for value in range(5):
+            pulled += 1
+            yield (work, {"value": value})
+
+    async def main():
+        results = []
+        async for item in Client().stream(calls(), max_in_flight=2):
+            # never more than max_in_flight pulled ahead of what was yielded
+            assert pulled - len(results) <= 2
+            results.append(item)
+        return results
+
+    results = _run(main())
+    assert peak == 2
+    assert sorted(item.index for item in results) == list(range(5))
+    by_index = {item.index: item for item in results}
+    assert by_index[4].result == 40
+    assert isinstance(by_index[2].error, ValueError)
+    assert by_index[2].result is None
+    assert [item.index for item in results] != list(range(5))
+
+
+def test_stream_async_iterable_and_early_exit() -> None:
+    cancelled = []
+
+    async def slow(value):
+        try:
+            await asyncio.sleep(0 if value == 0 else 10)
+        except asyncio.CancelledError:
+            cancelled.append(value)
+            raise
+        return value
+
+    async def calls():
+        for value in range(3):
+            yield functools.partial(slow, value)
+
+    async def main():
+        stream = Client().stream(calls(), max_in_flight=3)
+        async for item in stream:
+            assert item.result == 0
+            break
+        await stream.aclose()
+        await asyncio.sleep(0)
+
+    _run(main())
+    assert sorted(cancelled) == [1, 2]
+
+    with pytest.raises(ValueError):
+        Client().stream([], max_in_flight=0)
@@ -0,0 +1,191 @@
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from somerandomapi import utils as _utils
+from somerandomapi.internals.cache import DiskCache, ResponseCache
+from somerandomapi.internals.endpoints import Animal, Base, BaseCanvas, CanvasFilter, Pokemon
+from somerandomapi.internals.http import HTTPClient
+
+from test_http_client import FakeResponse, FakeSession
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_ttl_for_follows_endpoint_definitions() -> None:
+    cache = ResponseCache(default_ttl=10)
+    assert cache.ttl_for(Pokemon.POKEDEX) == Pokemon.cache_ttl
+    assert cache.ttl_for(Base.LYRICS) == Base.LYRICS.cache_ttl
+    assert cache.ttl_for(BaseCanvas.HEX) is not None
+    # random and image endpoints are never cached
+    assert cache.ttl_for(Animal.DOG) is None
+    assert cache.ttl_for(Base.JOKE) is None
+    assert cache.ttl_for(CanvasFilter.BLUE) is None
+
+
+def test_cache_expiry_and_counters() -> None:
+    cache = ResponseCache()
+    assert cache.get("a") is _utils.NOVALUE
+    cache.set("a", {"x": 1}, ttl=60)
+    assert cache.get("a") == {"x": 1}
+    cache.set("b", {"x": 2}, ttl=-1)
+    assert cache.get("b") is _utils.NOVALUE
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 2, 0)
+    assert len(cache) == 1
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = ResponseCache(max_bytes=25)
+    cache.set("a", "a" * 8, ttl=60)
+    cache.set("b", "b" * 8, ttl=60)
+    cache.get("a")
+    cache.set("c", "c" * 8, ttl=60)
+    assert cache.get("b") is _utils.NOVALUE
+    assert cache.get("a") == "a" * 8
+    assert cache.evictions == 1
+    assert cache.size <= 25
+
+    # too big to ever fit
+    cache.set("d", "d" * 100, ttl=60)
+    assert cache.get("d") is _utils.NOVALUE
+
+    with pytest.raises(ValueError):
+        ResponseCache(max_bytes=0)
+
+
+def test_http_client_uses_cache() -> None:
+    session = FakeSession([FakeResponse(payload={"name": "pikachu"}), FakeResponse(payload={"joke": "a"})])
+    cache = ResponseCache()
+    http = HTTPClient(token=None, session=session, cache=cache)
+    first = _run(http.request(Pokemon.POKEDEX, pokemon="pikachu"))
+    # the session has no response for this left, it must come from the cache
+    second = _run(http.request(Pokemon.POKEDEX, pokemon="pikachu"))
+    assert first == second == {"name": "pikachu"}
+    assert cache.hits == 1
+
+    _run(http.request(Base.JOKE))
+    assert len(cache) == 1
+
+
+def test_changing_a_cached_result_does_not_change_the_cache() -> None:
+    session = FakeSession([FakeResponse(payload={"name": "pikachu", "type": ["electric"]})])
+    cache = ResponseCache()
+    http = HTTPClient(token=None, session=session, cache=cache)
+    first = _run(http.request(Pokemon.POKEDEX, pokemon="pikachu"))
+    first["name"] = "raichu"
+    first["type"].append("ghost")
+
+    second = _run(http.request(Pokemon.POKEDEX, pokemon="pikachu"))
+    assert second == {"name": "pikachu", "type": ["electric"]}
+    second["name"] = "raichu"
+    assert cache.get(session.last_url)["name"] == "pikachu"
+    # the size is that of the body as it was received
+    assert cache.size == len(b'{"name": "pikachu", "type": ["electric"]}')
+
+
+def test_disk_cache_survives_reopening(tmp_path) -> None:
+    path = tmp_path / "cache.db"
+    cache = DiskCache(path)
+    cache.set("a", {"name": "pikachu"}, ttl=60)
+    cache.set("b", {"name": "gone"}, ttl=-1)
+    cache.close()
+
+    cache = DiskCache(path)
+    assert cache.get("a") == {"name": "pikachu"}
+    assert cache.get("b") is _utils.NOVALUE
+    assert (cache.hits, cache.misses) == (1, 1)
+    # the expired entry was purged when opening
+    assert len(cache) == 1
+    cache.close()
+
+
+def test_disk_cache_manifest(tmp_path) -> None:
+    source = DiskCache(tmp_path / "source.db")
+    source.set("a", {"x": 1}, ttl=60)
+    source.set("b", [1, 2], ttl=60)
+    assert source.export_manifest(tmp_path / "manifest.json") == 2
+    source.close()
+
+    target = DiskCache(tmp_path / "target.db", manifest=tmp_path / "manifest.json")
+    assert target.get("a") == {"x": 1}
+    assert target.get("b") == [1, 2]
+    target.close()
+
+
+def test_memory_cache_falls_back_to_disk(tmp_path) -> None:
+    disk = DiskCache(tmp_path / "cache.db")
+    disk.set("a", {"x": 1}, ttl=60)
+    cache = ResponseCache(disk=disk)
+    assert cache.get("a") == {"x": 1}
+    assert cache.misses == 1
+    # promoted into memory
+    assert len(cache) == 1
+    assert cache.get("a") == {"x": 1}
+    assert (cache.hits, disk.hits) == (1, 1)
+
+    cache.set("b", {"x": 2}, ttl=60)
+    assert disk.get("b") == {"x": 2}
+    disk.close()
+
+
+def test_disk_cache_skips_writes_while_another_process_writes(tmp_path) -> None:
+    path = tmp_path / "cache.db"
+    cache = DiskCache(path)
+    cache.set("a", {"x": 1}, ttl=-1)
+
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    started = time.perf_counter()
+    cache.set("b", {"x": 2}, ttl=60)
+    assert cache.purge() == 0
+    # readers aren't blocked in WAL mode
+    assert cache.get("a") is _utils.NOVALUE
+    assert time.perf_counter() - started < 1
+    other.execute("ROLLBACK")
+    other.close()
+
+    assert cache.get("b") is _utils.NOVALUE
+    assert cache.purge() == 1
+    cache.close()
+
+
+def test_closing_a_client_closes_the_disk_cache_until_it_is_used_again(tmp_path) -> None:
+    disk = DiskCache(tmp_path / "cache.db")
+    session = FakeSession([FakeResponse(payload={"name": "pikachu"})])
+    first = HTTPClient(token=None, session=session, cache=disk)
+    second = HTTPClient(token=None, session=session, cache=disk)
+    _run(first.request(Pokemon.POKEDEX, pokemon="pikachu"))
+    _run(first.close())
+    assert disk._sqlite is None
+
+    # another client sharing the cache, or the same one, can still use it
+    assert _run(second.request(Pokemon.POKEDEX, pokemon="pikachu")) == {"name": "pikachu"}
+    assert _run(first.request(Pokemon.POKEDEX, pokemon="pikachu")) == {"name": "pikachu"}
+    assert disk.hits == 2
+    disk.close()
+
+
+def test_disk_cache_waits_for_another_process_when_opening(tmp_path) -> None:
+    path = tmp_path / "cache.db"
+    source = DiskCache(path)
+    source.set("a", {"x": 1}, ttl=60)
+    source.export_manifest(tmp_path / "manifest.json")
+    source.close()
+
+    other = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    other.execute("BEGIN IMMEDIATE")
+    release = threading.Timer(0.1, other.execute, ("ROLLBACK",))
+    release.start()
+    try:
+        cache = DiskCache(path, manifest=tmp_path / "manifest.json")
+    finally:
+        release.join()
+        other.close()
+
+    assert len(cache) == 1
+    cache.close()
@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+import pytest
+
+from somerandomapi import CircuitBreaker, CircuitOpen, CircuitState, RequestHook
+from somerandomapi.errors import BadRequest, InternalServerError, NotFound
+from somerandomapi.internals.endpoints import Animal, Base, CanvasFilter
+from somerandomapi.internals.http import HTTPClient
+from somerandomapi.internals.metrics import MetricsRegistry
+
+from test_http_client import FakeResponse, FakeSession
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _error(status=500):
+    return FakeResponse(status, "application/json", {"message": "boom"})
+
+
+def _ok():
+    return FakeResponse(200, "application/json", {"joke": "x"})
+
+
+class Recorder(RequestHook):
+    def __init__(self):
+        self.changes = []
+
+    async def on_circuit_change(self, group, old, new):
+        self.changes.append((group, old, new))
+
+
+def test_circuit_breaker_validation() -> None:
+    with pytest.raises(ValueError):
+        CircuitBreaker(ratio=0)
+    with pytest.raises(ValueError):
+        CircuitBreaker(min_requests=0)
+    with pytest.raises(ValueError):
+        CircuitBreaker(probes=0)
+
+
+def test_circuit_opens_fails_fast_and_recovers_through_a_probe() -> None:
+    async def main():
+        breaker = CircuitBreaker(ratio=0.5, min_requests=4, open_for=0.05)
+        hook = Recorder()
+        metrics = MetricsRegistry()
+        session = FakeSession([_ok(), _ok(), _error(), _error(), _ok()])
+        client = HTTPClient(None, session, circuit_breaker=breaker, hooks=[hook], metrics=metrics, coalesce=False)
+
+        await client.request(Base.JOKE)
+        await client.request(Base.JOKE)
+        with pytest.raises(InternalServerError):
+            await client.request(Base.JOKE)
+        with pytest.raises(InternalServerError):
+            await client.request(Base.JOKE)
+
+        assert breaker.states() == {"Base": CircuitState.OPEN}
+        with pytest.raises(CircuitOpen) as exc_info:
+            await client.request(Base.JOKE)
+        assert exc_info.value.group == "Base"
+        assert 0 < exc_info.value.retry_after <= 0.05
+        # other groups are not affected
+        assert breaker._get(Animal.DOG).state is CircuitState.CLOSED
+
+        await asyncio.sleep(0.06)
+        assert await client.request(Base.JOKE) == {"joke": "x"}
+        assert breaker.states()["Base"] is CircuitState.CLOSED
+        return hook.changes, metrics.to_dict()
+
+    changes, metrics = _run(main())
+    assert changes == [
+        ("Base", CircuitState.CLOSED, CircuitState.OPEN),
+        ("Base", CircuitState.OPEN, CircuitState.HALF_OPEN),
+        ("Base", CircuitState.HALF_OPEN, CircuitState.CLOSED),
+    ]
+    assert metrics["circuit"] == {"base_state": 0, "base_opened": 1, "animal_state": 0, "animal_opened": 0}
+    assert metrics["endpoints"]["joke"]["errors"] == {"InternalServerError": 2, "CircuitOpen": 1}
+
+
+def test_failed_probe_opens_the_circuit_again() -> None:
+    async def main():
+        breaker = CircuitBreaker(min_requests=1, open_for=0.01)
+        session = FakeSession([_error(), _error()])
+        client = HTTPClient(None, session, circuit_breaker=breaker, coalesce=False)
+        with pytest.raises(InternalServerError):
+            await client.request(CanvasFilter.BLUE, avatar="a")
+        await asyncio.sleep(0.02)
+        with pytest.raises(InternalServerError):
+            await client.request(CanvasFilter.BLUE, avatar="a")
+        with pytest.raises(CircuitOpen):
+            await client.request(CanvasFilter.BLUE, avatar="a")
+        return breaker._get(CanvasFilter.BLUE)
+
+    circuit = _run(main())
+    assert circuit.state is CircuitState.OPEN
+    assert circuit.opened == 2
+
+
+def test_probes_in_flight_when_a_probe_fails_are_still_counted() -> None:
+    breaker = CircuitBreaker(min_requests=1, open_for=0.01, probes=2)
+    circuit = breaker._get(Base.JOKE)
+    circuit.record(failed=True, probe=False)
+    time.sleep(0.02)
+    assert circuit.allow(Base.JOKE)
+    assert circuit.allow(Base.JOKE)
+
+    # the first probe fails while the second is in flight
+    circuit.record(failed=True, probe=True)
+    assert circuit.state is CircuitState.OPEN
+    circuit.record(failed=False, probe=True)
+    assert circuit.state is CircuitState.OPEN
+    assert circuit._probes == 0
+
+    time.sleep(0.02)
+    assert circuit.allow(Base.JOKE)
+    assert circuit.allow(Base.JOKE)
+    with pytest.raises(CircuitOpen):
+        circuit.allow(Base.JOKE)
+
+
+def test_client_errors_and_slow_requests() -> None:
+    async def main():
+        breaker = CircuitBreaker(min_requests=1, slow_threshold=10)
+        client = HTTPClient(None, FakeSession([_error(404)]), circuit_breaker=breaker, coalesce=False)
+        with pytest.raises(NotFound):
+            await client.request(Base.JOKE)
+        return breaker
+
+    breaker = _run(main())
+    assert breaker.states() == {"Base": CircuitState.CLOSED}
+    assert breaker._is_failure(None, 11)
+    assert breaker._is_failure(BadRequest(Base.JOKE, {"error": "boom", "code": 502}), 0)
+    assert not breaker._is_failure(None, 1)
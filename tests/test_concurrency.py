@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+import pytest
+
+from somerandomapi import AdaptiveConcurrency, RateLimited
+from somerandomapi.internals.endpoints import Base, CanvasFilter
+from somerandomapi.internals.http import HTTPClient
+from somerandomapi.internals.metrics import MetricsRegistry
+from somerandomapi.internals.scheduler import Scheduler
+
+from test_http_client import FakeResponse, FakeSession
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _ok():
+    return FakeResponse(200, "application/json", {"joke": "x"})
+
+
+def test_adaptive_concurrency_validation() -> None:
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(minimum=0)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(initial=200)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(increase=0)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(backoff=1)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(latency_tolerance=1)
+
+
+def test_limit_grows_additively_and_is_cut_once_per_congestion() -> None:
+    concurrency = AdaptiveConcurrency(initial=4, maximum=6)
+    limit = concurrency._get(Base.JOKE)
+    limit.in_flight = 4
+
+    # about one full round of responses adds one
+    for _ in range(5):
+        limit.record(time.perf_counter(), None, 1.0)
+    assert concurrency.limits() == {"Base": 5}
+
+    for _ in range(50):
+        limit.record(time.perf_counter(), None, 1.0)
+    assert concurrency.limits() == {"Base": 6}
+
+    started = time.perf_counter()
+    limit.record(started, RateLimited(Base.JOKE, {}, retry_after=None), None)
+    assert concurrency.limits() == {"Base": 3}
+
+    # a request sent before the cut doesn't cut again
+    limit.record(started, TimeoutError(), None)
+    assert concurrency.limits() == {"Base": 3}
+
+    limit.record(time.perf_counter(), TimeoutError(), None)
+    limit.record(time.perf_counter(), TimeoutError(), None)
+    assert concurrency.limits() == {"Base": 1}
+    assert limit.decreased == 3
+
+
+def test_limit_is_cut_when_latency_rises_and_not_grown_while_unused() -> None:
+    concurrency = AdaptiveConcurrency(initial=8)
+    limit = concurrency._get(CanvasFilter.BLUE)
+
+    limit.in_flight = 1
+    for _ in range(20):
+        limit.record(time.perf_counter(), None, 1.0)
+    assert concurrency.limits() == {"CanvasFilter": 8}
+
+    # requests that were sent together only cut the limit once
+    limit.in_flight = 8
+    started = time.perf_counter()
+    for _ in range(10):
+        limit.record(started, None, 4.0)
+    assert concurrency.limits() == {"CanvasFilter": 4}
+
+
+def test_scheduler_waits_for_the_limit_of_the_group() -> None:
+    async def main():
+        concurrency = AdaptiveConcurrency(initial=2)
+        scheduler = Scheduler(None, None, concurrency)
+        running = peak = 0
+
+        async def request():
+            nonlocal running, peak
+            await scheduler.acquire(Base.JOKE, None)
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            scheduler.release(Base.JOKE)
+
+        await asyncio.gather(*(request() for _ in range(5)))
+        # other groups have limits of their own
+        await scheduler.acquire(CanvasFilter.BLUE, None)
+        scheduler.release(CanvasFilter.BLUE)
+        return peak, concurrency._stats()
+
+    peak, stats = _run(main())
+    assert peak == 2
+    assert stats["base"]["in_flight"] == 0
+    assert stats["canvasfilter"]["limit"] == 2
+
+
+def test_rate_limited_response_cuts_the_limit_in_the_metrics() -> None:
+    async def main():
+        concurrency = AdaptiveConcurrency(initial=10)
+        metrics = MetricsRegistry()
+        session = FakeSession([_ok(), FakeResponse(429, "application/json", {"message": "slow down"})])
+        client = HTTPClient(None, session, adaptive_concurrency=concurrency, metrics=metrics, coalesce=False)
+
+        await client.request(Base.JOKE)
+        with pytest.raises(RateLimited):
+            await client.request(Base.JOKE)
+
+        return metrics.to_dict()["concurrency"]
+
+    stats = _run(main())
+    assert stats["base_limit"] == 5
+    assert stats["base_decreased"] == 1
+    assert stats["base_in_flight"] == 0
@@ -9,30 +9,33 @@ from somerandomapi.internals.endpoints import (
 )
 
 
-def test_endpoint_constructed_url_and_body_order() -> None:
+def test_endpoint_built_url_and_body_order() -> None:
     endpoint = Endpoint(
         "welcome",
         template=Parameter(index=1, is_body_parameter=True),
         background=Parameter(index=0, is_body_parameter=True),
         username=Parameter(required=False),
     )
-    endpoint.parameters["template"].value = 7
-    endpoint.parameters["background"].value = "stars"
-    endpoint.parameters["username"].value = "soheab"
-    assert endpoint.get_constructed_url() == "welcome/stars/7?username=soheab"
+    values = {"template": 7, "background": "stars", "username": "soheab"}
+    assert endpoint.build_url(values) == "welcome/stars/7?username=soheab"
 
 
-def test_set_param_values_and_missing_required() -> None:
+def test_build_url_skips_missing_optional_and_requires_required() -> None:
     endpoint = Endpoint("x", avatar=Parameter(), optional=Parameter(required=False))
-    configured = endpoint._set_param_values(None, avatar="https://a")
-    assert configured.parameters["avatar"].value == "https://a"
+    assert endpoint.build_url({"avatar": "https://a"}) == "x?avatar=https%3A%2F%2Fa"
 
     try:
-        endpoint._set_param_values(None)
+        endpoint.build_url({})
         raise AssertionError("expected TypeError")
     except TypeError as exc:
         assert "Missing required parameter avatar" in str(exc)
 
+    try:
+        endpoint.build_url({"avatar": ""})
+        raise AssertionError("expected TypeError")
+    except TypeError as exc:
+        assert "Missing required value for parameter avatar" in str(exc)
+
 
 def test_base_endpoint_from_enum_validation() -> None:
     assert Animu.from_enum(enums.Animu.HUG).path.endswith("hug")
@@ -65,3 +68,68 @@ def test_parameter_repr_and_property() -> None:
 
 def test_endpoint_enums_map_paths() -> None:
     assert CanvasFilter.from_enum(enums.CanvasFilter.BLUE).path.endswith("blue")
+
+
+def test_endpoint_returns_image() -> None:
+    from somerandomapi.internals.endpoints import BaseCanvas, Premium
+
+    assert CanvasFilter.BLUE.returns_image
+    assert Premium.RANK_CARD.returns_image
+    assert Base.WELCOME.returns_image
+    assert not BaseCanvas.HEX.returns_image
+    assert not Base.JOKE.returns_image
+
+
+def test_endpoint_randomized() -> None:
+    from somerandomapi.internals.endpoints import Animal, Facts, Img, Pokemon
+
+    assert Animal.DOG.randomized
+    assert Facts.CAT.randomized
+    assert Img.FOX.randomized
+    assert Base.JOKE.randomized
+    assert not Pokemon.POKEDEX.randomized
+    assert not CanvasFilter.BLUE.randomized
+
+
+def test_endpoint_timeout_per_group() -> None:
+    from somerandomapi.internals.endpoints import Animal, BaseCanvas, CanvasMisc, Premium
+
+    assert Base.JOKE.timeout is not None and Base.JOKE.timeout.total == 5
+    assert Animal.DOG.timeout is Animal.timeout()
+    assert CanvasMisc.SPIN.timeout is BaseCanvas.timeout()
+    assert Premium.AMONGUS.timeout is not None and Premium.AMONGUS.timeout.total == 60
+    # endpoints override the timeout of their group
+    assert Base.WELCOME.timeout is BaseCanvas.timeout()
+    assert Base.CHATBOT.timeout is not None and Base.CHATBOT.timeout.total > Base.JOKE.timeout.total
+    assert Endpoint("standalone").timeout is None
+
+
+def test_build_url_does_not_mutate() -> None:
+    from somerandomapi.internals.endpoints import Premium
+
+    values = {"template": 2, "username": "so heab", "avatar": "https://a/b.png", "level": 1, "cxp": 1, "nxp": 2}
+    url = Premium.RANK_CARD.build_url(values)
+    assert url == "premium/rankcard/2?username=so+heab&avatar=https%3A%2F%2Fa%2Fb.png&level=1&cxp=1&nxp=2"
+    assert all(param.value is None for param in Premium.RANK_CARD.parameters.values())
+
+    # optional values of a previous call must not leak into the next one
+    first = Premium.RANK_CARD.build_url({**values, "ctext": "ffffff"})
+    assert first.endswith("&ctext=ffffff")
+    assert Premium.RANK_CARD.build_url(values) == url
+
+
+def test_build_url_missing_required() -> None:
+    endpoint = Endpoint("x", avatar=Parameter(), optional=Parameter(required=False))
+    assert endpoint.build_url({"avatar": "a", "unknown": 1}) == "x?avatar=a"
+
+    try:
+        endpoint.build_url({})
+        raise AssertionError("expected TypeError")
+    except TypeError as exc:
+        assert "Missing required parameter avatar" in str(exc)
+
+    try:
+        endpoint.build_url({"avatar": ""})
+        raise AssertionError("expected TypeError")
+    except TypeError as exc:
+        assert "Missing required value for parameter avatar" in str(exc)
@@ -6,6 +6,7 @@ from somerandomapi.errors import (
     HTTPException,
     ImageError,
     InternalServerError,
+    RateLimited,
     SomeRandomApiException,
 )
 from somerandomapi.internals.endpoints import Base
@@ -42,8 +43,14 @@ def test_http_exception_and_image_error() -> None:
 
 
 def test_internal_server_error_message() -> None:
-    with pytest.raises(AttributeError):
-        InternalServerError(Base.JOKE, {})
+    exc = InternalServerError(Base.JOKE, {})
+    assert exc.code == 500
+    assert "While requesting /joke" in str(exc)
+
+
+def test_rate_limited_retry_after() -> None:
+    assert RateLimited(Base.JOKE, {}, retry_after=1.5).retry_after == 1.5
+    assert RateLimited(Base.JOKE, {}).retry_after is None
 
 
 def test_rankcard_color_validation() -> None:
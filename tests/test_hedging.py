@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+
+from somerandomapi import HedgePolicy, RetryPolicy
+from somerandomapi.internals.endpoints import Base, Facts, Premium
+from somerandomapi.internals.http import HTTPClient
+from somerandomapi.internals.metrics import MetricsRegistry
+
+from test_http_client import FakeResponse
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class _DelayedCM:
+    def __init__(self, session, delay, response):
+        self.session = session
+        self.delay = delay
+        self.response = response
+
+    async def __aenter__(self):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.session.cancelled += 1
+            raise
+        if isinstance(self.response, BaseException):
+            raise self.response
+        return self.response
+
+    async def __aexit__(self, *_):
+        return None
+
+
+class DelayedSession:
+    def __init__(self, responses):
+        # (delay in seconds, response) pairs
+        self.responses = list(responses)
+        self.headers = {}
+        self.closed = False
+        self.connector = None
+        self.calls = 0
+        self.cancelled = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        delay, response = self.responses.pop(0)
+        return _DelayedCM(self, delay, response)
+
+
+def _fact(text):
+    return FakeResponse(200, "application/json", {"fact": text})
+
+
+def _client(session, policy, **kwargs):
+    client = HTTPClient(None, session, hedge=policy, coalesce=False, **kwargs)
+    for _ in range(20):
+        client._latency.record(Facts.CAT, 0.01)
+    return client
+
+
+def test_hedge_policy_validation_and_premium() -> None:
+    with pytest.raises(ValueError):
+        HedgePolicy(percentile=1)
+    with pytest.raises(ValueError):
+        HedgePolicy(budget=-1)
+
+    assert HedgePolicy().applies_to(Facts.CAT)
+    assert not HedgePolicy().applies_to(Premium.PETPET)
+    assert HedgePolicy(premium=True).applies_to(Premium.PETPET)
+
+
+def test_slow_request_is_hedged_and_the_hedge_wins() -> None:
+    async def main():
+        policy = HedgePolicy(budget=1)
+        metrics = MetricsRegistry()
+        session = DelayedSession([(1, _fact("slow")), (0, _fact("fast"))])
+        client = _client(session, policy, metrics=metrics)
+        result = await asyncio.wait_for(client.request(Facts.CAT), 0.5)
+        await asyncio.sleep(0)
+        return result, session, metrics.to_dict()["hedging"]
+
+    result, session, stats = _run(main())
+    assert result == {"fact": "fast"}
+    assert session.calls == 2
+    assert session.cancelled == 1
+    assert stats == {"hedged": 1, "won": 1}
+
+
+def test_fast_request_is_not_hedged() -> None:
+    async def main():
+        policy = HedgePolicy(budget=1)
+        session = DelayedSession([(0, _fact("fast"))])
+        client = _client(session, policy)
+        return await client.request(Facts.CAT), session, policy
+
+    result, session, policy = _run(main())
+    assert result == {"fact": "fast"}
+    assert session.calls == 1
+    assert policy.hedged == 0
+
+
+def test_hedging_skips_unknown_latency_and_exhausted_budget() -> None:
+    async def main():
+        policy = HedgePolicy(budget=0)
+        policy._budget.min_per_second = 0
+        session = DelayedSession([(0.05, _fact("slow")), (0.05, _fact("joke"))])
+        client = _client(session, policy)
+        # no budget left for a hedge
+        assert await client.request(Facts.CAT) == {"fact": "slow"}
+        # no latency known for this endpoint
+        assert await client.request(Base.JOKE) == {"fact": "joke"}
+        return session
+
+    assert _run(main()).calls == 2
+
+
+def test_error_of_one_request_waits_for_the_other() -> None:
+    async def main():
+        policy = HedgePolicy(budget=1)
+        session = DelayedSession(
+            [(0.05, _fact("slow")), (0, FakeResponse(500, "application/json", {"error": "boom"}))]
+        )
+        client = _client(session, policy)
+        return await client.request(Facts.CAT)
+
+    assert _run(main()) == {"fact": "slow"}
+
+
+def test_request_that_ends_cancelled_waits_for_the_other() -> None:
+    async def main():
+        policy = HedgePolicy(budget=1)
+        session = DelayedSession([(0.03, asyncio.CancelledError()), (0.05, _fact("hedge"))])
+        client = _client(session, policy)
+        return await client.request(Facts.CAT), policy
+
+    result, policy = _run(main())
+    assert result == {"fact": "hedge"}
+    assert policy.won == 1
+
+
+def test_retries_do_not_add_to_the_hedge_budget() -> None:
+    async def main():
+        policy = HedgePolicy(budget=1)
+        error = FakeResponse(500, "application/json", {"message": "boom"})
+        session = DelayedSession([(0, error), (0, error), (0, _fact("ok"))])
+        retry = RetryPolicy(max_retries=2, base_delay=0.001, max_delay=0.01)
+        client = _client(session, policy, retry=retry)
+        return await client.request(Facts.CAT), session, policy
+
+    result, session, policy = _run(main())
+    assert result == {"fact": "ok"}
+    assert session.calls == 3
+    assert sum(policy._budget._requests) == 1
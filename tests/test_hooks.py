@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from somerandomapi import Client, RequestHook
+from somerandomapi.errors import NotFound
+from somerandomapi.internals.endpoints import Base, CanvasFilter
+from somerandomapi.internals.http import HTTPClient
+from somerandomapi.models.image import Image
+
+from test_http_client import FakeResponse, FakeSession
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class Recorder(RequestHook):
+    def __init__(self, name, calls) -> None:
+        self.name = name
+        self.calls = calls
+
+    async def before_request(self, endpoint, url, /):
+        self.calls.append((self.name, "before", endpoint.path, url))
+
+    async def after_response(self, endpoint, status, elapsed, size, /):
+        assert elapsed >= 0
+        self.calls.append((self.name, "after", status, size))
+
+    async def on_error(self, endpoint, error, /):
+        self.calls.append((self.name, "error", type(error)))
+
+
+def test_hooks_are_called_in_order() -> None:
+    calls = []
+    session = FakeSession([FakeResponse(payload={"joke": "j"}), FakeResponse(status=404, payload={"message": "x"})])
+    http = HTTPClient(token=None, session=session, hooks=[Recorder("a", calls), Recorder("b", calls)])
+    assert _run(http.request(Base.JOKE)) == {"joke": "j"}
+    size = len(b'{"joke": "j"}')
+    assert calls == [
+        ("a", "before", "joke", session.last_url),
+        ("b", "before", "joke", session.last_url),
+        ("a", "after", 200, size),
+        ("b", "after", 200, size),
+    ]
+
+    calls.clear()
+    with pytest.raises(NotFound):
+        _run(http.request(Base.JOKE))
+    assert [call[:2] for call in calls] == [
+        ("a", "before"),
+        ("b", "before"),
+        ("a", "after"),
+        ("b", "after"),
+        ("a", "error"),
+        ("b", "error"),
+    ]
+    assert calls[-1][2] is NotFound
+
+
+def test_before_request_can_answer_the_request() -> None:
+    class Answer(RequestHook):
+        async def before_request(self, endpoint, url, /):
+            return {"joke": "from a hook"}
+
+    calls = []
+    session = FakeSession([])
+    http = HTTPClient(token=None, session=session, hooks=[Answer(), Recorder("a", calls)])
+    assert _run(http.request(Base.JOKE)) == {"joke": "from a hook"}
+    assert session.last_url is None
+    assert calls == []
+
+
+def test_after_response_size_of_images() -> None:
+    calls = []
+    session = FakeSession([FakeResponse(content_type="image/png", body=b"png")])
+    http = HTTPClient(token=None, session=session, hooks=[Recorder("a", calls)])
+    assert isinstance(_run(http.request(CanvasFilter.BLUE, avatar="https://a")), Image)
+    assert calls[-1] == ("a", "after", 200, 3)
+
+
+def test_client_add_and_remove_hook() -> None:
+    client = Client()
+    hook = RequestHook()
+    client.add_hook(hook)
+    assert client._http._hooks == [hook]
+    client.remove_hook(hook)
+    assert client._http._hooks == []
+    with pytest.raises(ValueError):
+        client.remove_hook(hook)
@@ -4,16 +4,25 @@ import json
 import pytest
 
 from somerandomapi import utils as _utils
-from somerandomapi.errors import BadRequest, Forbidden, HTTPException, ImageError, NotFound, RateLimited
+from somerandomapi.errors import (
+    BadRequest,
+    Forbidden,
+    HTTPException,
+    ImageError,
+    InternalServerError,
+    NotFound,
+    RateLimited,
+)
 from somerandomapi.internals.endpoints import Base
 from somerandomapi.internals.http import HTTPClient, json_or_text
 from somerandomapi.models.image import Image
 
 
 class FakeResponse:
-    def __init__(self, status=200, content_type="application/json", payload=None, body=b"img") -> None:
+    def __init__(self, status=200, content_type="application/json", payload=None, body=b"img", headers=None) -> None:
         self.status = status
         self.content_type = content_type
+        self.headers = headers or {}
         self._payload = payload if payload is not None else {}
         self._body = body
 
@@ -23,7 +32,9 @@ class FakeResponse:
         return str(self._payload)
 
     async def read(self):
-        return self._body
+        if self.content_type.startswith("image/"):
+            return self._body
+        return (await self.text()).encode()
 
 
 class _CM:
@@ -42,10 +53,13 @@ class FakeSession:
         self.responses = list(responses)
         self.headers = {}
         self.closed = False
+        self.connector = None
         self.last_url = None
+        self.last_kwargs = {}
 
-    def get(self, url):
+    def get(self, url, **kwargs):
         self.last_url = url
+        self.last_kwargs = kwargs
         return _CM(self.responses.pop(0))
 
     async def close(self):
@@ -63,6 +77,22 @@ def test_json_or_text() -> None:
     assert t == "hello"
 
 
+def test_json_or_text_uses_loads() -> None:
+    seen = []
+
+    def loads(body: bytes):
+        seen.append(body)
+        return json.loads(body)
+
+    assert _run(json_or_text(FakeResponse(payload={"a": 1}), loads)) == {"a": 1}
+    assert seen == [b'{"a": 1}']
+
+    session = FakeSession([FakeResponse(payload={"b": 2})])
+    http = HTTPClient(token=None, session=session, json_loads=loads)
+    assert _run(http.request(Base.JOKE)) == {"b": 2}
+    assert len(seen) == 2
+
+
 def _client_with_session(session: FakeSession) -> HTTPClient:
     return HTTPClient(token="abc", session=session)
 
@@ -85,7 +115,7 @@ def test_request_error_mapping() -> None:
         (403, Forbidden),
         (404, NotFound),
         (429, RateLimited),
-        (500, AttributeError),
+        (500, InternalServerError),
         (418, HTTPException),
     ]
     for status, exc_type in mapping:
@@ -118,3 +148,228 @@ def test_get_image_url_and_close() -> None:
     real._session = fake
     _run(real.close())
     assert fake.closed
+
+
+def test_get_image_url_only_sends_the_token_to_the_api() -> None:
+    session = FakeSession([FakeResponse(status=200, content_type="image/png", body=b"abc") for _ in range(3)])
+    http = HTTPClient(token="secret", session=session)
+    _run(http._get_image_url(f"{http.BASE_URL}/img.png"))
+    assert session.last_kwargs["headers"]["Authorization"] == "secret"
+
+    _run(http._get_image_url("https://x"))
+    headers = session.last_kwargs["headers"]
+    assert "Authorization" not in headers
+    # built once, not for every download
+    _run(http._get_image_url("https://x"))
+    assert session.last_kwargs["headers"] is headers
+
+
+def test_request_image_keeps_body() -> None:
+    session = FakeSession([FakeResponse(content_type="image/png", body=b"png-bytes")])
+    http = _client_with_session(session)
+    image = _run(http.request(Base.JOKE))
+    assert isinstance(image, Image)
+    # no responses left, read() must not hit the session again
+    assert _run(image.read(bytesio=False)) == b"png-bytes"
+
+    session2 = FakeSession(
+        [FakeResponse(content_type="image/png", body=b"first"), FakeResponse(content_type="image/png", body=b"second")]
+    )
+    http2 = HTTPClient(token=None, session=session2, keep_image_data=False)
+    image2 = _run(http2.request(Base.JOKE))
+    assert _run(image2.read(bytesio=False)) == b"second"
+
+
+def test_request_image_without_fetching() -> None:
+    from somerandomapi.internals.endpoints import CanvasFilter, Premium
+
+    session = FakeSession([])
+    http = HTTPClient(token=None, session=session, fetch_images=False)
+    image = _run(http.request(CanvasFilter.BLUE, avatar="https://a"))
+    assert isinstance(image, Image)
+    assert image.url == f"{HTTPClient.BASE_URL}/canvas/filter/blue?avatar=https%3A%2F%2Fa"
+    assert session.last_url is None
+
+    # parameters are still validated locally
+    with pytest.raises(ValueError):
+        _run(http.request(Premium.PETPET))
+    with pytest.raises(TypeError):
+        _run(http.request(Premium.PETPET, username="u"))
+
+    # JSON endpoints are still requested
+    session2 = FakeSession([FakeResponse(payload={"hex": "ffffff"})])
+    http2 = HTTPClient(token=None, session=session2, fetch_images=False)
+    assert _run(http2.request(Base.JOKE)) == {"hex": "ffffff"}
+
+
+def test_image_validate() -> None:
+    session = FakeSession([FakeResponse(content_type="image/png", body=b"ok")])
+    http = _client_with_session(session)
+    image = Image.construct("https://x", http)
+    assert _run(image.validate()) is image
+    assert _run(image.read(bytesio=False)) == b"ok"
+
+    session2 = FakeSession([FakeResponse(payload={"error": "bad"})])
+    http2 = _client_with_session(session2)
+    with pytest.raises(ImageError):
+        _run(Image.construct("https://x", http2).validate())
+
+
+def test_request_coalesces_identical_requests() -> None:
+    from somerandomapi.internals.endpoints import Pokemon
+
+    async def main():
+        session = FakeSession([FakeResponse(payload={"name": "pikachu"})])
+        http = _client_with_session(session)
+        results = await asyncio.gather(*(http.request(Pokemon.POKEDEX, pokemon="pikachu") for _ in range(3)))
+        assert results == [{"name": "pikachu"}] * 3
+        assert not http._in_flight
+
+        # randomized endpoints are never shared
+        session2 = FakeSession([FakeResponse(payload={"joke": "a"}), FakeResponse(payload={"joke": "b"})])
+        http2 = _client_with_session(session2)
+        results = await asyncio.gather(http2.request(Base.JOKE), http2.request(Base.JOKE))
+        assert results == [{"joke": "a"}, {"joke": "b"}]
+
+        # and nothing is shared if coalescing is disabled
+        session3 = FakeSession([FakeResponse(payload={"n": 1}), FakeResponse(payload={"n": 2})])
+        http3 = HTTPClient(token=None, session=session3, coalesce=False)
+        results = await asyncio.gather(*(http3.request(Pokemon.POKEDEX, pokemon="pikachu") for _ in range(2)))
+        assert results == [{"n": 1}, {"n": 2}]
+
+    _run(main())
+
+
+def test_request_coalesced_cancellation_and_errors() -> None:
+    from somerandomapi.internals.endpoints import Pokemon
+
+    class SlowSession(FakeSession):
+        def get(self, url, **kwargs):
+            self.last_url = url
+            response = self.responses.pop(0)
+
+            class _Slow(_CM):
+                async def __aenter__(self):
+                    await asyncio.sleep(0.01)
+                    return self.response
+
+            return _Slow(response)
+
+    async def main():
+        session = SlowSession([FakeResponse(status=404, payload={"message": "nope"})])
+        http = _client_with_session(session)
+        first = asyncio.ensure_future(http.request(Pokemon.POKEDEX, pokemon="x"))
+        second = asyncio.ensure_future(http.request(Pokemon.POKEDEX, pokemon="x"))
+        await asyncio.sleep(0)
+        # cancelling one caller doesn't cancel the shared request
+        first.cancel()
+        with pytest.raises(NotFound):
+            await second
+        assert first.cancelled()
+        assert not http._in_flight
+
+    _run(main())
+
+
+def test_request_coalesced_callers_keep_their_own_deadline_and_priority() -> None:
+    from somerandomapi import DeadlineExceeded, Priority, request_deadline, request_priority
+    from somerandomapi.internals.endpoints import Pokemon
+
+    class SlowSession(FakeSession):
+        calls = 0
+
+        def get(self, url, **kwargs):
+            self.calls += 1
+            response = self.responses.pop(0)
+
+            class _Slow(_CM):
+                async def __aenter__(self):
+                    await asyncio.sleep(0.05)
+                    return self.response
+
+            return _Slow(response)
+
+    async def call(http, pokemon="x", deadline=None, priority=Priority.NORMAL):
+        with request_priority(priority):
+            if deadline is None:
+                return await http.request(Pokemon.POKEDEX, pokemon=pokemon)
+            with request_deadline(deadline):
+                return await http.request(Pokemon.POKEDEX, pokemon=pokemon)
+
+    async def main():
+        session = SlowSession([FakeResponse(payload={"name": "y"}), FakeResponse(payload={"name": "x"})])
+        http = HTTPClient(token=None, session=session, max_concurrency=1)
+        # keeps the only slot busy, so the shared request has to wait for it.
+        blocker = asyncio.ensure_future(call(http, "y"))
+        await asyncio.sleep(0)
+        # the caller that starts the request has the shortest deadline, the others outlive it.
+        results = await asyncio.gather(
+            call(http, deadline=0.02), call(http), call(http, deadline=1.0), return_exceptions=True
+        )
+        assert isinstance(results[0], DeadlineExceeded)
+        assert results[1:] == [{"name": "x"}, {"name": "x"}]
+        assert await blocker == {"name": "y"}
+        assert session.calls == 2
+
+        # requests of another priority are not shared
+        session2 = SlowSession([FakeResponse(payload={"n": 1}), FakeResponse(payload={"n": 2})])
+        http2 = _client_with_session(session2)
+        results = await asyncio.gather(call(http2, priority=Priority.BACKGROUND), call(http2, priority=Priority.INTERACTIVE))
+        assert results == [{"n": 1}, {"n": 2}]
+        assert not http2._in_flight
+
+    _run(main())
+
+
+def test_request_coalesced_request_is_dropped_when_its_only_caller_gives_up() -> None:
+    from somerandomapi import DeadlineExceeded, request_deadline
+    from somerandomapi.internals.endpoints import Pokemon
+
+    class SlowSession(FakeSession):
+        calls = 0
+
+        def get(self, url, **kwargs):
+            self.calls += 1
+            response = self.responses.pop(0)
+
+            class _Slow(_CM):
+                async def __aenter__(self):
+                    await asyncio.sleep(0.05)
+                    return self.response
+
+            return _Slow(response)
+
+    async def main():
+        session = SlowSession([FakeResponse(payload={"name": "y"}), FakeResponse(payload={"name": "x"})])
+        http = HTTPClient(token=None, session=session, max_concurrency=1)
+        blocker = asyncio.ensure_future(http.request(Pokemon.POKEDEX, pokemon="y"))
+        await asyncio.sleep(0)
+        with request_deadline(0.02), pytest.raises(DeadlineExceeded):
+            await http.request(Pokemon.POKEDEX, pokemon="x")
+        assert len(http._in_flight) == 1
+
+        assert await blocker == {"name": "y"}
+        await asyncio.sleep(0.01)
+        # the request was still queued when its caller gave up, it's never made
+        assert session.calls == 1
+
+    _run(main())
+
+
+def test_token_is_sent_per_request_without_touching_the_session() -> None:
+    async def main():
+        session = FakeSession([FakeResponse(payload={"joke": "a"}), FakeResponse(payload={"joke": "b"})])
+        first = HTTPClient("first", session, coalesce=False)
+        second = HTTPClient("second", session, coalesce=False)
+        await first.request(Base.JOKE)
+        first_headers = session.last_kwargs["headers"]
+        await second.request(Base.JOKE)
+        return session, first_headers, session.last_kwargs["headers"], first
+
+    session, first_headers, second_headers, first = _run(main())
+    assert session.headers == {}
+    assert first_headers["Authorization"] == "first"
+    assert second_headers["Authorization"] == "second"
+    assert first_headers["User-Agent"] == HTTPClient.USER_AGENT
+    # built once, not per request
+    assert first_headers is first._headers
@@ -34,3 +34,13 @@ def test_image_construct_read_and_file() -> None:
     file_obj = _run(img.file(FakeFile, filename="x.png", spoiler=True))
     assert file_obj.filename == "x.png"
     assert file_obj.kwargs["spoiler"] is True
+
+
+def test_image_read_uses_kept_data() -> None:
+    class FailingHTTP:
+        async def _get_image_url(self, url: str) -> bytes:
+            raise AssertionError("should not be called")
+
+    img = Image.construct("https://img", FailingHTTP(), data=b"kept")
+    assert _run(img.read(bytesio=False)) == b"kept"
+    assert _run(img.read()).getvalue() == b"kept"
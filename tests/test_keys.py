@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from somerandomapi import Client
+from somerandomapi.errors import Forbidden
+from somerandomapi.internals.endpoints import Base, Premium
+from somerandomapi.internals.http import HTTPClient
+from somerandomapi.internals.keys import KeyPool
+
+from test_http_client import FakeResponse, FakeSession
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _headers(token):
+    return {"Authorization": token}
+
+
+def _quota(remaining, reset=60):
+    return {"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(reset)}
+
+
+def test_key_pool_picks_the_most_quota_left() -> None:
+    pool = KeyPool(["a", "b", "c"], _headers)
+    first = pool.acquire()
+    second = pool.acquire()
+    third = pool.acquire()
+    # unknown quotas take turns
+    assert {first.token, second.token, third.token} == {"a", "b", "c"}
+    for key in (first, second, third):
+        pool.release(key)
+
+    pool.update(pool._keys[0], 200, _quota(5))
+    pool.update(pool._keys[1], 200, _quota(20))
+    pool.update(pool._keys[2], 200, _quota(10))
+    assert pool.acquire().token == "b"
+
+    with pytest.raises(ValueError):
+        KeyPool([], _headers)
+
+
+def test_key_pool_leaves_out_rejected_and_exhausted_keys() -> None:
+    pool = KeyPool(["a", "b", "c"], _headers)
+    a, b, c = pool._keys
+    pool.update(a, 403, {})
+    pool.update(b, 200, _quota(0, reset=0.05))
+    pool.update(c, 200, _quota(1))
+    assert pool.acquire() is c
+    assert pool._stats()["key0"]["available"] == 0
+
+    pool.update(c, 429, {"Retry-After": "0.01"})
+    # all keys are out, the one that returns first is used
+    assert pool.acquire() is c
+
+
+def test_requests_send_the_key_per_request() -> None:
+    async def main():
+        responses = [
+            FakeResponse(403, "application/json", {"message": "bad key"}),
+            FakeResponse(200, "application/json", {"joke": "x"}, headers=_quota(3)),
+            FakeResponse(200, "application/json", {"joke": "y"}),
+        ]
+        session = FakeSession(responses)
+        client = HTTPClient(None, session, tokens=["first", "second"], coalesce=False)
+        sent = []
+        with pytest.raises(Forbidden):
+            await client.request(Base.JOKE)
+        sent.append(session.last_kwargs["headers"]["Authorization"])
+        await client.request(Base.JOKE)
+        sent.append(session.last_kwargs["headers"]["Authorization"])
+        await client.request(Base.JOKE)
+        sent.append(session.last_kwargs["headers"]["Authorization"])
+        assert client._keys is not None
+        assert all(key.in_flight == 0 for key in client._keys._keys)
+        return sent, session
+
+    sent, session = _run(main())
+    # the rejected key is left out afterwards
+    assert sent == ["first", "second", "second"]
+    assert "Authorization" not in session.headers
+
+
+def test_rate_limiter_is_scaled_to_the_keys() -> None:
+    client = HTTPClient(None, FakeSession([]), tokens=["a", "b"], ratelimit=True)
+    assert client._ratelimiter is not None
+    bucket = client._ratelimiter.get_bucket(Premium.PETPET)
+    assert bucket is not None
+    assert bucket.capacity == Premium.ratelimit()[0] * 2
+
+
+def test_client_token_and_tokens_are_exclusive() -> None:
+    with pytest.raises(TypeError):
+        Client("a", tokens=["b"])
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from somerandomapi import MetricsRegistry, utils as _utils
+from somerandomapi.errors import NotFound
+from somerandomapi.internals.cache import ResponseCache
+from somerandomapi.internals.endpoints import Base, Pokemon
+from somerandomapi.internals.http import HTTPClient
+
+from test_http_client import FakeResponse, FakeSession
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _client(responses, **kwargs):
+    metrics = MetricsRegistry(buckets=(0.1, 1.0))
+    http = HTTPClient(token=None, session=FakeSession(responses), metrics=metrics, **kwargs)
+    return http, metrics
+
+
+def test_metrics_record_responses_and_errors() -> None:
+    http, metrics = _client(
+        [FakeResponse(payload={"joke": "j"}), FakeResponse(status=404, payload={"message": "x"})],
+    )
+    _run(http.request(Base.JOKE))
+    with pytest.raises(NotFound):
+        _run(http.request(Base.JOKE))
+
+    joke = metrics.to_dict()["endpoints"]["joke"]
+    assert joke["latency"]["count"] == 2
+    assert joke["latency"]["buckets"][float("inf")] == 2
+    assert joke["statuses"] == {200: 1, 404: 1}
+    assert joke["errors"] == {"NotFound": 1}
+    assert joke["bytes_received"] == len(b'{"joke": "j"}') + len(b'{"message": "x"}')
+
+
+def test_metrics_cache_stats() -> None:
+    http, metrics = _client([FakeResponse(payload={"name": "pikachu"})], cache=ResponseCache())
+    for _ in range(3):
+        _run(http.request(Pokemon.POKEDEX, pokemon="pikachu"))
+
+    cache = metrics.to_dict()["cache"]
+    assert (cache["hits"], cache["misses"], cache["entries"]) == (2, 1, 1)
+    assert cache["hit_rate"] == pytest.approx(2 / 3)
+
+
+def test_metrics_prometheus_format() -> None:
+    http, metrics = _client([FakeResponse(status=429, payload={"message": "x"})])
+    with pytest.raises(Exception):
+        _run(http.request(Pokemon.POKEDEX, pokemon="pikachu"))
+
+    text = metrics.to_prometheus()
+    lines = text.splitlines()
+    assert "# TYPE somerandomapi_request_duration_seconds histogram" in lines
+    assert 'somerandomapi_request_duration_seconds_bucket{endpoint="pokemon/pokedex",le="+Inf"} 1' in lines
+    assert 'somerandomapi_request_duration_seconds_count{endpoint="pokemon/pokedex"} 1' in lines
+    assert 'somerandomapi_responses_total{endpoint="pokemon/pokedex",status="429"} 1' in lines
+    assert 'somerandomapi_errors_total{endpoint="pokemon/pokedex",error="RateLimited"} 1' in lines
+    assert text.endswith("\n")
+
+
+def test_metrics_prometheus_counters_and_gauges() -> None:
+    http, metrics = _client([FakeResponse(payload={"name": "pikachu"})], cache=ResponseCache())
+    for _ in range(2):
+        _run(http.request(Pokemon.POKEDEX, pokemon="pikachu"))
+
+    lines = metrics.to_prometheus().splitlines()
+    assert "# TYPE somerandomapi_cache_hits_total counter" in lines
+    assert "somerandomapi_cache_hits_total 1" in lines
+    assert "somerandomapi_cache_misses_total 1" in lines
+    assert "somerandomapi_cache_evictions_total 0" in lines
+    assert "# TYPE somerandomapi_cache_entries gauge" in lines
+    assert "# TYPE somerandomapi_cache_hit_rate gauge" in lines
+    # values per lane, group or key are one metric with a label
+    assert "# TYPE somerandomapi_lanes_requests_total counter" in lines
+    assert 'somerandomapi_lanes_requests_total{lane="normal"} 1' in lines
+    assert "# TYPE somerandomapi_lanes_wait_seconds_total counter" in lines
+    assert "# TYPE somerandomapi_lanes_queued gauge" in lines
+    assert 'somerandomapi_lanes_queued{lane="interactive"} 0' in lines
+    assert sum(line.startswith("# TYPE somerandomapi_lanes_queued ") for line in lines) == 1
+
+
+def test_metrics_pool_stats() -> None:
+    async def main():
+        metrics = MetricsRegistry()
+        http = HTTPClient(token=None, session=_utils.NOVALUE, metrics=metrics)
+        assert "pool" not in metrics.to_dict()
+        await http.initiate_session()
+        pool = metrics.to_dict()["pool"]
+        assert pool == {"in_use": 0, "idle": 0, "waiters": 0, "limit": 100, "opened": 0, "reused": 0}
+        await http.close()
+
+    _run(main())
@@ -0,0 +1,272 @@
+import asyncio
+import ssl
+from types import SimpleNamespace
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pytest
+from test_http_client import FakeSession
+
+from somerandomapi import (
+    Chatbot,
+    Client,
+    ConnectionPool,
+    utils as _utils,
+)
+from somerandomapi.internals.endpoints import Base, BaseCanvas, CanvasFilter, CanvasMisc, Pokemon, Premium
+from somerandomapi.internals.http import HTTPClient
+from somerandomapi.internals.pool import _connector_stats
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_connection_pool_validates_arguments() -> None:
+    with pytest.raises(ValueError):
+        ConnectionPool(limit=-1)
+
+    with pytest.raises(ValueError):
+        ConnectionPool(limits={"Premium": -1})
+
+    with pytest.raises(ValueError):
+        ConnectionPool(limit_per_host=-1)
+
+    with pytest.raises(ValueError):
+        ConnectionPool(keepalive_timeout=-1)
+
+    with pytest.raises(ValueError):
+        ConnectionPool(ttl_dns_cache=-1)
+
+
+def test_connection_pool_configures_the_connector() -> None:
+    context = ssl.create_default_context()
+    pool = ConnectionPool(limit=20, limit_per_host=10, keepalive_timeout=30, ttl_dns_cache=None, ssl_context=context)
+
+    async def runner():
+        http = HTTPClient(None, _utils.NOVALUE, pool=pool)
+        session = await http.initiate_session()
+        connector = session.connector
+        assert connector.limit == 20
+        assert connector.limit_per_host == 10
+        assert connector._keepalive_timeout == 30
+        assert connector._ssl is context
+        await http.close()
+
+    _run(runner())
+    assert pool.closed
+
+
+def test_connection_pool_is_shared_until_the_last_client_closes() -> None:
+    pool = ConnectionPool()
+
+    async def runner():
+        first = HTTPClient(None, _utils.NOVALUE, pool=pool)
+        second = HTTPClient(None, _utils.NOVALUE, pool=pool)
+        chatbot = Chatbot(pool=pool)
+
+        session = await first.initiate_session()
+        assert await second.initiate_session() is session
+        assert await chatbot._Chatbot__http.initiate_session() is session
+
+        await first.close()
+        assert not session.closed
+        await chatbot.close()
+        assert not session.closed
+        await second.close()
+        assert session.closed
+
+        # the pool is opened again when it's used after being closed.
+        assert not (await first.initiate_session()).closed
+        await first.close()
+
+    _run(runner())
+
+
+def test_client_session_and_pool_are_exclusive() -> None:
+    async def runner():
+        async with Client() as client:
+            with pytest.raises(TypeError):
+                Client(session=await client._http.initiate_session(), pool=ConnectionPool())
+
+    _run(runner())
+
+
+def test_client_pool_can_be_shared_with_a_chatbot() -> None:
+    async def runner():
+        pool = ConnectionPool()
+        async with Client(pool=pool) as client:
+            assert client.pool is pool
+
+        async with Client() as client:
+            chatbot = Chatbot(pool=client.pool)
+            session = await client._http.initiate_session()
+            assert await chatbot._Chatbot__http.initiate_session() is session
+            await chatbot.close()
+
+            async with Client(session=session) as other:
+                assert other.pool is None
+
+    _run(runner())
+
+
+class _LocalHTTPClient(HTTPClient):
+    __slots__ = ()
+
+
+async def _serve():
+    app = web.Application()
+
+    async def ok(_):  # noqa: RUF029
+        return web.Response(headers={"Content-Length": "0"})
+
+    async def image(_):  # noqa: RUF029
+        return web.Response(body=b"png", content_type="image/png")
+
+    app.router.add_route("HEAD", "/", ok)
+    app.router.add_route("GET", "/{path:.*}", image)
+    server = TestServer(app)
+    await server.start_server()
+    _LocalHTTPClient.BASE_URL = str(server.make_url("")).rstrip("/")
+    return server
+
+
+def test_warmup_opens_idle_connections() -> None:
+    async def runner():
+        server = await _serve()
+        http = _LocalHTTPClient(None, _utils.NOVALUE)
+        try:
+            with pytest.raises(ValueError):
+                await http.warmup(0)
+            with pytest.raises(ValueError):
+                await http.warmup(groups=["Pokemon"])
+
+            assert await http.warmup(3, groups=()) == 3
+            stats = http._pool_stats()
+            assert stats["opened"] == 3
+            assert stats["idle"] == 3
+
+            # a second warm up refreshes the same connections
+            assert await http.warmup(3, groups=()) == 3
+            stats = http._pool_stats()
+            assert stats["opened"] == 3
+            assert stats["reused"] == 3
+        finally:
+            await http.close()
+            await server.close()
+
+    _run(runner())
+
+
+def test_warmup_opens_connections_of_each_group() -> None:
+    async def runner():
+        server = await _serve()
+        http = _LocalHTTPClient(None, _utils.NOVALUE)
+        try:
+            assert await http.warmup() == 4
+            stats = http._pool_stats()
+            assert stats["opened"] == 1
+            assert (stats["basecanvas_opened"], stats["premium_opened"], stats["images_opened"]) == (1, 1, 1)
+            assert stats["basecanvas_idle"] == 1
+
+            await http.request(CanvasFilter.BLUE, avatar="a")
+            stats = http._pool_stats()
+            assert (stats["basecanvas_opened"], stats["basecanvas_reused"]) == (1, 1)
+
+            assert await http.warmup(groups=["Premium"]) == 2
+            assert http._pool_stats()["premium_reused"] == 1
+        finally:
+            await http.close()
+            await server.close()
+
+    _run(runner())
+
+
+def test_welcome_images_use_the_canvas_connections() -> None:
+    async def runner():
+        server = await _serve()
+        http = _LocalHTTPClient(None, _utils.NOVALUE)
+        try:
+            await http.request(
+                Base.WELCOME,
+                template=1,
+                background="stars",
+                type="join",
+                username="soheab",
+                avatar="a",
+                guildName="guild",
+                memberCount=1,
+                textcolor="red",
+            )
+            stats = http._pool_stats()
+            assert stats["basecanvas_opened"] == 1
+            assert stats["opened"] == 0
+        finally:
+            await http.close()
+            await server.close()
+
+    _run(runner())
+
+
+def test_keep_warm_refreshes_until_closed() -> None:
+    async def runner():
+        server = await _serve()
+        http = _LocalHTTPClient(None, _utils.NOVALUE)
+        try:
+            await http.warmup(2, keep_warm=0.05)
+            task = http._keep_warm_task
+            await asyncio.sleep(0.12)
+            assert http._pool_stats()["reused"] >= 2
+            assert http._pool_stats()["opened"] == 2
+        finally:
+            await http.close()
+            await server.close()
+
+        assert task.cancelled() or task.done()
+        assert http._keep_warm_task is None
+
+    _run(runner())
+
+
+def test_slow_groups_and_images_have_connections_of_their_own() -> None:
+    pool = ConnectionPool(limit=50, limits={"Premium": 5, "Pokemon": 3})
+    assert pool.limits == {"BaseCanvas": 20, "Premium": 5, "images": 20, "Pokemon": 3}
+
+    async def runner():
+        http = HTTPClient(None, _utils.NOVALUE, pool=pool)
+        default = await http.initiate_session()
+        assert await http._session_for(Base) is default
+        assert await http._session_for(None) is default
+        assert await http._session_for(Base.WELCOME.connections) is await http._session_for(BaseCanvas)
+
+        canvas = await http._session_for(CanvasFilter)
+        assert canvas is not default
+        # subgroups share the connections of the group they are part of.
+        assert await http._session_for(CanvasMisc) is canvas
+        assert canvas.connector.limit == 20
+        assert (await http._session_for(Premium)).connector.limit == 5
+        assert (await http._session_for(Pokemon)).connector.limit == 3
+        assert (await http._session_for("images")).connector.limit == 20
+
+        stats = http._pool_stats()
+        assert stats["limit"] == 50
+        assert stats["basecanvas_limit"] == 20
+        assert stats["premium_limit"] == 5
+        assert stats["images_in_use"] == 0
+
+        await http.close()
+        assert canvas.closed
+
+    _run(runner())
+
+
+def test_passed_session_is_used_for_every_group() -> None:
+    session = FakeSession([])
+    http = HTTPClient(None, session)
+    assert _run(http._session_for(Premium)) is session
+    assert _run(http._session_for("images")) is session
+
+
+def test_connector_stats_without_the_private_attributes_of_aiohttp() -> None:
+    connector = SimpleNamespace(limit=10, _conns={("host", 443, True): [object(), object()]})
+    assert _connector_stats(connector) == {"in_use": 0, "idle": 2, "waiters": 0, "limit": 10}
@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+import pytest
+
+from somerandomapi.errors import RateLimited
+from somerandomapi.internals.endpoints import Base, BaseCanvas, CanvasFilter, CanvasMisc, Endpoint, Pokemon, Premium
+from somerandomapi.internals.http import HTTPClient
+from somerandomapi.internals.ratelimit import RateLimiter, TokenBucket, parse_reset_after
+
+from test_http_client import FakeResponse, FakeSession
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_ratelimit_is_implemented_per_group() -> None:
+    assert Pokemon.ratelimit() == (60, 60)
+    assert CanvasFilter.ratelimit() == BaseCanvas.ratelimit()
+    assert Premium.RANK_CARD.group is Premium
+
+
+def test_rate_limiter_shares_buckets_of_parent_group() -> None:
+    limiter = RateLimiter()
+    filter_bucket = limiter.get_bucket(CanvasFilter.BLUE)
+    assert filter_bucket is not None
+    assert filter_bucket is limiter.get_bucket(CanvasMisc.HORNY)
+    assert filter_bucket is limiter.get_bucket(BaseCanvas.HEX)
+    assert limiter.get_bucket(Base.JOKE) is not filter_bucket
+    assert limiter.get_bucket(Endpoint("standalone")) is None
+
+
+def test_token_bucket_queues_instead_of_failing() -> None:
+    async def main() -> float:
+        bucket = TokenBucket(2, 0.2)
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(4)))
+        return time.monotonic() - start
+
+    # 2 tokens are available right away, the other 2 refill at 10 per second
+    assert 0.15 <= _run(main()) < 1
+
+
+def test_token_bucket_update_from_headers() -> None:
+    async def main() -> float:
+        limiter = RateLimiter()
+        limiter.update(Base.JOKE, {"X-RateLimit-Limit": "5", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0.1"})
+        bucket = limiter.get_bucket(Base.JOKE)
+        assert bucket is not None
+        assert bucket.capacity == 5
+        return await limiter.acquire(Base.JOKE)
+
+    assert _run(main()) >= 0.09
+
+
+def test_parse_reset_after() -> None:
+    assert parse_reset_after("2") == 2
+    assert parse_reset_after(None) is None
+    assert parse_reset_after("nope") is None
+    assert parse_reset_after(str(1_700_000_010), now=1_700_000_000) == 10
+
+
+def test_http_client_blocks_bucket_on_429() -> None:
+    session = FakeSession([FakeResponse(status=429, payload={"message": "slow down"}, headers={"Retry-After": "30"})])
+    http = HTTPClient(token=None, session=session, ratelimit=True)
+    with pytest.raises(RateLimited):
+        _run(http.request(Base.JOKE))
+
+    assert http._ratelimiter is not None
+    bucket = http._ratelimiter.get_bucket(Base.JOKE)
+    assert bucket is not None
+    assert bucket._delay(time.monotonic()) > 25
@@ -0,0 +1,116 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from somerandomapi import RetryPolicy
+from somerandomapi.errors import BadRequest, HTTPException, InternalServerError, NotFound, RateLimited
+from somerandomapi.internals.endpoints import Base
+from somerandomapi.internals.http import HTTPClient
+
+from test_http_client import FakeResponse, FakeSession
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class _Resp:
+    def __init__(self, status: int) -> None:
+        self.status = status
+
+
+class FlakySession(FakeSession):
+    """Raises the given exceptions before returning the responses."""
+
+    def __init__(self, errors, responses):
+        super().__init__(responses)
+        self.errors = list(errors)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return super().get(url, **kwargs)
+
+
+def _fast_policy(**kwargs) -> RetryPolicy:
+    return RetryPolicy(base_delay=0.001, max_delay=0.01, **kwargs)
+
+
+def test_policy_validation() -> None:
+    with pytest.raises(ValueError):
+        RetryPolicy(max_retries=-1)
+    with pytest.raises(ValueError):
+        RetryPolicy(base_delay=2, max_delay=1)
+
+
+def test_policy_is_retryable() -> None:
+    policy = RetryPolicy()
+    assert policy.is_retryable(RateLimited(Base.JOKE, {}))
+    assert policy.is_retryable(InternalServerError(Base.JOKE, {}))
+    assert policy.is_retryable(HTTPException(Base.JOKE, _Resp(503), "unavailable"))
+    assert policy.is_retryable(aiohttp.ServerDisconnectedError())
+    assert not policy.is_retryable(BadRequest(Base.JOKE, {}))
+    assert not policy.is_retryable(NotFound(Base.JOKE, {}))
+    assert not policy.is_retryable(HTTPException(Base.JOKE, _Resp(418), "teapot"))
+    assert not RetryPolicy(statuses=(500,)).is_retryable(RateLimited(Base.JOKE, {}))
+
+
+def test_request_retries_server_errors_and_429() -> None:
+    session = FakeSession(
+        [
+            FakeResponse(status=500, payload={"message": "x"}),
+            FakeResponse(status=429, payload={"message": "x"}, headers={"Retry-After": "0.01"}),
+            FakeResponse(payload={"joke": "j"}),
+        ]
+    )
+    http = HTTPClient(token=None, session=session, retry=_fast_policy())
+    assert _run(http.request(Base.JOKE)) == {"joke": "j"}
+    assert not session.responses
+
+
+def test_request_retries_connection_errors() -> None:
+    session = FlakySession([aiohttp.ServerDisconnectedError()], [FakeResponse(payload={"joke": "j"})])
+    http = HTTPClient(token=None, session=session, retry=_fast_policy())
+    assert _run(http.request(Base.JOKE)) == {"joke": "j"}
+    assert session.calls == 2
+
+
+def test_request_does_not_retry_client_errors() -> None:
+    session = FakeSession([FakeResponse(status=404, payload={"message": "x"}), FakeResponse(payload={})])
+    http = HTTPClient(token=None, session=session, retry=_fast_policy())
+    with pytest.raises(NotFound):
+        _run(http.request(Base.JOKE))
+    assert len(session.responses) == 1
+
+
+def test_request_gives_up() -> None:
+    session = FakeSession([FakeResponse(status=500, payload={"message": "x"}) for _ in range(3)])
+    http = HTTPClient(token=None, session=session, retry=_fast_policy(max_retries=2))
+    with pytest.raises(InternalServerError):
+        _run(http.request(Base.JOKE))
+    assert not session.responses
+
+    # Retry-After longer than max_delay
+    session2 = FakeSession([FakeResponse(status=429, payload={"message": "x"}, headers={"Retry-After": "60"})])
+    http2 = HTTPClient(token=None, session=session2, retry=_fast_policy())
+    with pytest.raises(RateLimited) as exc_info:
+        _run(http2.request(Base.JOKE))
+    assert exc_info.value.retry_after == 60
+
+
+def test_retry_budget() -> None:
+    session = FakeSession([FakeResponse(status=500, payload={"message": "x"}), FakeResponse(payload={})])
+    http = HTTPClient(token=None, session=session, retry=_fast_policy(budget=0, min_retries_per_second=0))
+    with pytest.raises(InternalServerError):
+        _run(http.request(Base.JOKE))
+    assert len(session.responses) == 1
+
+    policy = _fast_policy(budget=0.5, min_retries_per_second=0)
+    for _ in range(4):
+        policy._record_request()
+    assert policy._next_delay(InternalServerError(Base.JOKE, {}), 0, None) is not None
+    assert policy._next_delay(InternalServerError(Base.JOKE, {}), 0, None) is not None
+    assert policy._next_delay(InternalServerError(Base.JOKE, {}), 0, None) is None
@@ -0,0 +1,207 @@
+import asyncio
+
+import pytest
+
+from somerandomapi import DeadlineExceeded, Priority, request_deadline, request_priority
+from somerandomapi.internals.endpoints import Base
+from somerandomapi.internals.hooks import RequestHook
+from somerandomapi.internals.http import HTTPClient
+from somerandomapi.internals.latency import LatencyTracker
+from somerandomapi.internals.metrics import MetricsRegistry
+from somerandomapi.internals.ratelimit import TokenBucket
+from somerandomapi.internals.scheduler import PrioritySemaphore, Scheduler, _current_priority, _remaining
+
+from test_http_client import FakeResponse, FakeSession
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_priority_semaphore_wakes_by_priority_then_fifo() -> None:
+    async def main() -> list[str]:
+        semaphore = PrioritySemaphore(1)
+        await semaphore.acquire()
+        order: list[str] = []
+
+        async def waiter(name: str, priority: Priority) -> None:
+            await semaphore.acquire(priority.value)
+            order.append(name)
+            semaphore.release()
+
+        tasks = [
+            asyncio.ensure_future(waiter("background", Priority.BACKGROUND)),
+            asyncio.ensure_future(waiter("normal 1", Priority.NORMAL)),
+            asyncio.ensure_future(waiter("normal 2", Priority.NORMAL)),
+            asyncio.ensure_future(waiter("interactive", Priority.INTERACTIVE)),
+        ]
+        await asyncio.sleep(0)
+        semaphore.release()
+        await asyncio.gather(*tasks)
+        return order
+
+    assert _run(main()) == ["interactive", "normal 1", "normal 2", "background"]
+
+
+def test_priority_semaphore_skips_cancelled_waiters() -> None:
+    async def main() -> bool:
+        semaphore = PrioritySemaphore(1)
+        await semaphore.acquire()
+        cancelled = asyncio.ensure_future(semaphore.acquire(Priority.INTERACTIVE.value))
+        waiting = asyncio.ensure_future(semaphore.acquire(Priority.BACKGROUND.value))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        semaphore.release()
+        await asyncio.wait_for(waiting, 1)
+        return semaphore.locked()
+
+    assert _run(main()) is True
+
+
+def test_token_bucket_hands_tokens_to_interactive_first() -> None:
+    async def main() -> list[Priority]:
+        bucket = TokenBucket(1, 0.05)
+        await bucket.acquire()
+        order: list[Priority] = []
+
+        async def take(priority: Priority) -> None:
+            await bucket.acquire(priority)
+            order.append(priority)
+
+        background = [asyncio.ensure_future(take(Priority.BACKGROUND)) for _ in range(3)]
+        await asyncio.sleep(0)
+        await take(Priority.INTERACTIVE)
+        await asyncio.gather(*background)
+        return order
+
+    # the interactive caller came last but only has to wait for the background caller that holds the bucket
+    assert _run(main()).index(Priority.INTERACTIVE) <= 1
+
+
+def test_request_priority_sets_and_resets_context() -> None:
+    assert _current_priority.get() is Priority.NORMAL
+    with request_priority(Priority.BACKGROUND):
+        assert _current_priority.get() is Priority.BACKGROUND
+        with request_priority(Priority.INTERACTIVE):
+            assert _current_priority.get() is Priority.INTERACTIVE
+        assert _current_priority.get() is Priority.BACKGROUND
+    assert _current_priority.get() is Priority.NORMAL
+
+    with pytest.raises(TypeError):
+        with request_priority(0):  # type: ignore[arg-type]
+            pass
+
+
+def test_scheduler_limits_concurrency_and_records_lanes() -> None:
+    async def main() -> tuple[int, dict[str, dict[str, float]]]:
+        scheduler = Scheduler(2)
+        running = peak = 0
+
+        async def request(priority: Priority) -> None:
+            nonlocal running, peak
+            with request_priority(priority):
+                await scheduler.acquire(Base.JOKE, None)
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            scheduler.release()
+
+        await asyncio.gather(*(request(Priority.BACKGROUND) for _ in range(4)), request(Priority.INTERACTIVE))
+        return peak, scheduler.stats()
+
+    peak, stats = _run(main())
+    assert peak == 2
+    assert stats["background"]["requests"] == 4
+    assert stats["interactive"]["requests"] == 1
+    assert stats["normal"]["requests"] == 0
+    assert all(lane["queued"] == 0 for lane in stats.values())
+    assert stats["background"]["max_wait"] > 0
+
+    with pytest.raises(ValueError):
+        Scheduler(0)
+
+
+def test_http_client_request_priority_and_lane_metrics() -> None:
+    async def main() -> tuple[list[Priority], dict[str, float]]:
+        metrics = MetricsRegistry()
+        seen: list[Priority] = []
+
+        class Recorder(RequestHook):
+            async def before_request(self, endpoint, url):
+                seen.append(_current_priority.get())
+
+        responses = [FakeResponse(200, "application/json", {"joke": "x"}) for _ in range(3)]
+        client = HTTPClient(None, FakeSession(responses), metrics=metrics, hooks=[Recorder()], coalesce=False)
+        await client.request(Base.JOKE, priority=Priority.INTERACTIVE)
+        with request_priority(Priority.BACKGROUND):
+            await client.request(Base.JOKE)
+        await client.request(Base.JOKE)
+        return seen, metrics.to_dict()["lanes"]
+
+    seen, lanes = _run(main())
+    assert seen == [Priority.INTERACTIVE, Priority.BACKGROUND, Priority.NORMAL]
+    assert lanes["interactive_requests"] == 1
+    assert lanes["background_requests"] == 1
+    assert lanes["normal_queued"] == 0
+
+
+def test_latency_tracker_percentile() -> None:
+    tracker = LatencyTracker(window=10, min_samples=5)
+    for elapsed in (0.1, 0.2, 0.3, 0.4):
+        tracker.record(Base.JOKE, elapsed)
+    assert tracker.percentile(Base.JOKE, 0.95) is None
+
+    for elapsed in range(1, 11):
+        tracker.record(Base.JOKE, elapsed / 10)
+    assert tracker.percentile(Base.JOKE, 0.5) == 0.6
+    assert tracker.percentile(Base.JOKE, 0.95) == 1.0
+    assert tracker.percentile(Base.BOTTOKEN, 0.95) is None
+
+
+def test_request_deadline_drops_requests_waiting_for_a_token() -> None:
+    async def main() -> tuple[float, dict[str, dict[str, float]]]:
+        client = HTTPClient(None, FakeSession([]), ratelimit=True)
+        assert client._ratelimiter is not None
+        client._ratelimiter.block(Base.JOKE, 5)
+        with request_priority(Priority.INTERACTIVE):
+            with pytest.raises(DeadlineExceeded) as exc_info:
+                await client.request(Base.JOKE, deadline=0.05)
+        assert exc_info.value.expected is None
+        return exc_info.value.remaining, client._scheduler.stats()
+
+    remaining, stats = _run(main())
+    assert remaining <= 0
+    assert stats["interactive"]["dropped"] == 1
+    assert stats["interactive"]["queued"] == 0
+
+
+def test_request_deadline_rejects_when_p95_is_over_the_budget() -> None:
+    async def main() -> DeadlineExceeded:
+        session = FakeSession([])
+        client = HTTPClient(None, session)
+        for _ in range(20):
+            client._latency.record(Base.JOKE, 0.5)
+
+        with request_deadline(0.1), pytest.raises(DeadlineExceeded) as exc_info:
+            await client.request(Base.JOKE)
+        assert session.last_url is None
+        return exc_info.value
+
+    error = _run(main())
+    assert error.expected == 0.5
+    assert 0 < error.remaining <= 0.1
+
+
+def test_request_deadline_nests_to_the_earliest() -> None:
+    with request_deadline(10):
+        with request_deadline(0.5):
+            remaining = _remaining()
+            assert remaining is not None
+            assert remaining <= 0.5
+        with request_deadline(20):
+            remaining = _remaining()
+            assert remaining is not None
+            assert remaining <= 10
+    assert _remaining() is None
@@ -0,0 +1,79 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from somerandomapi import AdaptiveTimeouts, utils as _utils
+from somerandomapi.internals.endpoints import Base, Premium
+from somerandomapi.internals.http import HTTPClient
+from somerandomapi.internals.latency import LatencyTracker
+
+from test_http_client import FakeResponse, FakeSession
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_adaptive_timeouts_validation() -> None:
+    with pytest.raises(ValueError):
+        AdaptiveTimeouts(percentile=0)
+    with pytest.raises(ValueError):
+        AdaptiveTimeouts(multiplier=0.5)
+    with pytest.raises(ValueError):
+        AdaptiveTimeouts(minimum=0)
+
+
+def test_adaptive_timeouts_follow_latency_within_bounds() -> None:
+    adaptive = AdaptiveTimeouts(percentile=0.9, multiplier=2, minimum=1)
+    latency = LatencyTracker()
+
+    # not enough samples yet, the fixed timeout is used
+    assert adaptive._timeout_for(Premium.PETPET, latency) is Premium.PETPET.timeout
+
+    for _ in range(20):
+        latency.record(Premium.PETPET, 4.0)
+        latency.record(Base.JOKE, 0.05)
+        latency.record(Premium.AMONGUS, 50.0)
+
+    timeout = adaptive._timeout_for(Premium.PETPET, latency)
+    assert timeout is not None
+    assert timeout.total == 8.0
+    assert timeout.sock_connect == Premium.PETPET.timeout.sock_connect
+    # never less than the minimum
+    assert adaptive._timeout_for(Base.JOKE, latency).total == 1
+    # never more than the fixed timeout of the group
+    assert adaptive._timeout_for(Premium.AMONGUS, latency).total == Premium.AMONGUS.timeout.total
+
+
+def test_request_passes_the_timeout_of_the_endpoint() -> None:
+    assert HTTPClient(None, _utils.NOVALUE)._timeout_for(Base.JOKE) is Base.JOKE.timeout
+
+    async def main(**kwargs) -> dict:
+        session = FakeSession([FakeResponse(200, "application/json", {"joke": "x"})])
+        client = HTTPClient(None, session, **kwargs)
+        await client.request(Base.JOKE)
+        return session.last_kwargs
+
+    # the timeout of a session that was passed is kept
+    assert "timeout" not in _run(main())
+    # unless adaptive timeouts are asked for
+    assert _run(main(adaptive_timeouts=AdaptiveTimeouts()))["timeout"] is Base.JOKE.timeout
+
+
+class _SlowSession(FakeSession):
+    def get(self, url, **kwargs):
+        self.last_kwargs = kwargs
+        raise TimeoutError
+
+
+def test_timed_out_requests_are_counted_in_the_latency() -> None:
+    async def main() -> HTTPClient:
+        client = HTTPClient(None, _SlowSession([]), coalesce=False)
+        for _ in range(10):
+            with pytest.raises(TimeoutError):
+                await client.request(Base.JOKE)
+        return client
+
+    client = _run(main())
+    assert client._latency.percentile(Base.JOKE, 0.5) is not None
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pytest
+
+from somerandomapi import RequestTiming, trace_requests, utils as _utils
+from somerandomapi.internals.endpoints import Base
+from somerandomapi.internals.http import HTTPClient
+
+from test_http_client import FakeResponse, FakeSession
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_trace_requests_collects_timings() -> None:
+    async def main():
+        session = FakeSession([FakeResponse(payload={"joke": "a"}), FakeResponse(payload={"joke": "b"})])
+        http = HTTPClient(token=None, session=session)
+        with trace_requests() as timings:
+            await http.request(Base.JOKE)
+        assert isinstance(session.last_kwargs["trace_request_ctx"], RequestTiming)
+
+        # not collected outside of the block
+        await http.request(Base.JOKE)
+        assert session.last_kwargs["trace_request_ctx"] is None
+        return timings
+
+    (timing,) = _run(main())
+    assert timing.path == "joke"
+    assert timing.status == 200
+    assert timing.total is not None and timing.total >= timing.ttfb >= 0
+    assert timing.download is not None
+    # the session is not ours, connection phases are unknown
+    assert timing.dns is None and timing.connect is None and timing.pool_wait is None
+
+
+class _TimingOutSession(FakeSession):
+    def get(self, url, **kwargs):
+        self.last_url = url
+        raise TimeoutError
+
+
+def test_trace_requests_collects_timed_out_requests() -> None:
+    async def main():
+        http = HTTPClient(token=None, session=_TimingOutSession([]))
+        with trace_requests() as timings, pytest.raises(TimeoutError):
+            await http.request(Base.JOKE)
+        return timings
+
+    (timing,) = _run(main())
+    assert timing.path == "joke"
+    assert timing.status is None
+    assert timing.total is not None and timing.total >= 0
+    assert timing.ttfb is None
+
+
+def test_slow_request_log(caplog) -> None:
+    session = FakeSession([FakeResponse(payload={"joke": "a"})])
+    http = HTTPClient(token=None, session=session, slow_request_threshold=0)
+    with caplog.at_level(logging.WARNING, logger="somerandomapi.tracing"):
+        _run(http.request(Base.JOKE))
+    assert "Slow request to" in caplog.text
+
+
+def test_own_session_records_connection_phases() -> None:
+    async def handler(_):
+        return web.json_response({"joke": "j"})
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/joke", handler)
+        async with TestServer(app) as server:
+            http = HTTPClient(token=None, session=_utils.NOVALUE)
+            with trace_requests() as timings:
+                assert await http.request(Base.JOKE, pre_url=str(server.make_url("/joke"))) == {"joke": "j"}
+                await http.request(Base.JOKE, pre_url=str(server.make_url("/joke")))
+            await http.close()
+        return timings
+
+    first, second = _run(main())
+    assert first.connect is not None
+    assert first.ttfb is not None and first.ttfb <= first.total
+    # the connection was reused
+    assert second.connect is None